@@ -0,0 +1,148 @@
+"""
+Cache de réponses en mémoire pour les endpoints GET de l'API
+
+Clé = endpoint + paramètres d'URL + query string normalisée.
+Les entrées expirent après un TTL, le cache est borné (LRU) et il est
+vidé dès que la génération des données change (nouveau scraping).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, make_response
+import config
+from database.models import SessionLocal
+from database.generation import get_data_generation
+
+class ResponseCache:
+    """Cache LRU avec TTL invalidé par la génération des données"""
+
+    def __init__(self, max_entries=256, ttl_seconds=300, generation_poll_seconds=5):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation_poll_seconds = generation_poll_seconds
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self._generation_checked_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _read_generation(self):
+        """Lire la génération en base (requête PK très légère)"""
+        db = SessionLocal()
+        try:
+            return get_data_generation(db)
+        finally:
+            db.close()
+
+    def check_generation(self):
+        """Vider le cache si les scrapers ont commité de nouvelles données"""
+        # Un seul thread interroge la base par intervalle (la requête se fait hors verrou)
+        with self._lock:
+            now = time.monotonic()
+            if now - self._generation_checked_at < self.generation_poll_seconds:
+                return
+            self._generation_checked_at = now
+
+        generation = self._read_generation()
+
+        with self._lock:
+            if generation != self._generation:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._generation = generation
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Compteurs pour dimensionner le cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "data_generation": self._generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+response_cache = ResponseCache(
+    max_entries=config.Config.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.Config.RESPONSE_CACHE_TTL_SECONDS,
+    generation_poll_seconds=config.Config.RESPONSE_CACHE_GENERATION_POLL_SECONDS
+)
+
+def _cache_key():
+    """Endpoint + paramètres normalisés (ordre des arguments ignoré)"""
+    view_args = tuple(sorted((request.view_args or {}).items()))
+    query_args = tuple(sorted(request.args.items(multi=True)))
+    return (request.endpoint, view_args, query_args)
+
+def cached_response(view):
+    """Décorateur : servir la réponse depuis le cache si possible"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not config.Config.RESPONSE_CACHE_ENABLED:
+            return view(*args, **kwargs)
+
+        response_cache.check_generation()
+        key = _cache_key()
+
+        cached = response_cache.get(key)
+        if cached is not None:
+            body, status, mimetype = cached
+            response = make_response(body, status)
+            response.mimetype = mimetype
+            response.headers['X-Cache'] = 'HIT'
+            return response
+
+        response = make_response(view(*args, **kwargs))
+
+        # Ne garder que les réponses complètes (pas d'erreur serveur, pas de streaming)
+        if response.status_code < 500 and not response.is_streamed:
+            response_cache.set(key, (response.get_data(), response.status_code, response.mimetype))
+        response.headers['X-Cache'] = 'MISS'
+        return response
+
+    return wrapper
@@ -0,0 +1,98 @@
+"""
+Session SQLAlchemy liée à la requête Flask
+
+Une seule session par requête, ouverte à la demande et toujours fermée
+dans le teardown (rollback si la requête a échoué) pour ne plus laisser
+fuir de connexions du pool.
+"""
+
+import logging
+import threading
+import time
+from flask import g
+import config
+from database.models import SessionLocal, get_engine
+
+logger = logging.getLogger(__name__)
+
+class PoolWaitStats:
+    """Temps d'attente pour obtenir une connexion du pool"""
+
+    def __init__(self, slow_threshold_seconds=0.5):
+        self.slow_threshold_seconds = slow_threshold_seconds
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.slow_checkouts = 0
+        self.failed_checkouts = 0
+
+    def record(self, wait_seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait_seconds
+            self.max_wait = max(self.max_wait, wait_seconds)
+            if wait_seconds >= self.slow_threshold_seconds:
+                self.slow_checkouts += 1
+
+        if wait_seconds >= self.slow_threshold_seconds:
+            logger.warning(f"⏳ Attente pool MySQL: {wait_seconds * 1000:.0f} ms")
+
+    def record_failure(self):
+        with self._lock:
+            self.failed_checkouts += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "failed_checkouts": self.failed_checkouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "slow_checkouts": self.slow_checkouts,
+                "slow_threshold_ms": round(self.slow_threshold_seconds * 1000)
+            }
+
+pool_wait_stats = PoolWaitStats(config.Config.POOL_WAIT_WARNING_SECONDS)
+
+def get_request_db():
+    """Session de la requête courante (créée au premier appel)"""
+    if 'db' not in g:
+        db = SessionLocal()
+        start = time.perf_counter()
+        try:
+            # Prendre la connexion tout de suite pour mesurer l'attente du pool
+            db.connection()
+        except Exception:
+            pool_wait_stats.record_failure()
+            db.close()
+            raise
+        pool_wait_stats.record(time.perf_counter() - start)
+        g.db = db
+    return g.db
+
+def close_request_db(exception=None):
+    """Teardown : rollback en cas d'erreur puis rendre la connexion au pool"""
+    db = g.pop('db', None)
+    if db is None:
+        return
+
+    try:
+        if exception is not None:
+            db.rollback()
+    finally:
+        db.close()
+
+def pool_status():
+    """État du pool de connexions + attentes mesurées"""
+    pool = get_engine().pool
+
+    status = {"wait": pool_wait_stats.stats()}
+    if hasattr(pool, 'checkedout'):
+        status.update({
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checked_in": pool.checkedin()
+        })
+    return status
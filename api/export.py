@@ -0,0 +1,102 @@
+"""
+Export complet des offres en flux (NDJSON ou CSV)
+
+Les lignes sont lues avec un curseur serveur (stream_results + yield_per)
+et écrites au fil de l'eau : la mémoire reste constante quelle que soit
+la taille de la table.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from sqlalchemy import select
+from database.models import SessionLocal, JobOffer
+
+EXPORT_BATCH_SIZE = 1000
+
+# Mêmes clés que JobOffer.to_dict() : colonne -> clé exportée
+EXPORT_COLUMNS = [
+    ('id', JobOffer.id),
+    ('title', JobOffer.title),
+    ('link', JobOffer.link),
+    ('company', JobOffer.company),
+    ('date', JobOffer.date_posted),
+    ('contrat', JobOffer.contract_type),
+    ('secteur', JobOffer.sector),
+    ('metier', JobOffer.job_title),
+    ('location', JobOffer.location),
+    ('description', JobOffer.description),
+    ('ia_risk_score', JobOffer.ia_risk_score),
+    ('ia_risk_level', JobOffer.ia_risk_level),
+    ('suggestions', JobOffer.suggestions),
+    ('scraped_at', JobOffer.scraped_at),
+    ('is_active', JobOffer.is_active),
+    ('deadline', JobOffer.deadline),
+    ('is_urgent', JobOffer.is_urgent),
+    ('reference', JobOffer.reference),
+    ('source', JobOffer.source),
+]
+
+EXPORT_FIELDS = [name for name, _ in EXPORT_COLUMNS]
+
+def build_export_query(source=None, risk_level=None, since=None):
+    """SELECT des colonnes exportées avec les filtres demandés"""
+    query = select(*[column for _, column in EXPORT_COLUMNS]).where(JobOffer.is_active == True)
+
+    if source:
+        query = query.where(JobOffer.source == source)
+    if risk_level:
+        query = query.where(JobOffer.ia_risk_level == risk_level)
+    if since:
+        query = query.where(JobOffer.scraped_at >= since)
+
+    return query.order_by(JobOffer.id)
+
+def parse_since(value):
+    """Timestamp ISO (2025-01-31 ou 2025-01-31T08:00:00), None si absent"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value)
+
+def _row_to_dict(row):
+    """Ligne SQL -> dict au format de JobOffer.to_dict()"""
+    offer = dict(zip(EXPORT_FIELDS, row))
+    offer['ia_risk_score'] = float(offer['ia_risk_score']) if offer['ia_risk_score'] else 0.0
+    offer['suggestions'] = offer['suggestions'].split(', ') if offer['suggestions'] else []
+    offer['scraped_at'] = offer['scraped_at'].isoformat() if offer['scraped_at'] else None
+    return offer
+
+def _stream_rows(query):
+    """Parcourir le résultat par lots avec une session dédiée au flux"""
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            query.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+        for rows in result.partitions():
+            yield rows
+    finally:
+        db.close()
+
+def generate_ndjson(query):
+    """Une offre JSON par ligne"""
+    for rows in _stream_rows(query):
+        yield ''.join(json.dumps(_row_to_dict(row), ensure_ascii=False) + '\n' for row in rows)
+
+def generate_csv(query):
+    """En-tête puis une ligne par offre (suggestions séparées par ', ')"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+
+    for rows in _stream_rows(query):
+        buffer.seek(0)
+        buffer.truncate(0)
+        for row in rows:
+            offer = _row_to_dict(row)
+            offer['suggestions'] = ', '.join(offer['suggestions'])
+            writer.writerow([offer[field] for field in EXPORT_FIELDS])
+        yield buffer.getvalue()
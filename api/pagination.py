@@ -0,0 +1,51 @@
+"""
+Pagination par curseur (keyset) sur (scraped_at, id)
+
+Le curseur est opaque pour le client : base64 de la dernière clé servie.
+La page suivante filtre sur la clé au lieu d'un OFFSET, donc son coût ne
+dépend plus de la profondeur de la page.
+"""
+
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_, desc
+from database.models import JobOffer
+
+class InvalidCursor(ValueError):
+    """Curseur illisible ou falsifié"""
+
+def encode_cursor(offer):
+    """Curseur pointant juste après cette offre"""
+    scraped_at = offer.scraped_at.isoformat() if offer.scraped_at else None
+    raw = json.dumps([scraped_at, offer.id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """(scraped_at, id) depuis un curseur"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        scraped_at, offer_id = json.loads(base64.urlsafe_b64decode(padded))
+        if scraped_at is not None:
+            scraped_at = datetime.fromisoformat(scraped_at)
+        return scraped_at, int(offer_id)
+    except Exception:
+        raise InvalidCursor(f"Curseur invalide: {cursor}")
+
+def keyset_order(query):
+    """Ordre stable : plus récentes d'abord, id pour départager"""
+    return query.order_by(desc(JobOffer.scraped_at), desc(JobOffer.id))
+
+def after_cursor(query, cursor):
+    """Offres situées après le curseur dans l'ordre (scraped_at DESC, id DESC)"""
+    scraped_at, offer_id = decode_cursor(cursor)
+
+    # Les scraped_at NULL sont servis en dernier (ordre DESC de MySQL)
+    if scraped_at is None:
+        return query.filter(JobOffer.scraped_at.is_(None), JobOffer.id < offer_id)
+
+    return query.filter(or_(
+        JobOffer.scraped_at < scraped_at,
+        and_(JobOffer.scraped_at == scraped_at, JobOffer.id < offer_id),
+        JobOffer.scraped_at.is_(None)
+    ))
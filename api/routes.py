@@ -2,20 +2,55 @@
 Routes API utilisant MySQL
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, Response, stream_with_context
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, or_, and_
-from database.models import JobOffer, get_db
+from database.models import JobOffer
+from database.aggregates import compute_offer_aggregates, compute_risk_totals
+from database.rollups import rollups_available, job_risk_groups, job_risk_sector_groups
+from database.offer_details import offer_details
+from database.scrape_runs import recent_scrape_runs
+from api.cache import cached_response, response_cache
+from api.db_session import get_request_db, close_request_db, pool_status
+from api.search import search_index
+from api.export import build_export_query, parse_since, generate_ndjson, generate_csv
+from api.pagination import InvalidCursor, encode_cursor, after_cursor, keyset_order
 from datetime import datetime
 import config
 
 bp = Blueprint('api', __name__)
 
+# Fermer la session de chaque requête (rollback si erreur)
+bp.teardown_request(close_request_db)
+
+def offers_by_ids(db, offer_ids):
+    """Charger plusieurs offres en une requête : {id: offre}"""
+    offer_ids = {offer_id for offer_id in offer_ids if offer_id is not None}
+    if not offer_ids:
+        return {}
+    
+    offers = db.query(JobOffer).filter(JobOffer.id.in_(offer_ids)).all()
+    return {offer.id: offer for offer in offers}
+
+def first_offers_by_job_title(db, job_titles):
+    """Première offre active de chaque métier en une requête : {métier: offre}"""
+    job_titles = set(job_titles)
+    if not job_titles:
+        return {}
+    
+    first_ids = db.query(func.min(JobOffer.id)).filter(
+        JobOffer.is_active == True,
+        JobOffer.job_title.in_(job_titles)
+    ).group_by(JobOffer.job_title)
+    
+    offers = db.query(JobOffer).filter(JobOffer.id.in_(first_ids.scalar_subquery())).all()
+    return {offer.job_title: offer for offer in offers}
+
 @bp.route('/health')
 def health():
     """Vérifier santé API + DB"""
     try:
-        db = next(get_db())
+        db = get_request_db()
         offer_count = db.query(func.count(JobOffer.id)).scalar()
         
         return jsonify({
@@ -28,10 +63,32 @@ def health():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@bp.route('/pool-stats')
+def get_pool_stats():
+    """État du pool MySQL et temps d'attente des checkouts"""
+    return jsonify(pool_status())
+
+@bp.route('/cache-stats')
+def cache_stats():
+    """Compteurs du cache de réponses (hits/misses) pour le dimensionner"""
+    return jsonify(response_cache.stats())
+
+@bp.route('/scrape-runs')
+def get_scrape_runs():
+    """Derniers scrapings : durées par étape, octets, compteurs (filtres: source, kind)"""
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 200)
+    runs = recent_scrape_runs(
+        get_request_db(), limit,
+        source=request.args.get('source'),
+        kind=request.args.get('kind')
+    )
+    return jsonify({"runs": runs, "count": len(runs)})
+
 @bp.route('/offers')
+@cached_response
 def get_offers():
     """Récupérer toutes les offres avec pagination et filtres"""
-    db = next(get_db())
+    db = get_request_db()
     
     page = request.args.get('page', 1, type=int)
     limit = request.args.get('limit', 20, type=int)
@@ -53,25 +110,84 @@ def get_offers():
     if sector:
         query = query.filter(JobOffer.sector.contains(sector))
     
+    # Pagination par curseur : pas d'OFFSET ni de COUNT à chaque page
+    if 'cursor' in request.args:
+        limit = max(limit, 1)
+        page_query = query
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                page_query = after_cursor(query, cursor)
+            except InvalidCursor as e:
+                return jsonify({"error": str(e)}), 400
+        
+        rows = keyset_order(page_query).limit(limit + 1).all()
+        offers = rows[:limit]
+        has_more = len(rows) > limit
+        
+        response = {
+            "limit": limit,
+            "next_cursor": encode_cursor(offers[-1]) if has_more and offers else None,
+            "has_more": has_more,
+            "offers": [offer.to_dict() for offer in offers]
+        }
+        
+        # Total exact seulement sur demande, sinon estimation depuis les rollups
+        if request.args.get('with_total', '0') == '1':
+            response["total"] = query.count()
+        elif not location and not sector and rollups_available(db):
+            totals = compute_risk_totals(db)
+            response["total_estimate"] = (
+                totals["risk_distribution"].get(risk_level, 0) if risk_level else totals["total_offers"]
+            )
+        return jsonify(response)
+    
     # Compter le total avant pagination
     total = query.count()
     
     # Appliquer pagination et tri
-    offers = query.order_by(desc(JobOffer.scraped_at)).offset(offset).limit(limit).all()
+    offers = keyset_order(query).offset(offset).limit(limit).all()
     
     return jsonify({
         "page": page,
         "limit": limit,
         "total": total,
         "total_pages": (total + limit - 1) // limit if limit > 0 else 1,
+        "next_cursor": encode_cursor(offers[-1]) if len(offers) == limit else None,
         "offers": [offer.to_dict() for offer in offers]
     })
 
+@bp.route('/export')
+def export_offers():
+    """Export complet en flux : ?format=ndjson|csv&source=&risk=&since="""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({"error": "Format inconnu (ndjson ou csv)"}), 400
+    
+    try:
+        since = parse_since(request.args.get('since'))
+    except ValueError:
+        return jsonify({"error": "Paramètre 'since' invalide (format ISO attendu)"}), 400
+    
+    query = build_export_query(
+        source=request.args.get('source'),
+        risk_level=request.args.get('risk'),
+        since=since
+    )
+    
+    if export_format == 'csv':
+        response = Response(stream_with_context(generate_csv(query)), mimetype='text/csv')
+        response.headers['Content-Disposition'] = 'attachment; filename=offers.csv'
+    else:
+        response = Response(stream_with_context(generate_ndjson(query)), mimetype='application/x-ndjson')
+    return response
+
 @bp.route('/offers/<job_name>')
 @bp.route('/offers/<job_name>')
+@cached_response
 def get_offers_by_job(job_name):
     """Rechercher par métier - version améliorée"""
-    db = next(get_db())
+    db = get_request_db()
     
     # Nettoyer le nom du métier
     job_name_clean = job_name.lower().strip()
@@ -112,60 +228,20 @@ def get_offers_by_job(job_name):
     })
 
 @bp.route('/risk-analysis')
+@cached_response
 def risk_analysis():
     """Analyse des risques IA depuis MySQL"""
-    db = next(get_db())
+    db = get_request_db()
     
-    # Statistiques globales
-    total = db.query(func.count(JobOffer.id)).filter(JobOffer.is_active == True).scalar() or 0
+    # Distribution, score moyen et tops en deux requêtes groupées
+    aggregates = compute_offer_aggregates(db)
+    total = aggregates["total_offers"]
     
     if total == 0:
         return jsonify({"error": "Aucune donnée disponible"}), 404
     
-    # Distribution des risques
-    risk_distribution = {}
-    for level in ['Élevé', 'Moyen', 'Faible']:
-        count = db.query(func.count(JobOffer.id)).filter(
-            JobOffer.is_active == True,
-            JobOffer.ia_risk_level == level
-        ).scalar() or 0
-        risk_distribution[level] = count
-    
-    # Score moyen
-    avg_score_result = db.query(func.avg(JobOffer.ia_risk_score)).filter(
-        JobOffer.is_active == True
-    ).scalar()
-    avg_score = float(avg_score_result) if avg_score_result else 0.0
-    
-    # Top secteurs
-    top_sectors = db.query(
-        JobOffer.sector,
-        func.count(JobOffer.id).label('count')
-    ).filter(
-        JobOffer.is_active == True,
-        JobOffer.sector != ''
-    ).group_by(JobOffer.sector).order_by(desc('count')).limit(5).all()
-    
-    # Top métiers
-    top_metiers = db.query(
-        JobOffer.job_title,
-        func.count(JobOffer.id).label('count')
-    ).filter(
-        JobOffer.is_active == True,
-        JobOffer.job_title != ''
-    ).group_by(JobOffer.job_title).order_by(desc('count')).limit(5).all()
-    
-    # Secteurs à haut risque
-    high_risk_sectors = db.query(
-        JobOffer.sector,
-        func.count(JobOffer.id).label('count')
-    ).filter(
-        JobOffer.is_active == True,
-        JobOffer.ia_risk_level == 'Élevé',
-        JobOffer.sector != ''
-    ).group_by(
-        JobOffer.sector
-    ).order_by(desc('count')).limit(5).all()
+    risk_distribution = aggregates["risk_distribution"]
+    top = aggregates["top"]
     
     # Calcul pourcentage haut risque
     high_risk_count = risk_distribution.get('Élevé', 0)
@@ -174,17 +250,18 @@ def risk_analysis():
     return jsonify({
         "total_offers": total,
         "risk_distribution": risk_distribution,
-        "average_risk_score": round(avg_score, 2),
+        "average_risk_score": round(aggregates["average_risk_score"], 2),
         "high_risk_percentage": round(high_risk_percentage, 1),
-        "top_sectors": [{"secteur": sector, "count": count} for sector, count in top_sectors],
-        "top_metiers": [{"metier": metier, "count": count} for metier, count in top_metiers],
-        "top_high_risk_sectors": [{"secteur": sector, "count": count} for sector, count in high_risk_sectors]
+        "top_sectors": [{"secteur": sector, "count": count} for sector, count in top["sector"]],
+        "top_metiers": [{"metier": metier, "count": count} for metier, count in top["job_title"]],
+        "top_high_risk_sectors": [{"secteur": sector, "count": count} for sector, count in top["high_risk_sector"]]
     })
 
 @bp.route('/recommendations/<current_job>')
+@cached_response
 def get_recommendations(current_job):
     """Obtenir des recommandations de reconversion depuis MySQL"""
-    db = next(get_db())
+    db = get_request_db()
     
     # Trouver les offres du métier actuel
     current_offers = db.query(JobOffer).filter(
@@ -229,13 +306,14 @@ def get_recommendations(current_job):
         func.avg(JobOffer.ia_risk_score)
     ).limit(10).all()
     
+    # Offres exemples de tous les métiers recommandés en une seule requête
+    example_offers = first_offers_by_job_title(
+        db, [job_title for job_title, _, _, _ in recommendations_data]
+    )
+    
     recommendations = []
     for job_title, sector, avg_score, offer_count in recommendations_data:
-        # Trouver une offre exemple pour ce métier
-        example_offer = db.query(JobOffer).filter(
-            JobOffer.job_title == job_title,
-            JobOffer.is_active == True
-        ).first()
+        example_offer = example_offers.get(job_title)
         
         avg_score_float = float(avg_score) if avg_score else 5.0
         
@@ -261,9 +339,10 @@ def get_recommendations(current_job):
     })
 
 @bp.route('/search')
+@cached_response
 def search_offers():
     """Recherche avancée"""
-    db = next(get_db())
+    db = get_request_db()
     
     query = request.args.get('q', '').lower()
     min_risk = request.args.get('min_risk', 0, type=float)
@@ -282,29 +361,45 @@ def search_offers():
             )
         )
     
-    # Filtre par recherche textuelle
+    # Filtre par recherche textuelle (index inversé, plus de LIKE '%...%')
+    ranking = None
+    max_candidates = config.Config.SEARCH_MAX_CANDIDATES
     if query:
-        search_query = search_query.filter(
-            or_(
-                JobOffer.title.contains(query),
-                JobOffer.job_title.contains(query),
-                JobOffer.sector.contains(query),
-                JobOffer.company.contains(query),
-                JobOffer.location.contains(query),
-                JobOffer.description.contains(query)
-            )
-        )
+        # Plafond réservé au tri par pertinence : pour les tris par date ou par
+        # risque, toutes les offres trouvées sont candidates (tri exact)
+        limit = max_candidates if sort_by == 'relevance' else None
+        ranked = search_index.get().search(query, limit=limit)
+        ranking = {offer_id: position for position, (offer_id, _) in enumerate(ranked)}
+        if len(ranking) <= max_candidates:
+            search_query = search_query.filter(JobOffer.id.in_(list(ranking) or [-1]))
     
     # Appliquer le tri
-    if sort_by == 'risk':
-        search_query = search_query.order_by(desc(JobOffer.ia_risk_score))
-    elif sort_by == 'date':
-        search_query = search_query.order_by(desc(JobOffer.scraped_at))
+    if sort_by == 'relevance' and ranking is not None:
+        # Les plus pertinentes d'abord, puis chargement des 50 retenues
+        matching_ids = [row[0] for row in search_query.with_entities(JobOffer.id)]
+        top_ids = sorted(matching_ids, key=ranking.get)[:50]
+        offers_map = offers_by_ids(db, top_ids)
+        offers = [offers_map[offer_id] for offer_id in top_ids]
     else:
-        search_query = search_query.order_by(desc(JobOffer.scraped_at))
-    
-    # Limiter les résultats
-    offers = search_query.limit(50).all()
+        if sort_by == 'risk':
+            search_query = search_query.order_by(desc(JobOffer.ia_risk_score))
+        else:
+            search_query = search_query.order_by(desc(JobOffer.scraped_at))
+    
+        if ranking is not None and len(ranking) > max_candidates:
+            # Recherche très large : pas de IN géant, les ids sont parcourus
+            # dans l'ordre du tri et les 50 premiers trouvés sont retenus
+            top_ids = []
+            for (offer_id,) in search_query.with_entities(JobOffer.id).yield_per(5000):
+                if offer_id in ranking:
+                    top_ids.append(offer_id)
+                    if len(top_ids) == 50:
+                        break
+            offers_map = offers_by_ids(db, top_ids)
+            offers = [offers_map[offer_id] for offer_id in top_ids]
+        else:
+            # Limiter les résultats
+            offers = search_query.limit(50).all()
     
     return jsonify({
         "query": query,
@@ -316,72 +411,36 @@ def search_offers():
     })
 
 @bp.route('/statistics')
+@cached_response
 def get_statistics():
     """Statistiques générales depuis MySQL"""
-    db = next(get_db())
+    db = get_request_db()
     
-    # Total offres actives
-    total = db.query(func.count(JobOffer.id)).filter(JobOffer.is_active == True).scalar() or 0
+    # Distribution, score moyen et tops en deux requêtes groupées
+    aggregates = compute_offer_aggregates(db)
+    total = aggregates["total_offers"]
     
     if total == 0:
         return jsonify({"error": "Aucune donnée disponible"}), 404
     
-    # Distribution des risques
-    risk_distribution = {'Élevé': 0, 'Moyen': 0, 'Faible': 0}
-    for level in risk_distribution.keys():
-        count = db.query(func.count(JobOffer.id)).filter(
-            JobOffer.is_active == True,
-            JobOffer.ia_risk_level == level
-        ).scalar() or 0
-        risk_distribution[level] = count
-    
-    # Score moyen
-    avg_score_result = db.query(func.avg(JobOffer.ia_risk_score)).filter(
-        JobOffer.is_active == True
-    ).scalar()
-    avg_score = round(float(avg_score_result) if avg_score_result else 0.0, 2)
-    
-    # Top secteurs
-    top_sectors = db.query(
-        JobOffer.sector,
-        func.count(JobOffer.id).label('count')
-    ).filter(
-        JobOffer.is_active == True,
-        JobOffer.sector != ''
-    ).group_by(JobOffer.sector).order_by(desc('count')).limit(5).all()
-    
-    # Top localisations
-    top_locations = db.query(
-        JobOffer.location,
-        func.count(JobOffer.id).label('count')
-    ).filter(
-        JobOffer.is_active == True,
-        JobOffer.location != ''
-    ).group_by(JobOffer.location).order_by(desc('count')).limit(5).all()
-    
-    # Top entreprises
-    top_companies = db.query(
-        JobOffer.company,
-        func.count(JobOffer.id).label('count')
-    ).filter(
-        JobOffer.is_active == True,
-        JobOffer.company != ''
-    ).group_by(JobOffer.company).order_by(desc('count')).limit(5).all()
+    top = aggregates["top"]
     
     return jsonify({
         "total_offers": total,
-        "risk_distribution": risk_distribution,
-        "average_risk_score": avg_score,
-        "top_sectors": [{"secteur": sector, "count": count} for sector, count in top_sectors],
-        "top_locations": [{"location": location, "count": count} for location, count in top_locations],
-        "top_companies": [{"company": company, "count": count} for company, count in top_companies],
+        "risk_distribution": aggregates["risk_distribution"],
+        "average_risk_score": round(aggregates["average_risk_score"], 2),
+        "top_sectors": [{"secteur": sector, "count": count} for sector, count in top["sector"]],
+        "top_locations": [{"location": location, "count": count} for location, count in top["location"]],
+        "top_companies": [{"company": company, "count": count} for company, count in top["company"]],
+        "sources": [{"source": source, "count": count} for source, count in top["source"]],
         "timestamp": datetime.now().isoformat()
     })
 
 @bp.route('/sectors')
+@cached_response
 def get_sectors():
     """Récupérer tous les secteurs disponibles"""
-    db = next(get_db())
+    db = get_request_db()
     
     sectors = db.query(
         JobOffer.sector
@@ -395,9 +454,10 @@ def get_sectors():
     })
 
 @bp.route('/locations')
+@cached_response
 def get_locations():
     """Récupérer toutes les localisations disponibles"""
-    db = next(get_db())
+    db = get_request_db()
     
     locations = db.query(
         JobOffer.location
@@ -411,9 +471,10 @@ def get_locations():
     })
 
 @bp.route('/offers/<int:offer_id>')
+@cached_response
 def get_offer_by_id(offer_id):
     """Récupérer une offre spécifique par ID"""
-    db = next(get_db())
+    db = get_request_db()
     
     offer = db.query(JobOffer).filter(JobOffer.id == offer_id).first()
     
@@ -421,14 +482,17 @@ def get_offer_by_id(offer_id):
         return jsonify({"error": "Offre non trouvée"}), 404
     
     return jsonify({
-        "offer": offer.to_dict()
+        "offer": offer.to_dict(),
+        # Description complète, compétences, salaire (None tant que l'offre n'est pas enrichie)
+        "details": offer_details(db, offer_id)
     })
 
 
 @bp.route('/search-job/<job_name>')
+@cached_response
 def search_job_enhanced(job_name):
     """Recherche améliorée par métier avec synonymes"""
-    db = next(get_db())
+    db = get_request_db()
     
     # Dictionnaire de synonymes pour Madagascar
     synonyms_dict = {
@@ -453,21 +517,17 @@ def search_job_enhanced(job_name):
     
     print(f"🔍 Recherche avec termes: {all_search_terms}")
     
-    # Construire la requête
-    conditions = []
-    for term in all_search_terms:
-        conditions.append(JobOffer.title.contains(term))
-        conditions.append(JobOffer.job_title.contains(term))
-        conditions.append(JobOffer.description.contains(term))
-        conditions.append(JobOffer.sector.contains(term))
-    
-    query = db.query(JobOffer).filter(
-        JobOffer.is_active == True
-    ).filter(
-        or_(*conditions) if conditions else True
-    )
-    
-    offers = query.all()
+    # Union des termes via l'index inversé, offres triées par pertinence
+    ranked = search_index.get().search_any(all_search_terms)
+    ranked_ids = [offer_id for offer_id, _ in ranked]
+    offers_map = {
+        offer.id: offer
+        for offer in db.query(JobOffer).filter(
+            JobOffer.is_active == True,
+            JobOffer.id.in_(ranked_ids or [-1])
+        )
+    }
+    offers = [offers_map[offer_id] for offer_id in ranked_ids if offer_id in offers_map]
     
     # Analyse des résultats
     if offers:
@@ -499,9 +559,10 @@ def search_job_enhanced(job_name):
         })
 
 @bp.route('/jobs-by-risk')
+@cached_response
 def jobs_by_risk():
     """Obtenir les listes de travail par niveau de risque avec suggestions"""
-    db = next(get_db())
+    db = get_request_db()
     
     risk_level = request.args.get('level', 'all')  # 'high', 'medium', 'low', 'all'
     
@@ -512,36 +573,45 @@ def jobs_by_risk():
         'low': 'Faible'
     }
     
-    # Construire la requête
-    query = db.query(
-        JobOffer.job_title,
-        JobOffer.ia_risk_level,
-        func.count(JobOffer.id).label('count'),
-        func.avg(JobOffer.ia_risk_score).label('avg_score'),
-        func.min(JobOffer.ia_risk_score).label('min_score'),
-        func.max(JobOffer.ia_risk_score).label('max_score'),
-        func.group_concat(JobOffer.suggestions).label('all_suggestions')
-    ).filter(
-        JobOffer.is_active == True,
-        JobOffer.job_title != '',
-        JobOffer.ia_risk_level != ''
-    )
+    french_level = level_map.get(risk_level) if risk_level != 'all' else None
     
-    # Si un niveau spécifique est demandé
-    if risk_level != 'all' and risk_level in level_map:
-        french_level = level_map[risk_level]
-        query = query.filter(JobOffer.ia_risk_level == french_level)
+    if rollups_available(db):
+        # Lire les groupes pré-calculés à la fin du dernier scraping
+        jobs_data = job_risk_groups(db, risk_level=french_level)
+    else:
+        # Construire la requête
+        query = db.query(
+            JobOffer.job_title,
+            JobOffer.ia_risk_level,
+            func.count(JobOffer.id).label('count'),
+            func.avg(JobOffer.ia_risk_score).label('avg_score'),
+            func.min(JobOffer.ia_risk_score).label('min_score'),
+            func.max(JobOffer.ia_risk_score).label('max_score'),
+            func.group_concat(JobOffer.suggestions).label('all_suggestions'),
+            func.min(JobOffer.id).label('example_offer_id')
+        ).filter(
+            JobOffer.is_active == True,
+            JobOffer.job_title != '',
+            JobOffer.ia_risk_level != ''
+        )
+        
+        # Si un niveau spécifique est demandé
+        if french_level:
+            query = query.filter(JobOffer.ia_risk_level == french_level)
+        
+        # Exécuter la requête
+        jobs_data = query.group_by(
+            JobOffer.job_title, JobOffer.ia_risk_level
+        ).order_by(
+            desc('count')
+        ).all()
     
-    # Exécuter la requête
-    jobs_data = query.group_by(
-        JobOffer.job_title, JobOffer.ia_risk_level
-    ).order_by(
-        desc('count')
-    ).all()
+    # Offres exemples de tous les groupes en une seule requête
+    example_offers = offers_by_ids(db, [row[-1] for row in jobs_data])
     
     # Traiter les résultats
     processed_jobs = []
-    for job_title, risk_level_fr, count, avg_score, min_score, max_score, all_suggestions in jobs_data:
+    for job_title, risk_level_fr, count, avg_score, min_score, max_score, all_suggestions, example_offer_id in jobs_data:
         # Déterminer la clé anglaise
         risk_key = None
         for key, value in level_map.items():
@@ -589,12 +659,8 @@ def jobs_by_risk():
                     "Renforcer vos compétences en leadership"
                 ]
         
-        # Trouver un exemple d'offre
-        example_offer = db.query(JobOffer).filter(
-            JobOffer.job_title == job_title,
-            JobOffer.ia_risk_level == risk_level_fr,
-            JobOffer.is_active == True
-        ).first()
+        # Exemple d'offre du groupe (première offre active, portée par l'agrégat)
+        example_offer = example_offers.get(example_offer_id)
         
         job_info = {
             'job_title': job_title,
@@ -664,49 +730,57 @@ def jobs_by_risk():
 
 
 @bp.route('/jobs-by-risk-detailed')
+@cached_response
 def jobs_by_risk_detailed():
     """Liste détaillée des métiers par niveau de risque avec filtres"""
-    db = next(get_db())
+    db = get_request_db()
     
     # Récupérer les paramètres de filtre
     risk_level = request.args.get('level', 'all')  # high, medium, low, all
     min_offers = request.args.get('min_offers', 1, type=int)
     sector = request.args.get('sector', '')
     
-    # Construire la requête de base
-    query = db.query(
-        JobOffer.job_title,
-        JobOffer.ia_risk_level,
-        JobOffer.sector,
-        func.count(JobOffer.id).label('offer_count'),
-        func.avg(JobOffer.ia_risk_score).label('avg_score'),
-        func.group_concat(JobOffer.company.distinct()).label('companies'),
-        func.group_concat(JobOffer.suggestions).label('all_suggestions'),
-        func.min(JobOffer.scraped_at).label('first_seen'),
-        func.max(JobOffer.scraped_at).label('last_seen')
-    ).filter(
-        JobOffer.is_active == True,
-        JobOffer.job_title != '',
-        JobOffer.ia_risk_level != ''
-    )
-    
-    # Appliquer les filtres
-    if risk_level != 'all':
-        risk_map = {'high': 'Élevé', 'medium': 'Moyen', 'low': 'Faible'}
-        if risk_level in risk_map:
-            query = query.filter(JobOffer.ia_risk_level == risk_map[risk_level])
+    risk_map = {'high': 'Élevé', 'medium': 'Moyen', 'low': 'Faible'}
+    french_level = risk_map.get(risk_level) if risk_level != 'all' else None
     
-    if sector:
-        query = query.filter(JobOffer.sector.contains(sector))
-    
-    # Exécuter la requête
-    jobs_data = query.group_by(
-        JobOffer.job_title, JobOffer.ia_risk_level, JobOffer.sector
-    ).having(
-        func.count(JobOffer.id) >= min_offers
-    ).order_by(
-        desc('offer_count')
-    ).all()
+    if rollups_available(db):
+        # Lire les groupes pré-calculés à la fin du dernier scraping
+        jobs_data = job_risk_sector_groups(
+            db, risk_level=french_level, sector=sector, min_offers=min_offers
+        )
+    else:
+        # Construire la requête de base
+        query = db.query(
+            JobOffer.job_title,
+            JobOffer.ia_risk_level,
+            JobOffer.sector,
+            func.count(JobOffer.id).label('offer_count'),
+            func.avg(JobOffer.ia_risk_score).label('avg_score'),
+            func.group_concat(JobOffer.company.distinct()).label('companies'),
+            func.group_concat(JobOffer.suggestions).label('all_suggestions'),
+            func.min(JobOffer.scraped_at).label('first_seen'),
+            func.max(JobOffer.scraped_at).label('last_seen')
+        ).filter(
+            JobOffer.is_active == True,
+            JobOffer.job_title != '',
+            JobOffer.ia_risk_level != ''
+        )
+        
+        # Appliquer les filtres
+        if french_level:
+            query = query.filter(JobOffer.ia_risk_level == french_level)
+        
+        if sector:
+            query = query.filter(JobOffer.sector.contains(sector))
+        
+        # Exécuter la requête
+        jobs_data = query.group_by(
+            JobOffer.job_title, JobOffer.ia_risk_level, JobOffer.sector
+        ).having(
+            func.count(JobOffer.id) >= min_offers
+        ).order_by(
+            desc('offer_count')
+        ).all()
     
     # Organiser les résultats
     risk_categories = {
@@ -782,9 +856,10 @@ def jobs_by_risk_detailed():
     })
 
 @bp.route('/demo')
+@cached_response
 def demo_endpoint():
     """Endpoint de démonstration pour le hackathon"""
-    db = next(get_db())
+    db = get_request_db()
     
     # Trouver l'offre la plus à risque pour la démo
     demo_offer = db.query(JobOffer).filter(
@@ -833,23 +908,13 @@ def demo_endpoint():
             "difference_risk": round(demo_offer.ia_risk_score - rec.ia_risk_score, 1)
         })
     
-    # Statistiques pour la démo
+    # Statistiques pour la démo (une seule requête agrégée)
+    totals = compute_risk_totals(db)
     stats = {
-        "total_high_risk": db.query(func.count(JobOffer.id)).filter(
-            JobOffer.is_active == True,
-            JobOffer.ia_risk_level == 'Élevé'
-        ).scalar() or 0,
-        "total_medium_risk": db.query(func.count(JobOffer.id)).filter(
-            JobOffer.is_active == True,
-            JobOffer.ia_risk_level == 'Moyen'
-        ).scalar() or 0,
-        "total_low_risk": db.query(func.count(JobOffer.id)).filter(
-            JobOffer.is_active == True,
-            JobOffer.ia_risk_level == 'Faible'
-        ).scalar() or 0,
-        "total_offers": db.query(func.count(JobOffer.id)).filter(
-            JobOffer.is_active == True
-        ).scalar() or 0
+        "total_high_risk": totals["risk_distribution"]['Élevé'],
+        "total_medium_risk": totals["risk_distribution"]['Moyen'],
+        "total_low_risk": totals["risk_distribution"]['Faible'],
+        "total_offers": totals["total_offers"]
     }
     
     return jsonify({
@@ -0,0 +1,126 @@
+"""
+Index de recherche partagé par les endpoints /search et /search-job
+
+L'index inversé est construit au premier usage puis reconstruit en
+arrière-plan quand la génération des données change (nouveau scraping) ;
+l'ancien index continue de servir pendant la reconstruction.
+"""
+
+import logging
+import threading
+import time
+import config
+from database.models import SessionLocal, JobOffer
+from database.generation import get_data_generation
+from models.search_index import OfferSearchIndex
+
+logger = logging.getLogger(__name__)
+
+class SearchIndexHolder:
+    """Index courant + reconstruction quand les données changent"""
+
+    def __init__(self, generation_poll_seconds=5):
+        self.generation_poll_seconds = generation_poll_seconds
+
+        self._index = None
+        self._generation = None
+        self._generation_checked_at = 0.0
+        self._lock = threading.Lock()
+        # Première construction : une seule, les autres requêtes l'attendent
+        self._first_build_lock = threading.Lock()
+        self._rebuilding = False
+
+        self.builds = 0
+        self.last_build_seconds = 0.0
+
+    def _build(self):
+        """Lire les offres actives en flux et construire un nouvel index"""
+        db = SessionLocal()
+        try:
+            generation = get_data_generation(db)
+            rows = db.query(
+                JobOffer.id,
+                JobOffer.title,
+                JobOffer.job_title,
+                JobOffer.sector,
+                JobOffer.company,
+                JobOffer.location,
+                JobOffer.description
+            ).filter(JobOffer.is_active == True).yield_per(5000)
+
+            start = time.perf_counter()
+            index = OfferSearchIndex.build(rows)
+            elapsed = time.perf_counter() - start
+        finally:
+            db.close()
+
+        with self._lock:
+            self._index = index
+            self._generation = generation
+            self.builds += 1
+            self.last_build_seconds = elapsed
+
+        logger.info(f"🔎 Index de recherche construit: {len(index)} offres en {elapsed:.2f}s")
+        return index
+
+    def _rebuild_in_background(self):
+        try:
+            self._build()
+        except Exception as e:
+            logger.error(f"❌ Reconstruction de l'index de recherche échouée: {e}")
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    def _check_generation(self):
+        """Lancer une reconstruction si la génération a changé depuis la dernière"""
+        # Un seul thread interroge la base par intervalle (la requête se fait hors verrou)
+        with self._lock:
+            now = time.monotonic()
+            if now - self._generation_checked_at < self.generation_poll_seconds:
+                return
+            self._generation_checked_at = now
+
+        db = SessionLocal()
+        try:
+            generation = get_data_generation(db)
+        finally:
+            db.close()
+
+        with self._lock:
+            if generation == self._generation or self._rebuilding:
+                return
+            self._rebuilding = True
+
+        threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+
+    def get(self):
+        """Index à jour (construit de façon synchrone la première fois)"""
+        with self._lock:
+            index = self._index
+
+        if index is None:
+            with self._first_build_lock:
+                with self._lock:
+                    index = self._index
+                if index is not None:
+                    # Construit par une autre requête pendant l'attente
+                    return index
+                with self._lock:
+                    self._generation_checked_at = time.monotonic()
+                return self._build()
+
+        self._check_generation()
+        return index
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": len(self._index) if self._index is not None else 0,
+                "data_generation": self._generation,
+                "builds": self.builds,
+                "last_build_seconds": round(self.last_build_seconds, 3),
+                "rebuilding": self._rebuilding
+            }
+
+search_index = SearchIndexHolder(config.Config.SEARCH_INDEX_GENERATION_POLL_SECONDS)
@@ -30,10 +30,13 @@ def create_app():
                 "/api/health": "Vérifier l'état du service",
                 "/api/offers": "Toutes les offres d'emploi",
                 "/api/offers/<job>": "Offres par métier",
+                "/api/export": "Export complet en flux (NDJSON ou CSV)",
                 "/api/risk-analysis": "Analyse des risques IA",
                 "/api/recommendations/<job>": "Recommandations de transition",
                 "/api/search": "Recherche d'offres",
-                "/api/statistics": "Statistiques générales"
+                "/api/statistics": "Statistiques générales",
+                "/api/cache-stats": "Statistiques du cache de réponses",
+                "/api/pool-stats": "État du pool de connexions MySQL"
             }
         }
     
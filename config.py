@@ -3,6 +3,7 @@ Configuration de l'application
 """
 
 import os
+import tempfile
 from datetime import timedelta
 
 class Config:
@@ -22,10 +23,67 @@ class Config:
     API_HOST = os.getenv('API_HOST', '0.0.0.0')
     API_PORT = int(os.getenv('API_PORT', 5000))
     
+    # Pool de connexions : avertir si un checkout attend plus longtemps
+    POOL_WAIT_WARNING_SECONDS = float(os.getenv('POOL_WAIT_WARNING_SECONDS', 0.5))
+    
+    # Cache de réponses de l'API (invalidé par la génération des données)
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', '1') != '0'
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 256))
+    RESPONSE_CACHE_TTL_SECONDS = int(os.getenv('RESPONSE_CACHE_TTL_SECONDS', 300))
+    RESPONSE_CACHE_GENERATION_POLL_SECONDS = 5
+    
+    # Index de recherche en mémoire (reconstruit après chaque scraping)
+    SEARCH_INDEX_GENERATION_POLL_SECONDS = 5
+    SEARCH_MAX_CANDIDATES = int(os.getenv('SEARCH_MAX_CANDIDATES', 5000))
+    
     # Scraping
     SCRAPE_INTERVAL_HOURS = 6
     MAX_OFFERS_PER_CATEGORY = 100
     
+    # Sources crawlées en parallèle par le scheduler (scheduler/crawl_orchestrator.py)
+    CRAWL_SOURCES = [name.strip() for name in os.getenv('CRAWL_SOURCES', 'asako,portaljob').split(',') if name.strip()]
+    
+    # Scheduler : un seul crawl à la fois (verrou entre processus), crawls trop rapprochés fusionnés
+    RUN_LOCK_DIR = os.getenv('RUN_LOCK_DIR', os.path.join(tempfile.gettempdir(), 'safe_ai_locks'))
+    CRAWL_MIN_GAP_MINUTES = int(os.getenv('CRAWL_MIN_GAP_MINUTES', 30))
+    SCHEDULER_MISFIRE_GRACE_SECONDS = int(os.getenv('SCHEDULER_MISFIRE_GRACE_SECONDS', 900))
+    
+    # Politesse du scraping : débit et requêtes simultanées par site
+    SCRAPER_REQUESTS_PER_SECOND = float(os.getenv('SCRAPER_REQUESTS_PER_SECOND', 2.0))
+    SCRAPER_BURST = int(os.getenv('SCRAPER_BURST', 2))
+    SCRAPER_MAX_CONCURRENCY_PER_HOST = int(os.getenv('SCRAPER_MAX_CONCURRENCY_PER_HOST', 4))
+    
+    # Client HTTP des scrapers : tentatives par requête, délai exponentiel entre elles
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', 3))
+    HTTP_BACKOFF_SECONDS = float(os.getenv('HTTP_BACKOFF_SECONDS', 1.0))
+    HTTP_MAX_BACKOFF_SECONDS = float(os.getenv('HTTP_MAX_BACKOFF_SECONDS', 30))
+    HTTP_TIMEOUT_SECONDS = float(os.getenv('HTTP_TIMEOUT_SECONDS', 15))
+    HTTP_TIMINGS_KEPT = int(os.getenv('HTTP_TIMINGS_KEPT', 1000))  # Mesures gardées par client
+    
+    # Processus d'analyse des pages : extraction + score IA (0 = dans le processus principal)
+    SCRAPER_PARSE_WORKERS = int(os.getenv('SCRAPER_PARSE_WORKERS', 0))
+    
+    # Cache des scores de risque entre deux scrapings (vide = en mémoire seulement)
+    SCORING_CACHE_PATH = os.getenv('SCORING_CACHE_PATH', '')
+    
+    # Cache des pages scrapées : ETag/Last-Modified/empreinte par URL (vide = désactivé)
+    PAGE_CACHE_PATH = os.getenv('PAGE_CACHE_PATH', '')
+    PAGE_CACHE_MAX_AGE_HOURS = float(os.getenv('PAGE_CACHE_MAX_AGE_HOURS', 24))
+    
+    # Extraction PortalJob en un passage sans arbre BeautifulSoup (0 = BeautifulSoup)
+    PORTALJOB_FAST_PARSING = os.getenv('PORTALJOB_FAST_PARSING', '1') != '0'
+    
+    # Enrichissement des offres PortalJob depuis leur page de détail
+    ENRICH_CONCURRENCY = int(os.getenv('ENRICH_CONCURRENCY', 4))
+    ENRICH_REQUESTS_PER_SECOND = float(os.getenv('ENRICH_REQUESTS_PER_SECOND', 1.0))
+    ENRICH_BATCH_SIZE = int(os.getenv('ENRICH_BATCH_SIZE', 50))
+    ENRICH_MAX_ATTEMPTS = int(os.getenv('ENRICH_MAX_ATTEMPTS', 3))
+    ENRICH_MAX_PER_RUN = int(os.getenv('ENRICH_MAX_PER_RUN', 500))  # 0 = toute la file
+    ENRICH_INTERVAL_MINUTES = int(os.getenv('ENRICH_INTERVAL_MINUTES', 30))
+    
+    # Mesures de chaque scraping (durées par étape, octets, compteurs) dans scrape_runs
+    SCRAPE_RUNS_ENABLED = os.getenv('SCRAPE_RUNS_ENABLED', '1') != '0'
+    
     # Analyse IA
     HIGH_RISK_THRESHOLD = 7.5
     MEDIUM_RISK_THRESHOLD = 5.0
@@ -0,0 +1,120 @@
+"""
+Agrégations partagées pour les endpoints de statistiques
+
+Toute la distribution des risques, le score moyen et les tops
+(secteurs, localisations, entreprises, métiers) sont calculés en
+deux requêtes groupées au lieu d'un COUNT par niveau de risque.
+Quand les tables de rollup existent, elles sont lues à la place de
+job_offers.
+"""
+
+from sqlalchemy import func, case, desc, literal, select, union_all
+from database.models import JobOffer
+from database import rollups
+
+RISK_LEVELS = ['Élevé', 'Moyen', 'Faible']
+
+# Dimensions agrégées dans le scan groupé : nom -> colonne
+TOP_DIMENSIONS = {
+    'sector': JobOffer.sector,
+    'location': JobOffer.location,
+    'company': JobOffer.company,
+    'job_title': JobOffer.job_title,
+    'source': JobOffer.source,
+}
+
+def _level_count(level):
+    """Compter les offres d'un niveau de risque (agrégation conditionnelle)"""
+    return func.sum(case((JobOffer.ia_risk_level == level, 1), else_=0))
+
+def compute_risk_totals(db):
+    """Total, distribution des risques et score moyen en une seule requête"""
+    if rollups.rollups_available(db):
+        return rollups.risk_totals_from_rollups(db)
+
+    row = db.query(
+        func.count(JobOffer.id),
+        func.avg(JobOffer.ia_risk_score),
+        *[_level_count(level) for level in RISK_LEVELS]
+    ).filter(JobOffer.is_active == True).one()
+
+    total, avg_score = row[0] or 0, row[1]
+
+    return {
+        "total_offers": total,
+        "risk_distribution": {
+            level: int(count or 0) for level, count in zip(RISK_LEVELS, row[2:])
+        },
+        "average_risk_score": float(avg_score) if avg_score else 0.0
+    }
+
+def _dimension_select(name, column):
+    """Sous-requête groupée pour une dimension du UNION ALL"""
+    return select(
+        literal(name).label('dimension'),
+        column.label('value'),
+        func.count(JobOffer.id).label('count'),
+        _level_count('Élevé').label('high_risk_count')
+    ).where(
+        JobOffer.is_active == True,
+        column != ''
+    ).group_by(column)
+
+def _top_rows(query, top_n, order_by):
+    """Les top_n lignes d'une branche du UNION ALL
+
+    ORDER BY / LIMIT dans une sous-requête : accepté tel quel par MySQL et
+    SQLite, et seules top_n lignes par dimension reviennent de la base.
+    """
+    rows = query.order_by(desc(order_by), query.selected_columns.value).limit(top_n).subquery()
+    return select(*rows.c)
+
+def _high_risk_sector_select(sector_select):
+    """Secteurs à haut risque, issus de la même agrégation que les secteurs"""
+    sectors = sector_select.subquery()
+    return select(
+        literal('high_risk_sector').label('dimension'),
+        sectors.c.value,
+        sectors.c.count,
+        sectors.c.high_risk_count
+    ).where(sectors.c.high_risk_count > 0)
+
+def compute_top_values(db, top_n=5):
+    """Tops par dimension en un seul aller-retour (UNION ALL de GROUP BY limités)"""
+    if rollups.rollups_available(db):
+        selects = rollups.top_dimension_selects()
+    else:
+        selects = {name: _dimension_select(name, column) for name, column in TOP_DIMENSIONS.items()}
+    high_risk_sectors = _high_risk_sector_select(selects['sector'])
+
+    query = union_all(
+        *[_top_rows(select_, top_n, select_.selected_columns.count) for select_ in selects.values()],
+        _top_rows(high_risk_sectors, top_n, high_risk_sectors.selected_columns.high_risk_count)
+    )
+
+    rows_by_dimension = {name: [] for name in list(TOP_DIMENSIONS) + ['high_risk_sector']}
+    for dimension, value, count, high_risk_count in db.execute(query):
+        rows_by_dimension[dimension].append((value, int(count), int(high_risk_count or 0)))
+
+    # L'ordre des lignes d'un UNION ALL n'est pas garanti : même tri qu'en SQL
+    tops = {
+        name: [(value, count) for value, count, _ in sorted(rows, key=lambda r: (-r[1], r[0]))]
+        for name, rows in rows_by_dimension.items() if name != 'high_risk_sector'
+    }
+    tops['high_risk_sector'] = [
+        (value, high_count)
+        for value, _, high_count in sorted(rows_by_dimension['high_risk_sector'], key=lambda r: (-r[2], r[0]))
+    ]
+
+    return tops
+
+def compute_offer_aggregates(db, top_n=5):
+    """Toutes les agrégations des endpoints /statistics, /risk-analysis et /demo"""
+    aggregates = compute_risk_totals(db)
+
+    if aggregates["total_offers"] == 0:
+        aggregates["top"] = {name: [] for name in list(TOP_DIMENSIONS) + ['high_risk_sector']}
+    else:
+        aggregates["top"] = compute_top_values(db, top_n=top_n)
+
+    return aggregates
@@ -0,0 +1,251 @@
+"""
+Écriture groupée des offres scrapées
+
+Les offres sont accumulées puis écrites par lots : un SELECT des liens
+déjà connus pour classer le lot (nouvelles / modifiées / inchangées),
+puis un seul INSERT ... ON DUPLICATE KEY UPDATE multi-lignes sur la clé
+unique `link` et un seul commit par lot.
+"""
+
+import math
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+from sqlalchemy import func, select, tuple_
+from database.models import JobOffer, SessionLocal, get_engine
+
+# Colonnes comparées et mises à jour quand une offre existe déjà
+# (scraped_at reste la date de première découverte)
+UPDATE_COLUMNS = [
+    'title', 'company', 'contract_type', 'sector', 'job_title',
+    'location', 'description', 'ia_risk_score', 'ia_risk_level', 'suggestions',
+    'deadline', 'is_urgent', 'reference', 'source', 'is_active'
+]
+
+# Colonnes écrites à l'insertion puis seulement si elles sont encore NULL :
+# les scrapers datent "aujourd'hui" les offres sans date, la date ne doit
+# pas avancer à chaque nouveau scraping
+FILL_COLUMNS = ['date_posted']
+
+# SGBD qui ont un upsert multi-lignes (voir upsert_statement)
+UPSERT_DIALECTS = ('mysql', 'sqlite', 'postgresql')
+
+def _same_value(old, new):
+    """Égalité tolérante (FLOAT MySQL en simple précision)"""
+    if isinstance(old, float) or isinstance(new, float):
+        if old is None or new is None:
+            return old is new
+        return math.isclose(old, new, rel_tol=1e-6, abs_tol=1e-6)
+    return old == new
+
+def check_upsert_dialect(dialect_name):
+    """Lever ValueError si le SGBD n'a pas d'upsert multi-lignes"""
+    if dialect_name not in UPSERT_DIALECTS:
+        raise ValueError(
+            f"Écriture groupée impossible avec {dialect_name} "
+            f"(SGBD supportés: {', '.join(UPSERT_DIALECTS)})"
+        )
+
+def upsert_statement(dialect_name, rows, columns, table=None, key='link', fill_columns=()):
+    """INSERT multi-lignes avec mise à jour de `columns` sur conflit de la clé unique `key` selon le SGBD
+
+    Les `fill_columns` ne sont mises à jour que si leur valeur en base est NULL.
+    """
+    check_upsert_dialect(dialect_name)
+    if table is None:
+        table = JobOffer.__table__
+
+    if dialect_name == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(rows)
+        incoming = stmt.inserted
+    else:
+        if dialect_name == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).values(rows)
+        incoming = stmt.excluded
+
+    updates = {column: incoming[column] for column in columns}
+    updates.update({column: func.coalesce(table.c[column], incoming[column]) for column in fill_columns})
+
+    if dialect_name == 'mysql':
+        return stmt.on_duplicate_key_update(updates)
+    return stmt.on_conflict_do_update(index_elements=[key], set_=updates)
+
+class OfferBatchWriter:
+    """Accumuler des offres et les écrire par lots (upsert sur `link`)"""
+
+    def __init__(self, batch_size=200, match_title_company=False, write_lock=None):
+        # SGBD vérifié dès la création : pas d'erreur au milieu d'un scraping
+        check_upsert_dialect(get_engine().dialect.name)
+        self.batch_size = batch_size
+        # PortalJob : une offre republiée sous un autre lien est un doublon
+        self.match_title_company = match_title_company
+        # Verrou partagé (SharedOfferWriter) : un seul lot écrit à la fois
+        self._write_lock = write_lock or nullcontext()
+
+        self._pending = {}
+
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.duplicates = 0
+        self.failed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def add(self, row):
+        """Ajouter une offre (dict de colonnes JobOffer), écrire le lot s'il est plein"""
+        if not row.get('link'):
+            return
+        row.setdefault('is_active', True)
+        # Même lien deux fois dans un lot : la dernière version gagne
+        self._pending[row['link']] = row
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    @staticmethod
+    def _unchanged(record, row):
+        """Offre déjà en base identique (les FILL_COLUMNS ne comptent que si elles sont NULL en base)"""
+        return all(
+            _same_value(getattr(record, column), row[column])
+            for column in UPDATE_COLUMNS if column in row
+        ) and all(
+            getattr(record, column) is not None or row[column] is None
+            for column in FILL_COLUMNS if column in row
+        )
+
+    def _classify(self, db, rows):
+        """Séparer les lignes à écrire (nouvelles / modifiées) des inchangées"""
+        links = [row['link'] for row in rows]
+        existing = {
+            record.link: record
+            for record in db.execute(
+                select(JobOffer.link, *[getattr(JobOffer, column) for column in UPDATE_COLUMNS + FILL_COLUMNS])
+                .where(JobOffer.link.in_(links))
+            )
+        }
+
+        new_rows = [row for row in rows if row['link'] not in existing]
+        changed_rows = [
+            row for row in rows
+            if row['link'] in existing and not self._unchanged(existing[row['link']], row)
+        ]
+        unchanged = len(rows) - len(new_rows) - len(changed_rows)
+
+        duplicates = 0
+        if self.match_title_company and new_rows:
+            known = set(db.execute(
+                select(JobOffer.title, JobOffer.company).where(
+                    tuple_(JobOffer.title, JobOffer.company).in_(
+                        {(row['title'], row.get('company')) for row in new_rows}
+                    )
+                )
+            ).all())
+            # Le même couple deux fois dans le lot : seule la première offre est gardée
+            kept = []
+            for row in new_rows:
+                key = (row['title'], row.get('company'))
+                if key not in known:
+                    known.add(key)
+                    kept.append(row)
+            duplicates = len(new_rows) - len(kept)
+            new_rows = kept
+
+        return new_rows, changed_rows, unchanged, duplicates
+
+    def flush(self):
+        """Écrire le lot courant, retourne les compteurs de ce lot"""
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicates': 0, 'failed': 0}
+        if not self._pending:
+            return counts
+
+        rows = list(self._pending.values())
+        self._pending = {}
+
+        with self._write_lock:
+            db = SessionLocal()
+            try:
+                new_rows, changed_rows, unchanged, duplicates = self._classify(db, rows)
+
+                # Seules les colonnes fournies par le scraper sont écrites
+                # (les autres gardent leur valeur en base)
+                columns = [column for column in UPDATE_COLUMNS if column in rows[0]]
+                fill_columns = [column for column in FILL_COLUMNS if column in rows[0]]
+
+                to_write = []
+                now = datetime.now()
+                for row in new_rows + changed_rows:
+                    values = {column: row.get(column) for column in columns + fill_columns}
+                    values['link'] = row['link']
+                    values['scraped_at'] = row.get('scraped_at') or now
+                    to_write.append(values)
+
+                if to_write:
+                    db.execute(upsert_statement(
+                        db.get_bind().dialect.name, to_write, columns, fill_columns=fill_columns
+                    ))
+                    db.commit()
+
+                counts.update(
+                    inserted=len(new_rows),
+                    updated=len(changed_rows),
+                    unchanged=unchanged,
+                    duplicates=duplicates
+                )
+            except Exception as e:
+                db.rollback()
+                print(f"❌ Erreur écriture groupée ({len(rows)} offres): {e}")
+                counts['failed'] = len(rows)
+            finally:
+                db.close()
+
+        self.inserted += counts['inserted']
+        self.updated += counts['updated']
+        self.unchanged += counts['unchanged']
+        self.duplicates += counts['duplicates']
+        self.failed += counts['failed']
+        return counts
+
+    def stats(self):
+        return {
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'duplicates': self.duplicates,
+            'failed': self.failed
+        }
+
+class SharedOfferWriter:
+    """Écriture commune à plusieurs scrapers lancés en parallèle
+
+    Chaque scraper obtient son OfferBatchWriter (ses lots, ses compteurs
+    par page, sa déduplication), mais tous écrivent sous le même verrou :
+    les lots sont classés et commités l'un après l'autre, sans transactions
+    concurrentes sur la clé unique `link`, et les compteurs de toute
+    l'exécution sont cumulés ici.
+    """
+
+    def __init__(self, batch_size=200):
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._writers = []
+
+    def writer(self, match_title_company=False):
+        """Nouvel OfferBatchWriter branché sur le verrou commun"""
+        writer = OfferBatchWriter(self.batch_size, match_title_company, write_lock=self._lock)
+        self._writers.append(writer)
+        return writer
+
+    def stats(self):
+        totals = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicates': 0, 'failed': 0}
+        for writer in self._writers:
+            for key, value in writer.stats().items():
+                totals[key] += value
+        return totals
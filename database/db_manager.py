@@ -1,36 +1,17 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy.ext.declarative import declarative_base
-import config
-import traceback
+from sqlalchemy import text
+from sqlalchemy.orm import scoped_session
 
-# Utilisez DATABASE_URL qui a été ajouté à config.py
-DATABASE_URL = config.DATABASE_URL
-
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    pool_size=5,
-    max_overflow=10,
-    echo=False
-)
-
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
+# Un seul engine configuré pour toute l'application : il est créé
+# paresseusement par database.models (plus de second pool ici)
+from database.models import Base, SessionLocal, get_db, get_engine, DATABASE_URL
 
 SessionScoped = scoped_session(SessionLocal)
-Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def __getattr__(name):
+    """Compatibilité : `from database.db_manager import engine`"""
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_db_session():
     return SessionLocal()
@@ -0,0 +1,52 @@
+"""
+Compteur de "génération" des données
+
+Les scrapers et le scheduler incrémentent ce compteur après chaque
+commit ; l'API s'en sert pour invalider son cache de réponses sans
+attendre l'expiration du TTL.
+"""
+
+from datetime import datetime
+from sqlalchemy import update
+from database.models import DataGeneration
+
+def bump_data_generation(db):
+    """Incrémenter la génération (à appeler dans la transaction d'écriture)"""
+    updated = db.execute(
+        update(DataGeneration).where(DataGeneration.id == 1).values(
+            generation=DataGeneration.generation + 1,
+            updated_at=datetime.now()
+        )
+    ).rowcount
+
+    if not updated:
+        db.add(DataGeneration(id=1, generation=1, updated_at=datetime.now()))
+
+def get_data_generation(db):
+    """Lire la génération courante (None si la table n'existe pas encore)"""
+    try:
+        row = db.get(DataGeneration, 1)
+        return row.generation if row else 0
+    except Exception:
+        db.rollback()
+        return None
+
+def bump_data_generation_safely(logger=None):
+    """Incrémenter la génération avec sa propre session (fin de scraping)"""
+    from database.models import SessionLocal
+
+    db = SessionLocal()
+    try:
+        bump_data_generation(db)
+        db.commit()
+        return True
+    except Exception as e:
+        db.rollback()
+        message = f"⚠️  Impossible de mettre à jour la génération des données: {e}"
+        if logger:
+            logger.warning(message)
+        else:
+            print(message)
+        return False
+    finally:
+        db.close()
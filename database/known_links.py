@@ -0,0 +1,34 @@
+"""
+Liens des offres déjà en base
+
+Utilisé par le mode incrémental des scrapers : les liens connus sont
+chargés une fois au début du scraping, puis la pagination s'arrête dès
+qu'une page ne contient plus que des offres déjà enregistrées.
+"""
+
+from sqlalchemy import select
+from database.models import SessionLocal, JobOffer
+
+def load_known_links(source=None):
+    """Ensemble des liens en base (d'une seule source si précisée)"""
+    query = select(JobOffer.link)
+    if source:
+        query = query.where(JobOffer.source == source)
+
+    db = SessionLocal()
+    try:
+        return set(db.execute(query.execution_options(yield_per=10000)).scalars())
+    finally:
+        db.close()
+
+def load_known_links_safely(source=None, logger=None):
+    """Comme load_known_links, None si la base est inaccessible (scraping complet)"""
+    try:
+        return load_known_links(source)
+    except Exception as e:
+        message = f"⚠️  Liens connus indisponibles, scraping complet: {e}"
+        if logger:
+            logger.warning(message)
+        else:
+            print(message)
+        return None
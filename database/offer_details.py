@@ -0,0 +1,93 @@
+"""
+File d'attente et écriture des détails d'offres
+
+La file d'attente de l'enrichissement est la table job_offer_details
+elle-même : une offre active sans ligne de détail, ou dont la dernière
+tentative a échoué moins de `max_attempts` fois, reste à enrichir. Un
+enrichissement interrompu reprend donc là où il s'était arrêté, et les
+offres déjà enrichies ne sont jamais retéléchargées.
+"""
+
+import json
+from sqlalchemy import select, or_, and_
+from database.models import JobOffer, JobOfferDetail, SessionLocal, get_engine
+from database.bulk_writer import upsert_statement
+from database.generation import bump_data_generation
+
+# Colonnes réécrites quand une offre a déjà une ligne de détail (nouvelle tentative)
+DETAIL_COLUMNS = [
+    'full_description', 'skills', 'salary', 'location', 'date_published',
+    'status', 'attempts', 'last_error', 'enriched_at'
+]
+
+def ensure_details_table():
+    """Créer la table job_offer_details si elle n'existe pas encore"""
+    JobOfferDetail.__table__.create(bind=get_engine(), checkfirst=True)
+
+def pending_detail_offers(source, after_id=0, limit=100, max_attempts=3):
+    """[(id, lien, tentatives)] des offres à enrichir, par id croissant après `after_id`"""
+    query = select(JobOffer.id, JobOffer.link, JobOfferDetail.attempts).outerjoin(
+        JobOfferDetail, JobOfferDetail.offer_id == JobOffer.id
+    ).where(
+        JobOffer.source == source,
+        JobOffer.is_active == True,
+        JobOffer.id > after_id,
+        or_(
+            JobOfferDetail.id.is_(None),
+            and_(JobOfferDetail.status == 'failed', JobOfferDetail.attempts < max_attempts)
+        )
+    ).order_by(JobOffer.id).limit(limit)
+
+    db = SessionLocal()
+    try:
+        return [tuple(row) for row in db.execute(query)]
+    finally:
+        db.close()
+
+def write_offer_details(rows):
+    """Écrire un lot de détails (un upsert sur offer_id, un commit)
+
+    La génération des données est incrémentée dans la même transaction
+    si des offres ont été enrichies, pour invalider le cache de l'API.
+    """
+    if not rows:
+        return
+
+    db = SessionLocal()
+    try:
+        db.execute(upsert_statement(
+            db.get_bind().dialect.name, rows, DETAIL_COLUMNS,
+            table=JobOfferDetail.__table__, key='offer_id'
+        ))
+        if any(row['status'] == 'ok' for row in rows):
+            bump_data_generation(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def offer_details(db, offer_id):
+    """Détails enrichis d'une offre (None si absents ou table pas encore créée)"""
+    try:
+        detail = db.execute(
+            select(JobOfferDetail).where(
+                JobOfferDetail.offer_id == offer_id,
+                JobOfferDetail.status == 'ok'
+            )
+        ).scalar_one_or_none()
+    except Exception:
+        db.rollback()
+        return None
+
+    if detail is None:
+        return None
+    return {
+        'full_description': detail.full_description,
+        'skills': json.loads(detail.skills) if detail.skills else [],
+        'salary': detail.salary,
+        'location': detail.location,
+        'date_published': detail.date_published,
+        'enriched_at': detail.enriched_at.isoformat() if detail.enriched_at else None
+    }
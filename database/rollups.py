@@ -0,0 +1,263 @@
+"""
+Tables de rollup pré-calculées pour les endpoints de statistiques
+
+Les données ne changent qu'à la fin d'un scraping : les GROUP BY sur
+job_offers sont donc matérialisés une fois par exécution puis lus par
+l'API au lieu de scanner la table des offres à chaque requête.
+"""
+
+from datetime import datetime
+from sqlalchemy import func, case, literal, select, insert, delete
+from database.models import (
+    JobOffer, JobRiskRollup, LocationRollup, CompanyRollup, SourceRollup, RollupStatus
+)
+from database.generation import bump_data_generation
+
+def _level_count(level):
+    return func.sum(case((JobOffer.ia_risk_level == level, 1), else_=0))
+
+def _rebuild_job_risk(db):
+    """Rollup par métier × niveau de risque × secteur"""
+    columns = [
+        'job_title', 'ia_risk_level', 'sector', 'offer_count', 'score_sum',
+        'scored_count', 'min_score', 'max_score', 'suggestions', 'companies',
+        'first_seen', 'last_seen', 'example_offer_id'
+    ]
+    source = select(
+        JobOffer.job_title,
+        JobOffer.ia_risk_level,
+        JobOffer.sector,
+        func.count(JobOffer.id),
+        func.sum(JobOffer.ia_risk_score),
+        func.count(JobOffer.ia_risk_score),
+        func.min(JobOffer.ia_risk_score),
+        func.max(JobOffer.ia_risk_score),
+        func.group_concat(JobOffer.suggestions.distinct()),
+        func.group_concat(JobOffer.company.distinct()),
+        func.min(JobOffer.scraped_at),
+        func.max(JobOffer.scraped_at),
+        func.min(JobOffer.id)
+    ).where(
+        JobOffer.is_active == True
+    ).group_by(
+        JobOffer.job_title, JobOffer.ia_risk_level, JobOffer.sector
+    )
+    db.execute(insert(JobRiskRollup).from_select(columns, source))
+
+def _rebuild_counts(db, model, column_name):
+    """Rollup simple (nombre d'offres + offres à haut risque) sur une colonne"""
+    column = getattr(JobOffer, column_name)
+    source = select(
+        column,
+        func.count(JobOffer.id),
+        _level_count('Élevé')
+    ).where(
+        JobOffer.is_active == True
+    ).group_by(column)
+    db.execute(insert(model).from_select([column_name, 'offer_count', 'high_risk_count'], source))
+
+def _rebuild_source(db):
+    """Rollup par source (asako, portaljob...)"""
+    columns = [
+        'source', 'offer_count', 'high_risk_count', 'medium_risk_count',
+        'low_risk_count', 'score_sum', 'scored_count'
+    ]
+    source = select(
+        JobOffer.source,
+        func.count(JobOffer.id),
+        _level_count('Élevé'),
+        _level_count('Moyen'),
+        _level_count('Faible'),
+        func.sum(JobOffer.ia_risk_score),
+        func.count(JobOffer.ia_risk_score)
+    ).where(
+        JobOffer.is_active == True
+    ).group_by(JobOffer.source)
+    db.execute(insert(SourceRollup).from_select(columns, source))
+
+def refresh_rollups(db):
+    """Reconstruire toutes les tables de rollup dans une seule transaction"""
+    try:
+        for model in (JobRiskRollup, LocationRollup, CompanyRollup, SourceRollup):
+            db.execute(delete(model))
+
+        _rebuild_job_risk(db)
+        _rebuild_counts(db, LocationRollup, 'location')
+        _rebuild_counts(db, CompanyRollup, 'company')
+        _rebuild_source(db)
+
+        offer_count = db.query(func.sum(SourceRollup.offer_count)).scalar() or 0
+
+        status = db.get(RollupStatus, 1)
+        if status is None:
+            status = RollupStatus(id=1)
+            db.add(status)
+        status.refreshed_at = datetime.now()
+        status.offer_count = int(offer_count)
+
+        # Les réponses en cache de l'API sont basées sur les anciens rollups
+        bump_data_generation(db)
+
+        db.commit()
+        return int(offer_count)
+    except Exception:
+        db.rollback()
+        raise
+
+def _report(logger, level, message):
+    """Logger si disponible, sinon print (scripts de scraping)"""
+    if logger:
+        getattr(logger, level)(message)
+    else:
+        print(message)
+
+def refresh_rollups_safely(logger=None):
+    """Reconstruire les rollups avec sa propre session (fin de scraping)"""
+    from database.models import SessionLocal
+
+    db = SessionLocal()
+    try:
+        offer_count = refresh_rollups(db)
+        _report(logger, 'info', f"📊 Rollups reconstruits ({offer_count} offres actives)")
+        return True
+    except Exception as e:
+        _report(logger, 'warning', f"⚠️  Impossible de reconstruire les rollups: {e}")
+        return False
+    finally:
+        db.close()
+
+def rollups_available(db):
+    """Les rollups ont-ils déjà été construits ?"""
+    try:
+        return db.get(RollupStatus, 1) is not None
+    except Exception:
+        # Tables de rollup absentes : on retombe sur les scans directs
+        db.rollback()
+        return False
+
+# LECTURE DES ROLLUPS
+
+def risk_totals_from_rollups(db):
+    """Total, distribution des risques et score moyen depuis rollup_source"""
+    row = db.query(
+        func.sum(SourceRollup.offer_count),
+        func.sum(SourceRollup.score_sum),
+        func.sum(SourceRollup.scored_count),
+        func.sum(SourceRollup.high_risk_count),
+        func.sum(SourceRollup.medium_risk_count),
+        func.sum(SourceRollup.low_risk_count)
+    ).one()
+
+    total, score_sum, scored_count = int(row[0] or 0), row[1], row[2]
+
+    return {
+        "total_offers": total,
+        "risk_distribution": {
+            'Élevé': int(row[3] or 0),
+            'Moyen': int(row[4] or 0),
+            'Faible': int(row[5] or 0)
+        },
+        "average_risk_score": float(score_sum) / float(scored_count) if scored_count else 0.0
+    }
+
+def top_dimension_selects():
+    """Sous-requêtes (dimension, valeur, count, high_risk_count) sur les rollups, par dimension"""
+    high_risk_offers = func.sum(case((JobRiskRollup.ia_risk_level == 'Élevé', JobRiskRollup.offer_count), else_=0))
+
+    selects = {
+        name: select(
+            literal(name).label('dimension'),
+            column.label('value'),
+            func.sum(JobRiskRollup.offer_count).label('count'),
+            high_risk_offers.label('high_risk_count')
+        ).where(column != '').group_by(column)
+        for name, column in (('sector', JobRiskRollup.sector), ('job_title', JobRiskRollup.job_title))
+    }
+
+    for name, model, column in (
+        ('location', LocationRollup, LocationRollup.location),
+        ('company', CompanyRollup, CompanyRollup.company),
+        ('source', SourceRollup, SourceRollup.source)
+    ):
+        selects[name] = select(
+            literal(name).label('dimension'),
+            column.label('value'),
+            model.offer_count.label('count'),
+            model.high_risk_count.label('high_risk_count')
+        ).where(column != '')
+
+    return selects
+
+def job_risk_groups(db, risk_level=None):
+    """Groupes (métier, niveau) pour /jobs-by-risk, fusionnés depuis rollup_job_risk
+
+    Retourne des tuples au même format que la requête directe :
+    (job_title, risk_level, count, avg_score, min_score, max_score, all_suggestions,
+     example_offer_id)
+    """
+    query = db.query(JobRiskRollup).filter(
+        JobRiskRollup.job_title != '',
+        JobRiskRollup.ia_risk_level != ''
+    )
+    if risk_level:
+        query = query.filter(JobRiskRollup.ia_risk_level == risk_level)
+
+    groups = {}
+    for row in query.all():
+        key = (row.job_title, row.ia_risk_level)
+        group = groups.setdefault(key, {
+            'count': 0, 'score_sum': 0.0, 'scored_count': 0,
+            'min_score': None, 'max_score': None, 'suggestions': [],
+            'example_offer_id': None
+        })
+        group['count'] += row.offer_count or 0
+        group['score_sum'] += row.score_sum or 0.0
+        group['scored_count'] += row.scored_count or 0
+        if row.min_score is not None:
+            group['min_score'] = row.min_score if group['min_score'] is None else min(group['min_score'], row.min_score)
+        if row.max_score is not None:
+            group['max_score'] = row.max_score if group['max_score'] is None else max(group['max_score'], row.max_score)
+        if row.suggestions:
+            group['suggestions'].append(row.suggestions)
+        if row.example_offer_id is not None:
+            current = group['example_offer_id']
+            group['example_offer_id'] = row.example_offer_id if current is None else min(current, row.example_offer_id)
+
+    results = [
+        (
+            job_title, level, group['count'],
+            group['score_sum'] / group['scored_count'] if group['scored_count'] else None,
+            group['min_score'], group['max_score'],
+            ','.join(group['suggestions']) or None,
+            group['example_offer_id']
+        )
+        for (job_title, level), group in groups.items()
+    ]
+    results.sort(key=lambda r: r[2], reverse=True)
+    return results
+
+def job_risk_sector_groups(db, risk_level=None, sector='', min_offers=1):
+    """Groupes (métier, niveau, secteur) pour /jobs-by-risk-detailed
+
+    Retourne des tuples au même format que la requête directe :
+    (job_title, risk_level, sector, offer_count, avg_score, companies,
+     all_suggestions, first_seen, last_seen)
+    """
+    query = db.query(JobRiskRollup).filter(
+        JobRiskRollup.job_title != '',
+        JobRiskRollup.ia_risk_level != '',
+        JobRiskRollup.offer_count >= min_offers
+    )
+    if risk_level:
+        query = query.filter(JobRiskRollup.ia_risk_level == risk_level)
+    if sector:
+        query = query.filter(JobRiskRollup.sector.contains(sector))
+
+    return [
+        (
+            row.job_title, row.ia_risk_level, row.sector, row.offer_count,
+            row.score_sum / row.scored_count if row.scored_count else None,
+            row.companies, row.suggestions, row.first_seen, row.last_seen
+        )
+        for row in query.order_by(JobRiskRollup.offer_count.desc()).all()
+    ]
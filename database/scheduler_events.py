@@ -0,0 +1,59 @@
+"""
+Journal des exécutions du scheduler qui n'ont pas eu lieu
+
+Un crawl planifié peut être ignoré parce qu'un autre tourne déjà dans le
+même scheduler (max_instances) ou dans un autre processus (verrou),
+fusionné avec le crawl précédent s'il arrive trop tôt après lui, ou
+manqué (scheduler arrêté ou bloqué au-delà du délai de grâce). Chaque cas
+est enregistré dans scheduler_events pour pouvoir vérifier la
+planification après coup.
+"""
+
+from datetime import datetime
+from database.models import SchedulerEvent, SessionLocal, get_engine
+
+def ensure_scheduler_events_table():
+    """Créer la table scheduler_events si elle n'existe pas encore"""
+    SchedulerEvent.__table__.create(bind=get_engine(), checkfirst=True)
+
+def _naive(moment):
+    """Heure locale sans fuseau (colonnes DateTime de la base)"""
+    if moment is not None and moment.tzinfo is not None:
+        return moment.astimezone().replace(tzinfo=None)
+    return moment
+
+def record_scheduler_event(job_id, event, scheduled_at=None, detail=None):
+    db = SessionLocal()
+    try:
+        db.add(SchedulerEvent(
+            job_id=job_id,
+            event=event,
+            scheduled_at=_naive(scheduled_at),
+            recorded_at=datetime.now(),
+            detail=detail[:500] if detail else None
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def record_scheduler_event_safely(job_id, event, scheduled_at=None, detail=None, logger=None):
+    """Comme record_scheduler_event, sans lever d'exception (le scheduler continue)"""
+    message = f"⏭️  Exécution {job_id} non lancée ({event}){': ' + detail if detail else ''}"
+    if logger:
+        logger.warning(message)
+    else:
+        print(message)
+
+    try:
+        record_scheduler_event(job_id, event, scheduled_at, detail)
+        return True
+    except Exception as e:
+        warning = f"⚠️  Impossible d'enregistrer l'événement du scheduler: {e}"
+        if logger:
+            logger.warning(warning)
+        else:
+            print(warning)
+        return False
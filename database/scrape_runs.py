@@ -0,0 +1,89 @@
+"""
+Mesures des scrapings (table scrape_runs)
+
+Chaque scraping d'une catégorie Asako, de la liste PortalJob et chaque
+crawl du scheduler écrit une ligne : durées par étape (téléchargement,
+analyse, score IA, écriture), octets téléchargés, offres analysées,
+insérées / mises à jour / ignorées et erreurs, avec le détail par page
+en JSON. Les lignes sont construites par scrapers/run_metrics.py.
+"""
+
+import json
+import threading
+from datetime import datetime
+from sqlalchemy import select
+from database.models import ScrapeRun, SessionLocal, get_engine
+
+# Colonnes de scrape_runs renseignées depuis un enregistrement de RunMetrics
+RUN_COLUMNS = [
+    'kind', 'source', 'label', 'status', 'started_at', 'finished_at', 'seconds',
+    'fetch_seconds', 'parse_seconds', 'scoring_seconds', 'write_seconds',
+    'requests', 'bytes_downloaded', 'pages', 'pages_unchanged', 'pages_failed',
+    'offers_parsed', 'inserted', 'updated', 'skipped', 'write_failures', 'errors', 'last_error'
+]
+
+# Table vérifiée une fois par processus (pas un CREATE TABLE par scraping)
+_table_ready = False
+_table_lock = threading.Lock()
+
+def ensure_scrape_runs_table():
+    """Créer la table scrape_runs si elle n'existe pas encore"""
+    global _table_ready
+    with _table_lock:
+        if not _table_ready:
+            ScrapeRun.__table__.create(bind=get_engine(), checkfirst=True)
+            _table_ready = True
+
+def record_scrape_run(record):
+    """Écrire un run, retourne son id"""
+    ensure_scrape_runs_table()
+    db = SessionLocal()
+    try:
+        run = ScrapeRun(**{column: record.get(column) for column in RUN_COLUMNS})
+        run.last_error = run.last_error[:500] if run.last_error else None
+        run.details = json.dumps(record['details'], ensure_ascii=False, default=str) if record.get('details') else None
+        db.add(run)
+        db.commit()
+        return run.id
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def record_scrape_run_safely(record, logger=None):
+    """Comme record_scrape_run, sans lever d'exception (None si l'écriture a échoué)"""
+    try:
+        return record_scrape_run(record)
+    except Exception as e:
+        warning = f"⚠️  Impossible d'enregistrer les mesures du scraping: {e}"
+        if logger:
+            logger.warning(warning)
+        else:
+            print(warning)
+        return None
+
+def recent_scrape_runs(db, limit=20, source=None, kind=None):
+    """Derniers runs, du plus récent au plus ancien ([] si la table n'existe pas encore)"""
+    query = select(ScrapeRun).order_by(ScrapeRun.id.desc()).limit(limit)
+    if source:
+        query = query.where(ScrapeRun.source == source)
+    if kind:
+        query = query.where(ScrapeRun.kind == kind)
+
+    try:
+        runs = db.execute(query).scalars().all()
+    except Exception:
+        db.rollback()
+        return []
+
+    return [run_to_dict(run) for run in runs]
+
+def run_to_dict(run):
+    """Ligne de scrape_runs -> dict sérialisable en JSON"""
+    data = {'id': run.id}
+    for column in RUN_COLUMNS:
+        value = getattr(run, column)
+        data[column] = value.isoformat() if isinstance(value, datetime) else value
+    data['details'] = json.loads(run.details) if run.details else None
+    return data
@@ -8,6 +8,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from database.models import SessionLocal, JobOffer
+from database.rollups import refresh_rollups_safely
 import json
 from datetime import datetime
 from sqlalchemy import func
@@ -20,6 +21,9 @@ def import_and_show():
     # Importer les données JSON existantes
     import_json_data()
     
+    # Reconstruire les rollups de statistiques
+    refresh_rollups_safely()
+    
     # Afficher les statistiques
     show_statistics()
     
@@ -0,0 +1,281 @@
+"""
+Score de risque d'automatisation par l'IA des scrapers
+
+Les tables de mots-clés d'Asako et de PortalJob sont compilées une fois
+dans un KeywordMatcher : chaque offre est analysée en un seul passage
+sur le texte, avec la même sémantique que les anciennes boucles
+(`keyword in text`, premier métier trouvé dans l'ordre de la table).
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Tuple
+from models.keyword_matcher import KeywordMatcher, count_bits, lowest_keyword_bit
+from models.scoring_cache import ScoringCache, read_cache_file, write_cache_file
+
+# Combinaisons de mots-clés dont le score est mémorisé
+MAX_CACHED_MASKS = 4096
+
+# Textes d'offres dont le score est mémorisé (par scorer)
+MAX_CACHED_SCORES = 50000
+
+def risk_level(score):
+    """Convertir score en niveau de risque"""
+    if score >= 8.0:
+        return "Élevé"
+    elif score >= 5.0:
+        return "Moyen"
+    else:
+        return "Faible"
+
+class IARiskScorer:
+    """Score 1-10 à partir du titre, métier, secteur et contrat"""
+
+    def __init__(self, name: str, metier_risks: Dict[str, float],
+                 sector_adjustments: List[Tuple[List[str], float]],
+                 keyword_adjustments: List[Tuple[List[str], float]],
+                 suggestions: Dict[str, List[str]]):
+        self.name = name
+        self.metier_risks = metier_risks
+        self.sector_adjustments = sector_adjustments
+        self.keyword_adjustments = keyword_adjustments
+        # Suggestions de reconversion par niveau de risque
+        self.suggestions = suggestions
+
+        # Les métiers en premier : l'ordre des bits suit l'ordre de la table
+        keywords = list(metier_risks)
+        for words, _ in sector_adjustments + keyword_adjustments:
+            keywords.extend(words)
+        self.matcher = KeywordMatcher(keywords)
+
+        self._metier_mask = self.matcher.mask(metier_risks)
+        self._metier_by_bit = {self.matcher.bits[job]: risk for job, risk in metier_risks.items()}
+        # Secteurs : ajustement appliqué une fois si un des mots est présent
+        self._sector_masks = [(self.matcher.mask(words), delta) for words, delta in sector_adjustments]
+        # Mots-clés : ajustement appliqué pour chaque mot présent
+        self._keyword_masks = [(self.matcher.mask(words), delta) for words, delta in keyword_adjustments]
+        self._score_by_mask = {}
+
+        # Version des tables : un cache sauvegardé avec d'autres poids est ignoré
+        tables = [metier_risks, sector_adjustments, keyword_adjustments]
+        self.version = hashlib.sha1(
+            json.dumps(tables, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        ).hexdigest()[:12]
+        self.cache = ScoringCache(MAX_CACHED_SCORES)
+
+    def score(self, title, metier, secteur, contrat):
+        """Calculer un score de risque d'automatisation par l'IA"""
+        # Combiner tout le texte pour l'analyse
+        text = f"{title} {metier} {secteur} {contrat}".lower()
+
+        cache_key = ScoringCache.key_for(text)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        found = self.matcher.scan(text)
+
+        # Le score ne dépend que des mots-clés trouvés
+        score = self._score_by_mask.get(found)
+        if score is None:
+            score = self._score_from_keywords(found)
+            if len(self._score_by_mask) >= MAX_CACHED_MASKS:
+                self._score_by_mask.clear()
+            self._score_by_mask[found] = score
+
+        self.cache.set(cache_key, score)
+        return score
+
+    def _score_from_keywords(self, found):
+        """Score à partir du masque des mots-clés trouvés"""
+        score = 5.0
+
+        # Score basé sur le métier (premier métier de la table présent dans le texte)
+        metier_hits = found & self._metier_mask
+        if metier_hits:
+            score = self._metier_by_bit[lowest_keyword_bit(metier_hits)]
+
+        for mask, delta in self._sector_masks:
+            if found & mask:
+                score += delta
+
+        for mask, delta in self._keyword_masks:
+            score += delta * count_bits(found & mask)
+
+        # Garder dans les limites
+        return round(max(1.0, min(10.0, score)), 1)
+
+    def suggestions_for(self, score):
+        """Suggestions de reconversion adaptées au score"""
+        return list(self.suggestions[risk_level(score)])
+
+# Tables d'asako_scraper.py
+ASAKO_SCORER = IARiskScorer(
+    name='asako',
+    metier_risks={
+        'chauffeur': 9.0, 'conducteur': 9.0, 'driver': 9.0,
+        'livreur': 8.5, 'delivery': 8.5, 'coursier': 8.5,
+        'caissier': 8.0, 'cashier': 8.0,
+        'téléopérateur': 7.5, 'call center': 7.5, 'téléconseiller': 7.5,
+        'secrétaire': 7.0, 'secretary': 7.0, 'assistant': 6.5,
+        'opérateur': 7.0, 'operator': 7.0,
+        'mécanicien': 6.0, 'mechanic': 6.0,
+        'comptable': 5.0, 'accountant': 5.0,
+        'enseignant': 2.0, 'teacher': 2.0, 'professeur': 2.0,
+        'médecin': 1.5, 'doctor': 1.5,
+        'infirmier': 2.0, 'nurse': 2.0,
+        'développeur': 3.0, 'developer': 3.0,
+        'manager': 2.5, 'directeur': 2.0, 'chef': 2.5,
+        'coordinateur': 2.0, 'coordinator': 2.0,
+        'conseiller': 3.0, 'consultant': 3.0,
+    },
+    sector_adjustments=[
+        (['transport', 'logistique', 'delivery'], 1.0),
+        (['industrie', 'production', 'manufacturing'], 1.5),
+        (['commerce', 'retail', 'supermarket'], 0.5),
+        (['technologie', 'tech', 'it', 'informatique'], -1.0),
+        (['santé', 'health', 'medical'], -1.5),
+        (['éducation', 'education', 'formation'], -1.0),
+    ],
+    keyword_adjustments=[
+        (['répétitif', 'routine', 'standard', 'process', 'assembly'], 0.5),
+        (['créatif', 'creative', 'design', 'gestion', 'management', 'relation client'], -0.5),
+    ],
+    suggestions={
+        'Élevé': [
+            "Formation en compétences numériques (Excel, outils de gestion)",
+            "Reconversion vers la logistique ou la coordination",
+            "Développement de compétences en gestion de projet",
+            "Apprentissage des outils de relation client (CRM)"
+        ],
+        'Moyen': [
+            "Renforcement des compétences relationnelles",
+            "Apprentissage des outils digitaux de votre secteur",
+            "Spécialisation dans un créneau à forte valeur ajoutée"
+        ],
+        'Faible': [
+            "Continuer à se former dans votre domaine",
+            "Développer une expertise complémentaire",
+            "Renforcer vos compétences en leadership"
+        ]
+    }
+)
+
+# Tables de test3_ultime.py (PortalJob)
+PORTALJOB_SCORER = IARiskScorer(
+    name='portaljob',
+    metier_risks={
+        'chauffeur': 9.0, 'conducteur': 9.0, 'driver': 9.0,
+        'livreur': 8.5, 'delivery': 8.5, 'coursier': 8.5,
+        'caissier': 8.0, 'cashier': 8.0,
+        'téléopérateur': 7.5, 'call center': 7.5, 'téléconseiller': 7.5,
+        'secrétaire': 7.0, 'secretary': 7.0, 'assistant': 6.5,
+        'opérateur': 7.0, 'operator': 7.0, 'annotateur': 8.0,
+        'mécanicien': 6.0, 'mechanic': 6.0,
+        'comptable': 5.0, 'accountant': 5.0, 'analyste': 4.0,
+        'enseignant': 2.0, 'teacher': 2.0, 'professeur': 2.0,
+        'médecin': 1.5, 'doctor': 1.5,
+        'infirmier': 2.0, 'nurse': 2.0,
+        'développeur': 3.0, 'developer': 3.0, 'programmeur': 3.0,
+        'manager': 2.5, 'directeur': 2.0, 'chef': 2.5,
+        'coordinateur': 2.0, 'coordinator': 2.0,
+        'conseiller': 3.0, 'consultant': 3.0, 'responsable': 2.5,
+        'ingénieur': 3.5, 'engineer': 3.5,
+        'technico-commercial': 4.0, 'commercial': 4.0,
+        'chargé': 3.0, 'chargee': 3.0,
+        'stagiaire': 6.0, 'stage': 6.0,
+        'freelance': 3.5, 'free-lance': 3.5,
+    },
+    sector_adjustments=[
+        (['transport', 'logistique', 'delivery'], 1.0),
+        (['industrie', 'production', 'manufacturing', 'usine'], 1.5),
+        (['commerce', 'retail', 'supermarket', 'vente'], 0.5),
+        (['technologie', 'tech', 'it', 'informatique', 'symfony', 'web'], -1.0),
+        (['santé', 'health', 'medical', 'médical'], -1.5),
+        (['éducation', 'education', 'formation', 'enseignement'], -1.0),
+        (['finance', 'banque', 'comptabilité', 'financier'], 0.5),
+        (['marketing', 'communication', 'publicité'], 0.5),
+    ],
+    keyword_adjustments=[
+        (['répétitif', 'routine', 'standard', 'process', 'assembly', 'saisie', 'data entry'], 0.5),
+        (['créatif', 'creative', 'design', 'gestion', 'management', 'relation client', 'leadership', 'stratégie'], -0.5),
+    ],
+    suggestions={
+        'Élevé': [
+            "Formation en compétences numériques avancées",
+            "Reconversion vers la supervision ou coordination d'équipe",
+            "Développement de compétences en gestion de projet agile",
+            "Apprentissage des outils d'automatisation et d'IA"
+        ],
+        'Moyen': [
+            "Renforcement des compétences en analyse de données",
+            "Apprentissage des outils digitaux spécifiques au secteur",
+            "Spécialisation dans un créneau à forte valeur ajoutée",
+            "Développement de compétences interpersonnelles avancées"
+        ],
+        'Faible': [
+            "Continuer à se former dans son domaine d'expertise",
+            "Développer une spécialisation complémentaire",
+            "Renforcer les compétences en leadership et innovation",
+            "Apprentissage des dernières technologies du secteur"
+        ]
+    }
+)
+
+# Scorer à utiliser selon la source de l'offre
+SCORERS_BY_SOURCE = {
+    'asako': ASAKO_SCORER,
+    'portaljob': PORTALJOB_SCORER,
+}
+
+def scorer_for_source(source):
+    """Scorer de la source (Asako par défaut, comme la colonne source)"""
+    return SCORERS_BY_SOURCE.get(source or 'asako', ASAKO_SCORER)
+
+
+def load_score_caches(path):
+    """Charger les scores sauvegardés (seulement ceux de la version courante des tables)"""
+    content = read_cache_file(path)
+    loaded = 0
+    for scorer in SCORERS_BY_SOURCE.values():
+        section = content.get(scorer.name) or {}
+        if section.get('version') != scorer.version:
+            continue
+        scores = section.get('scores') or {}
+        scorer.cache.update(scores)
+        loaded += len(scores)
+    return loaded
+
+def track_score_cache_updates():
+    """Suivre les scores calculés par ce processus (processus d'analyse)"""
+    for scorer in SCORERS_BY_SOURCE.values():
+        scorer.cache.track_new_entries()
+
+def take_score_cache_updates():
+    """Scores calculés depuis le dernier appel, par scorer"""
+    updates = {}
+    for scorer in SCORERS_BY_SOURCE.values():
+        entries = scorer.cache.take_new_entries()
+        if entries:
+            updates[scorer.name] = entries
+    return updates
+
+def merge_score_cache_updates(updates):
+    """Ajouter aux caches les scores calculés par un processus d'analyse"""
+    for name, entries in updates.items():
+        scorer = SCORERS_BY_SOURCE.get(name)
+        if scorer is not None:
+            scorer.cache.update(entries)
+
+def save_score_caches(path):
+    """Sauvegarder les caches de scores pour les prochains scrapings"""
+    content = {
+        scorer.name: {'version': scorer.version, 'scores': scorer.cache.snapshot()}
+        for scorer in SCORERS_BY_SOURCE.values()
+    }
+    try:
+        write_cache_file(path, content)
+        return True
+    except OSError as e:
+        print(f"⚠️  Impossible de sauvegarder le cache de scores ({path}): {e}")
+        return False
@@ -0,0 +1,93 @@
+"""
+Recherche simultanée de mots-clés (automate d'Aho-Corasick)
+
+Remplace les boucles `for word in keywords: if word in text` des scorers :
+le texte est parcouru une seule fois, quel que soit le nombre de mots-clés.
+La sémantique est celle de `keyword in text` (sous-chaîne, chevauchements
+compris) ; le résultat est un masque de bits, un bit par mot-clé.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+class KeywordMatcher:
+    """Automate déterministe compilé à partir d'une liste de mots-clés"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(keywords))
+        self.bits: Dict[str, int] = {keyword: 1 << i for i, keyword in enumerate(self.keywords)}
+        self._transitions, self._outputs = self._compile()
+
+    def _compile(self):
+        """Trie + liens d'échec, puis transitions complètes (plus de remontée à l'analyse)"""
+        goto = [{}]
+        outputs = [0]
+
+        for keyword, bit in self.bits.items():
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append(0)
+                state = next_state
+            outputs[state] |= bit
+
+        alphabet = {char for keyword in self.keywords for char in keyword}
+        fail = [0] * len(goto)
+        transitions = [None] * len(goto)
+        transitions[0] = dict(goto[0])
+
+        # Parcours en largeur : l'état d'échec est toujours traité avant
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = transitions[fail[state]]
+
+            for char, next_state in goto[state].items():
+                fail[next_state] = fallback.get(char, 0) if state else 0
+                outputs[next_state] |= outputs[fail[next_state]]
+                queue.append(next_state)
+
+            row = {}
+            for char in alphabet:
+                next_state = goto[state].get(char) or fallback.get(char, 0)
+                if next_state:
+                    row[char] = next_state
+            transitions[state] = row
+
+        return transitions, outputs
+
+    def mask(self, keywords: Iterable[str]) -> int:
+        """Masque des mots-clés donnés (ils doivent faire partie de l'automate)"""
+        result = 0
+        for keyword in keywords:
+            result |= self.bits[keyword]
+        return result
+
+    def scan(self, text: str) -> int:
+        """Masque de tous les mots-clés présents dans `text` (un seul passage)"""
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        found = 0
+        for char in text:
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+    def find_all(self, text: str) -> Set[str]:
+        """Ensemble des mots-clés présents dans `text`"""
+        found = self.scan(text)
+        return {keyword for keyword, bit in self.bits.items() if found & bit}
+
+def count_bits(value: int) -> int:
+    """Nombre de mots-clés trouvés dans un masque"""
+    return bin(value).count('1')
+
+def lowest_keyword_bit(value: int) -> int:
+    """Bit du mot-clé de plus haute priorité (le premier déclaré) présent dans le masque"""
+    return value & -value
@@ -4,6 +4,10 @@ Algorithme d'analyse de risque IA
 
 import re
 from typing import List, Dict
+from models.keyword_matcher import KeywordMatcher, lowest_keyword_bit
+
+# Combinaisons de mots-clés dont le score est mémorisé
+MAX_CACHED_MASKS = 4096
 
 class RiskAnalyzer:
     """Analyse le risque d'automatisation par l'IA"""
@@ -35,20 +39,53 @@ class RiskAnalyzer:
                 ("développeur", -1), ("ingénieur", -1),
             ]
         }
+        
+        # Tous les mots-clés dans un seul automate : un passage par texte
+        keyword_points = [
+            (keyword, points)
+            for keywords in self.risk_keywords.values()
+            for keyword, points in keywords
+        ]
+        self.matcher = KeywordMatcher(
+            [keyword for keyword, _ in keyword_points] + ['mécanicien', 'conducteur']
+        )
+        self._double_skill_mask = self.matcher.mask(['mécanicien', 'conducteur'])
+        
+        # Points par bit (un mot-clé répété dans les listes compte plusieurs fois)
+        self._points_by_bit = {}
+        for keyword, points in keyword_points:
+            bit = self.matcher.bits[keyword]
+            self._points_by_bit[bit] = self._points_by_bit.get(bit, 0) + points
+        self._scored_mask = self.matcher.mask(keyword for keyword, _ in keyword_points)
+        self._score_by_mask = {}
     
     def calculate_risk_score(self, title: str, metier: str, secteur: str) -> int:
         """Calculer un score de risque (1-10)"""
-        score = 5  # Neutre
         text = f"{title} {metier} {secteur}".lower()
+        found = self.matcher.scan(text)
+        
+        # Le score ne dépend que des mots-clés trouvés
+        score = self._score_by_mask.get(found)
+        if score is None:
+            score = self._score_from_keywords(found)
+            if len(self._score_by_mask) >= MAX_CACHED_MASKS:
+                self._score_by_mask.clear()
+            self._score_by_mask[found] = score
+        return score
+    
+    def _score_from_keywords(self, found: int) -> int:
+        """Score (1-10) à partir du masque des mots-clés trouvés"""
+        score = 5  # Neutre
         
-        # Appliquer les points de risque
-        for category, keywords in self.risk_keywords.items():
-            for keyword, points in keywords:
-                if keyword in text:
-                    score += points
+        # Appliquer les points de risque (seulement les mots-clés trouvés)
+        hits = found & self._scored_mask
+        while hits:
+            bit = lowest_keyword_bit(hits)
+            score += self._points_by_bit[bit]
+            hits ^= bit
         
         # Cas spéciaux
-        if 'mécanicien' in text and 'conducteur' in text:
+        if found & self._double_skill_mask == self._double_skill_mask:
             score += 2  # Double compétence
         
         # Normaliser entre 1 et 10
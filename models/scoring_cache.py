@@ -0,0 +1,116 @@
+"""
+Cache des scores de risque IA
+
+Les mêmes titres reviennent des milliers de fois d'une page, d'une
+source et d'un scraping à l'autre. Le score est mémorisé par empreinte
+du texte analysé ; le cache est borné (LRU) et peut être sauvegardé
+dans un fichier JSON pour les scrapings suivants.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+class ScoringCache:
+    """Cache LRU empreinte du texte -> score"""
+
+    def __init__(self, max_entries=50000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Entrées ajoutées depuis le dernier take_new_entries (None = pas de suivi)
+        self._new_entries = None
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(text):
+        """Empreinte compacte du texte normalisé"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=12).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            score = self._entries.get(key)
+            if score is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def set(self, key, score):
+        with self._lock:
+            self._entries[key] = score
+            if self._new_entries is not None:
+                self._new_entries[key] = score
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def snapshot(self):
+        """Copie des entrées (des moins aux plus récemment utilisées)"""
+        with self._lock:
+            return dict(self._entries)
+
+    def update(self, entries):
+        """Ajouter des entrées chargées depuis le disque"""
+        for key, score in entries.items():
+            self.set(key, score)
+
+    def track_new_entries(self):
+        """Suivre les entrées ajoutées (processus d'analyse : elles sont renvoyées au parent)"""
+        with self._lock:
+            self._new_entries = {}
+
+    def take_new_entries(self):
+        """Entrées ajoutées depuis le dernier appel ({} sans suivi)"""
+        with self._lock:
+            if self._new_entries is None:
+                return {}
+            new_entries, self._new_entries = self._new_entries, {}
+            return new_entries
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+def read_cache_file(path):
+    """Contenu du fichier de cache ({} s'il est absent ou illisible)"""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Cache de scores illisible ({path}): {e}")
+        return {}
+
+def write_cache_file(path, content):
+    """Écriture atomique (fichier temporaire puis remplacement)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Un fichier temporaire par écrivain : deux scrapers en parallèle ne
+    # mélangent pas leurs écritures, le dernier os.replace gagne
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(content, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
@@ -0,0 +1,170 @@
+"""
+Index inversé en mémoire pour la recherche d'offres
+
+Tokenisation française sans accents ("Secrétaire" -> "secretaire"),
+classement BM25 pondéré par champ et recherche par préfixe, pour que
+la latence ne dépende que du nombre de résultats et plus de la taille
+de la table.
+"""
+
+import math
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+# Poids de chaque champ dans le score (le titre compte plus que la description)
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'job_title': 2.5,
+    'sector': 1.5,
+    'company': 1.5,
+    'location': 1.0,
+    'description': 1.0,
+}
+
+# Préfixes plus courts : correspondance exacte uniquement (évite d'étendre "a" à tout le vocabulaire)
+MIN_PREFIX_LENGTH = 3
+
+# Paramètres BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def fold_accents(text: str) -> str:
+    """Minuscules sans accents : 'Élevé' -> 'eleve'"""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+def tokenize(text: str) -> List[str]:
+    """Découper un texte en tokens normalisés"""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(fold_accents(text))
+
+class OfferSearchIndex:
+    """Index inversé : token -> (documents, fréquences pondérées)"""
+
+    def __init__(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._offer_ids = array('l')
+        self._doc_lengths = array('f')
+        self._length_norms = array('f')  # k1 * (1 - b + b * longueur / longueur moyenne)
+        self._vocabulary: List[str] = []
+        self._avg_length = 0.0
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple]) -> 'OfferSearchIndex':
+        """Construire l'index depuis des tuples (id, title, job_title, sector, company, location, description)"""
+        index = cls()
+        fields = list(FIELD_WEIGHTS.items())
+
+        for row in rows:
+            offer_id, values = row[0], row[1:]
+            doc = len(index._offer_ids)
+            index._offer_ids.append(offer_id)
+
+            term_weights = {}
+            length = 0.0
+            for (_, weight), value in zip(fields, values):
+                for token in tokenize(value):
+                    term_weights[token] = term_weights.get(token, 0.0) + weight
+                    length += weight
+
+            index._doc_lengths.append(length)
+            for token, tf in term_weights.items():
+                posting = index._postings.get(token)
+                if posting is None:
+                    posting = index._postings[token] = (array('l'), array('f'))
+                posting[0].append(doc)
+                posting[1].append(tf)
+
+        index._vocabulary = sorted(index._postings)
+        if index._offer_ids:
+            index._avg_length = sum(index._doc_lengths) / len(index._offer_ids) or 1.0
+            index._length_norms = array('f', (
+                BM25_K1 * (1 - BM25_B + BM25_B * length / index._avg_length)
+                for length in index._doc_lengths
+            ))
+        return index
+
+    def __len__(self):
+        return len(self._offer_ids)
+
+    def _expand(self, term: str, prefix: bool) -> List[str]:
+        """Tokens du vocabulaire correspondant à un terme (exact ou préfixe)"""
+        if not prefix or len(term) < MIN_PREFIX_LENGTH:
+            return [term] if term in self._postings else []
+
+        matches = []
+        position = bisect_left(self._vocabulary, term)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(term):
+            matches.append(self._vocabulary[position])
+            position += 1
+        return matches
+
+    def _term_scores(self, tokens: List[str], candidates: Dict[int, float] = None) -> Dict[int, float]:
+        """Score BM25 de chaque document pour un terme (meilleure expansion)
+
+        Avec `candidates`, seuls ces documents sont gardés et leur score cumulé.
+        """
+        total_docs = len(self._offer_ids)
+        norms = self._length_norms
+        scores = {}
+
+        for token in tokens:
+            docs, tfs = self._postings[token]
+            df = len(docs)
+            idf_k1 = math.log(1 + (total_docs - df + 0.5) / (df + 0.5)) * (BM25_K1 + 1)
+
+            for doc, tf in zip(docs, tfs):
+                if candidates is not None and doc not in candidates:
+                    continue
+                score = idf_k1 * tf / (tf + norms[doc])
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+
+        if candidates is not None:
+            return {doc: candidates[doc] + score for doc, score in scores.items()}
+        return scores
+
+    def search(self, query: str, prefix: bool = True, limit: int = None) -> List[Tuple[int, float]]:
+        """Offres contenant tous les termes de la requête, triées par pertinence
+
+        Retourne une liste de (offer_id, score).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._offer_ids:
+            return []
+
+        expansions = [self._expand(term, prefix) for term in terms]
+        if not all(expansions):
+            return []
+
+        # Commencer par le terme le plus sélectif pour réduire les intersections
+        expansions.sort(key=lambda tokens: sum(len(self._postings[token][0]) for token in tokens))
+        combined = None
+        for tokens in expansions:
+            combined = self._term_scores(tokens, combined)
+            if not combined:
+                return []
+
+        ranked = sorted(combined.items(), key=lambda item: item[1], reverse=True)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self._offer_ids[doc], score) for doc, score in ranked]
+
+    def search_any(self, queries: Iterable[str], prefix: bool = True, limit: int = None) -> List[Tuple[int, float]]:
+        """Union de plusieurs requêtes (synonymes) : meilleur score par offre"""
+        best = {}
+        for query in queries:
+            for offer_id, score in self.search(query, prefix=prefix):
+                if score > best.get(offer_id, 0.0):
+                    best[offer_id] = score
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit is not None else ranked
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Recalculer le score de risque IA de toutes les offres en base
+
+À lancer après avoir modifié les tables de mots-clés de models/ia_risk.py :
+les offres sont lues par lots, scorées lot par lot et seules celles dont
+le score ou le niveau change sont réécrites, avec un UPDATE groupé par
+(score, niveau, suggestions) au lieu d'un UPDATE par ligne.
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select, update
+from database.models import SessionLocal, JobOffer
+from database.rollups import refresh_rollups_safely
+from database.generation import bump_data_generation_safely
+from models.ia_risk import scorer_for_source, risk_level
+
+DEFAULT_CHUNK_SIZE = 5000
+
+def score_batch(rows):
+    """Scorer un lot : une analyse par combinaison (source, titre, métier, secteur, contrat) distincte
+
+    Retourne {(score, niveau, suggestions): [ids des offres à mettre à jour]}.
+    """
+    scores = {}
+    changes = {}
+
+    for offer_id, source, title, job_title, sector, contract_type, old_score, old_level in rows:
+        key = (source, title, job_title, sector, contract_type)
+        result = scores.get(key)
+        if result is None:
+            scorer = scorer_for_source(source)
+            score = scorer.score(title, job_title, sector, contract_type)
+            result = (score, risk_level(score), ', '.join(scorer.suggestions_for(score)))
+            scores[key] = result
+
+        score, level, _ = result
+        unchanged_score = old_score is not None and abs(old_score - score) < 0.05
+        if unchanged_score and old_level == level:
+            continue
+        changes.setdefault(result, []).append(offer_id)
+
+    return changes
+
+def write_changes(db, changes):
+    """Un UPDATE ... WHERE id IN (...) par résultat distinct"""
+    updated = 0
+    for (score, level, suggestions), ids in changes.items():
+        db.execute(
+            update(JobOffer).where(JobOffer.id.in_(ids)).values(
+                ia_risk_score=score,
+                ia_risk_level=level,
+                suggestions=suggestions
+            ).execution_options(synchronize_session=False)
+        )
+        updated += len(ids)
+    return updated
+
+def rescore_database(chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+    """Parcourir job_offers par id croissant et réécrire les scores modifiés"""
+    print("🔄 RECALCUL DES SCORES DE RISQUE IA")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    db = SessionLocal()
+    scanned = 0
+    updated = 0
+    last_id = 0
+
+    try:
+        while True:
+            # Lecture par clé (id > dernier id) : pas d'OFFSET, coût constant par lot
+            rows = db.execute(
+                select(
+                    JobOffer.id,
+                    JobOffer.source,
+                    JobOffer.title,
+                    JobOffer.job_title,
+                    JobOffer.sector,
+                    JobOffer.contract_type,
+                    JobOffer.ia_risk_score,
+                    JobOffer.ia_risk_level
+                ).where(JobOffer.id > last_id).order_by(JobOffer.id).limit(chunk_size)
+            ).all()
+
+            if not rows:
+                break
+
+            last_id = rows[-1][0]
+            scanned += len(rows)
+
+            changes = score_batch(rows)
+            if changes and not dry_run:
+                updated += write_changes(db, changes)
+                db.commit()
+            else:
+                updated += sum(len(ids) for ids in changes.values())
+                db.rollback()
+
+            print(f"   → {scanned} offres analysées, {updated} scores modifiés")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Erreur pendant le recalcul: {e}")
+        raise
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - start
+    rate = scanned / elapsed if elapsed > 0 else 0
+    print(f"\n📊 {scanned} offres en {elapsed:.1f}s ({rate:.0f} offres/s)")
+
+    if dry_run:
+        print(f"🧪 Simulation: {updated} offres seraient mises à jour")
+    elif updated:
+        print(f"✅ {updated} offres mises à jour")
+        # Statistiques et cache de l'API basés sur les anciens scores
+        # (la reconstruction des rollups incrémente aussi la génération)
+        if not refresh_rollups_safely():
+            bump_data_generation_safely()
+    else:
+        print("✅ Aucun score modifié")
+
+    return {'scanned': scanned, 'updated': updated}
+
+def main():
+    parser = argparse.ArgumentParser(description="Recalculer les scores de risque IA des offres")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"offres lues par lot (défaut: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="compter les changements sans rien écrire")
+    args = parser.parse_args()
+
+    rescore_database(chunk_size=args.chunk_size, dry_run=args.dry_run)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Orchestrateur de crawl multi-sources
+
+Chaque site est une source enregistrée avec @register_source : une classe
+CrawlSource qui sait lancer son scraper. Toutes les sources d'un crawl
+tournent en parallèle, chacune avec son propre client HTTP (donc son
+propre débit par site) : un crawl dure le temps de la source la plus
+lente, pas la somme des durées de toutes les sources.
+
+Les offres de toutes les sources passent par un même SharedOfferWriter
+(un lot écrit à la fois) et un même cache de pages, puis les rollups sont
+reconstruits une seule fois à la fin par l'appelant (update_job_data).
+
+Usage: python scheduler/crawl_orchestrator.py [--sources asako,portaljob] [--full]
+"""
+
+import argparse
+import logging
+import sys
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Sources connues : nom -> classe CrawlSource
+SOURCES = {}
+
+def register_source(source_class):
+    """Décorateur : rendre une source disponible pour les crawls"""
+    SOURCES[source_class.name] = source_class
+    return source_class
+
+class CrawlSource(ABC):
+    """Une source de crawl : lance son scraper, retourne le nombre d'offres analysées
+
+    `shared_writer` et `page_cache` sont communs à toutes les sources du
+    crawl ; `incremental` arrête la pagination aux offres déjà en base.
+    Après run(), `runs` contient les mesures des scrapings (RunMetrics).
+    """
+
+    name = None
+
+    def __init__(self, shared_writer, page_cache=None, incremental=True):
+        self.shared_writer = shared_writer
+        self.page_cache = page_cache
+        self.incremental = incremental
+        self.runs = []
+
+    @abstractmethod
+    def run(self):
+        """Scraper la source, retourne le nombre d'offres analysées"""
+
+@register_source
+class AsakoSource(CrawlSource):
+    name = 'asako'
+
+    # Catégories à scraper, avec un maximum de pages : en mode incrémental
+    # la pagination s'arrête dès qu'une page ne contient que des offres connues
+    categories = {
+        "cdd": 3,
+        "emploi": 5,
+    }
+
+    def run(self):
+        # Importer dynamiquement (éviter les problèmes de circular import)
+        from scrapers.asako_scraper import AsakoScraper
+
+        scraper = AsakoScraper(use_database=True, page_cache=self.page_cache, shared_writer=self.shared_writer)
+        analyzed = 0
+        try:
+            for category, pages in self.categories.items():
+                try:
+                    logger.info(f"📥 Scraping: {category} ({pages} pages max)")
+                    analyzed += len(scraper.scrape_category(category, pages=pages, incremental=self.incremental))
+                except Exception as e:
+                    logger.error(f"❌ Erreur avec {category}: {e}")
+        finally:
+            self.runs.extend(scraper.runs)
+            scraper.close()
+        return analyzed
+
+@register_source
+class PortalJobSource(CrawlSource):
+    name = 'portaljob'
+
+    # Maximum de pages de la liste (en mode incrémental, arrêt aux offres connues)
+    max_pages = 10
+
+    def run(self):
+        from scrapers.test3_ultime import PortalJobScraper
+
+        scraper = PortalJobScraper(use_database=True, page_cache=self.page_cache, shared_writer=self.shared_writer)
+        try:
+            result = scraper.scrape_multiple_pages(self.max_pages, incremental=self.incremental)
+        finally:
+            self.runs.extend(scraper.runs)
+            scraper.close()
+        return result['total_offers']
+
+class CrawlOrchestrator:
+    """Lancer plusieurs sources en parallèle vers un même writer"""
+
+    def __init__(self, sources=None, incremental=True):
+        names = sources or Config.CRAWL_SOURCES
+        unknown = [name for name in names if name not in SOURCES]
+        if unknown:
+            raise ValueError(f"Sources inconnues: {', '.join(unknown)} (disponibles: {', '.join(SOURCES)})")
+        self.sources = names
+        self.incremental = incremental
+
+    def _run_source(self, source):
+        started = time.perf_counter()
+        logger.info(f"▶  Source {source.name}: début")
+        try:
+            analyzed = source.run()
+            error = None
+        except Exception as e:
+            analyzed = 0
+            error = str(e)
+            logger.error(f"❌ Source {source.name} en échec: {e}")
+        seconds = time.perf_counter() - started
+        logger.info(f"⏹  Source {source.name}: {analyzed} offres analysées en {seconds:.1f}s")
+        return {'analyzed': analyzed, 'seconds': round(seconds, 2), 'error': error, 'runs': source.runs}
+
+    def run(self):
+        """Crawler toutes les sources, retourne le résumé par source et les compteurs d'écriture"""
+        from database.bulk_writer import SharedOfferWriter
+        from scrapers.page_cache import PageCache
+
+        shared_writer = SharedOfferWriter()
+        # Un seul cache de pages : chaque source l'enrichit, une seule sauvegarde cohérente
+        page_cache = None
+        if Config.PAGE_CACHE_PATH:
+            page_cache = PageCache(Config.PAGE_CACHE_PATH, Config.PAGE_CACHE_MAX_AGE_HOURS)
+        sources = [
+            SOURCES[name](shared_writer, page_cache=page_cache, incremental=self.incremental)
+            for name in self.sources
+        ]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='crawl') as executor:
+            futures = {source.name: executor.submit(self._run_source, source) for source in sources}
+            results = {name: future.result() for name, future in futures.items()}
+
+        if page_cache:
+            page_cache.save()
+
+        summary = {
+            'sources': results,
+            'analyzed': sum(result['analyzed'] for result in results.values()),
+            'seconds': round(time.perf_counter() - started, 2),
+            'writes': shared_writer.stats()
+        }
+        slowest = max((result['seconds'] for result in results.values()), default=0)
+        logger.info(f"🏁 Crawl terminé en {summary['seconds']:.1f}s (source la plus lente: {slowest:.1f}s), "
+                    f"{summary['writes']['inserted']} nouvelles offres, {summary['writes']['updated']} mises à jour")
+        return summary
+
+def run_crawl(sources=None, incremental=True):
+    """Un crawl de toutes les sources configurées (CRAWL_SOURCES par défaut)"""
+    return CrawlOrchestrator(sources, incremental).run()
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawler les sources d'offres en parallèle")
+    parser.add_argument('--sources', default=None,
+                        help=f"Sources séparées par des virgules (défaut: {','.join(Config.CRAWL_SOURCES)})")
+    parser.add_argument('--full', action='store_true',
+                        help="Scraping complet, sans arrêt aux offres déjà en base")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    sources = [name.strip() for name in args.sources.split(',') if name.strip()] if args.sources else None
+    
+    # Pas de crawl manuel pendant un crawl planifié (ou l'inverse)
+    from scheduler.run_lock import run_lock, CRAWL_LOCK
+    with run_lock(CRAWL_LOCK) as acquired:
+        if not acquired:
+            print("⏭️  Un crawl tourne déjà dans un autre processus, abandon")
+            sys.exit(1)
+        summary = run_crawl(sources, incremental=not args.full)
+
+        from database.rollups import refresh_rollups_safely
+        refresh_rollups_safely(logger)
+
+    for name, result in summary['sources'].items():
+        status = f"❌ {result['error']}" if result['error'] else "✅"
+        print(f"   • {name}: {result['analyzed']} offres en {result['seconds']}s {status}")
+
+if __name__ == "__main__":
+    main()
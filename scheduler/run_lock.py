@@ -0,0 +1,106 @@
+"""
+Verrou de crawl entre processus
+
+max_instances=1 n'empêche les chevauchements que dans un même scheduler.
+Ce verrou couvre aussi deux schedulers lancés en parallèle, ou un crawl
+manuel pendant un crawl planifié :
+
+- avec MySQL, un verrou nommé GET_LOCK, valable pour tous les processus
+  qui partagent la base (même sur plusieurs machines) ;
+- sinon, un verrou fcntl sur un fichier de RUN_LOCK_DIR.
+
+Dans les deux cas le verrou disparaît avec le processus qui le tient
+(connexion fermée, fichier fermé) : pas de verrou orphelin après un crash.
+"""
+
+import os
+from contextlib import contextmanager
+from sqlalchemy import text
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou de fichier
+    fcntl = None
+
+# Noms des verrous : un crawl et un enrichissement à la fois au plus
+CRAWL_LOCK = 'safe_ai_crawl'
+ENRICHMENT_LOCK = 'safe_ai_enrichment'
+
+class RunLockError(Exception):
+    """Le verrou n'a pas pu être demandé (base ou dossier des verrous inaccessible)"""
+
+def _mysql_lock(engine, name):
+    """Connexion qui tient le verrou nommé, None s'il est déjà pris"""
+    connection = engine.connect()
+    try:
+        acquired = connection.execute(text("SELECT GET_LOCK(:name, 0)"), {'name': name}).scalar()
+    except Exception:
+        connection.close()
+        raise
+    if acquired != 1:
+        connection.close()
+        return None
+    return connection
+
+def _file_lock(name):
+    """Fichier verrouillé (exclusif, non bloquant), None s'il est déjà pris"""
+    os.makedirs(Config.RUN_LOCK_DIR, exist_ok=True)
+    handle = open(os.path.join(Config.RUN_LOCK_DIR, f"{name}.lock"), 'a+')
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    # Pour le diagnostic : PID du processus qui tient le verrou
+    handle.seek(0)
+    handle.truncate()
+    handle.write(str(os.getpid()))
+    handle.flush()
+    return handle
+
+@contextmanager
+def run_lock(name):
+    """Contexte : True si ce processus tient le verrou `name`, False s'il est pris ailleurs
+
+    Lève RunLockError si le verrou ne peut pas être demandé ; les exceptions
+    levées dans le bloc ne sont pas transformées.
+    """
+    from database.models import get_engine
+
+    try:
+        engine = get_engine()
+        use_mysql = engine.dialect.name == 'mysql'
+        if use_mysql:
+            connection = _mysql_lock(engine, name)
+        elif fcntl is not None:
+            handle = _file_lock(name)
+    except Exception as e:
+        raise RunLockError(f"Verrou {name} indisponible: {e}") from e
+
+    if use_mysql:
+        if connection is None:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            try:
+                connection.execute(text("SELECT RELEASE_LOCK(:name)"), {'name': name})
+            finally:
+                connection.close()
+        return
+
+    if fcntl is None:
+        # Aucun verrou disponible : seul max_instances protège des chevauchements
+        yield True
+        return
+
+    if handle is None:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
@@ -5,16 +5,25 @@ VERSION CORRIGÉE
 """
 
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.combining import OrTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 import time
 import logging
 import sys
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy import func  # ← IMPORT AJOUTÉ
 
 # Ajouter le chemin parent pour les imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config import Config
+from scheduler.run_lock import run_lock, RunLockError, CRAWL_LOCK, ENRICHMENT_LOCK
+from scrapers.run_metrics import RunMetrics
+from database.scheduler_events import ensure_scheduler_events_table, record_scheduler_event_safely
+
 # Configurer le logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,48 +31,79 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def update_job_data():
-    """Tâche planifiée pour mettre à jour les données"""
+# Fin du dernier crawl de ce processus (fusion des déclenchements rapprochés)
+_last_crawl_finished_at = None
+
+def update_job_data(job_id='manual'):
+    """Tâche planifiée pour mettre à jour les données
+    
+    Ne crawle pas si un autre crawl tient le verrou, ni (pour les tâches
+    planifiées) si le précédent s'est terminé il y a moins de
+    CRAWL_MIN_GAP_MINUTES : ces exécutions sont enregistrées dans
+    scheduler_events.
+    """
+    global _last_crawl_finished_at
+    
+    if job_id != 'manual' and _last_crawl_finished_at is not None:
+        elapsed = datetime.now() - _last_crawl_finished_at
+        if elapsed < timedelta(minutes=Config.CRAWL_MIN_GAP_MINUTES):
+            record_scheduler_event_safely(
+                job_id, 'merged', datetime.now(),
+                f"crawl précédent terminé il y a {int(elapsed.total_seconds() // 60)} min", logger
+            )
+            return
+    
+    try:
+        with run_lock(CRAWL_LOCK) as acquired:
+            if not acquired:
+                record_scheduler_event_safely(
+                    job_id, 'skipped_locked', datetime.now(), "un crawl tourne déjà dans un autre processus", logger
+                )
+                return
+            # Un crawl en échec n'ouvre pas la fenêtre de fusion : le déclenchement suivant réessaie
+            if crawl_and_refresh():
+                _last_crawl_finished_at = datetime.now()
+    except RunLockError as e:
+        logger.error(f"❌ {e}, crawl annulé")
+    except Exception as e:
+        logger.error(f"❌ Erreur pendant le crawl: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+
+def crawl_and_refresh():
+    """Crawler toutes les sources puis reconstruire les rollups
+
+    Retourne False si le crawl a échoué (exception, ou aucune source n'a
+    abouti), True sinon.
+    """
     logger.info("="*60)
     logger.info(f"🔄 DÉBUT MISE À JOUR - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info("="*60)
     
+    # Mesures du crawl (scrape_runs) : durées cumulées des scrapings des sources,
+    # plus le crawl lui-même et la reconstruction des rollups
+    metrics = RunMetrics('crawl', label=','.join(Config.CRAWL_SOURCES))
     try:
-        # Importer dynamiquement (éviter les problèmes de circular import)
-        from scrapers.asako_scraper import AsakoScraper
-        
-        scraper = AsakoScraper(use_database=True)
+        # Toutes les sources en parallèle, vers un même writer (chacune à son propre débit)
+        from scheduler.crawl_orchestrator import run_crawl
         
-        # Catégories à scraper (avec moins de pages pour une mise à jour rapide)
-        categories_config = {
-            "cdd": 1,      # 1 page seulement pour CDD
-            "emploi": 2,   # 2 pages pour emploi général
-        }
-        
-        total_analyzed = 0
-        
-        for category, pages in categories_config.items():
-            try:
-                logger.info(f"📥 Scraping: {category} ({pages} pages)")
-                
-                # Essayer différentes méthodes selon ce qui existe
-                if hasattr(scraper, 'scrape_category'):
-                    offers = scraper.scrape_category(category, pages=pages)
-                elif hasattr(scraper, 'scrape_all_for_hackathon'):
-                    # Si seule la méthode complète existe, on l'utilise pour toutes les catégories
-                    offers = scraper.scrape_all_for_hackathon()
-                    break  # Sortir après une exécution complète
-                else:
-                    logger.error(f"❌ Aucune méthode de scraping trouvée")
-                    continue
-                        
-            except Exception as e:
-                logger.error(f"❌ Erreur avec {category}: {e}")
-                continue
-            
-            # Pause entre les catégories
-            if category != list(categories_config.keys())[-1]:
-                time.sleep(3)  # 3 secondes de pause
+        with metrics.stage('crawl'):
+            summary = run_crawl(incremental=True)
+        total_analyzed = summary['analyzed']
+        sources = {}
+        for name, result in summary['sources'].items():
+            if result['error']:
+                logger.error(f"❌ Source {name}: {result['error']}")
+                metrics.error(f"{name}: {result['error']}")
+            for run in result['runs']:
+                metrics.merge(run)
+            sources[name] = {
+                'analyzed': result['analyzed'],
+                'seconds': result['seconds'],
+                'error': result['error'],
+                'run_ids': [run['id'] for run in result['runs']]
+            }
+        metrics.details['sources'] = sources
         
         # Log final - IMPORT CORRIGÉ
         try:
@@ -77,16 +117,57 @@ def update_job_data():
         except Exception as e:
             logger.warning(f"⚠️  Impossible de compter les offres: {e}")
         
+        # Reconstruire les tables de rollup lues par les endpoints de statistiques
+        from database.rollups import refresh_rollups_safely
+        with metrics.stage('rollups'):
+            refresh_rollups_safely(logger)
+        
+        metrics.finish()
         logger.info(f"✅ MISE À JOUR TERMINÉE - {total_analyzed} offres analysées")
+        logger.info(metrics.summary())
         logger.info("="*60)
         
         # Mettre à jour les stats API si l'API tourne
         update_api_stats()
         
+        return any(source['error'] is None for source in sources.values())
+        
     except Exception as e:
+        metrics.error(e)
+        metrics.finish(failed=True)
         logger.error(f"❌ ERREUR CRITIQUE dans update_job_data: {e}")
         import traceback
         logger.error(traceback.format_exc())
+        return False
+
+def enrich_offer_details(job_id='manual'):
+    """Tâche planifiée : compléter les offres PortalJob depuis leur page de détail"""
+    try:
+        from scrapers.portaljob_enricher import enrich_pending_offers
+        
+        with run_lock(ENRICHMENT_LOCK) as acquired:
+            if not acquired:
+                record_scheduler_event_safely(
+                    job_id, 'skipped_locked', datetime.now(), "enrichissement déjà en cours dans un autre processus", logger
+                )
+                return
+            stats = enrich_pending_offers()
+        logger.info(f"🔍 Enrichissement: {stats['ok']} offres enrichies, {stats['failed']} en échec, {stats['missing']} introuvables")
+    except Exception as e:
+        logger.error(f"❌ Erreur enrichissement des offres: {e}")
+
+def record_skipped_job(event):
+    """Écouteur du scheduler : exécution ignorée (la précédente tourne encore) ou manquée"""
+    if event.code == EVENT_JOB_MAX_INSTANCES:
+        record_scheduler_event_safely(
+            event.job_id, 'skipped_running', event.scheduled_run_times[-1],
+            "exécution précédente encore en cours", logger
+        )
+    else:
+        record_scheduler_event_safely(
+            event.job_id, 'missed', event.scheduled_run_time,
+            f"en retard de plus de {Config.SCHEDULER_MISFIRE_GRACE_SECONDS}s", logger
+        )
 
 def update_api_stats():
     """Mettre à jour les stats de l'API si elle tourne"""
@@ -103,57 +184,51 @@ def start_scheduler(test_mode=False):
     """Démarrer le scheduler"""
     logger.info("🚀 INITIALISATION DU SCHEDULER")
     
-    scheduler = BackgroundScheduler()
+    # Une seule exécution à la fois par tâche, exécutions en retard regroupées en une seule
+    scheduler = BackgroundScheduler(job_defaults={
+        'coalesce': True,
+        'max_instances': 1,
+        'misfire_grace_time': Config.SCHEDULER_MISFIRE_GRACE_SECONDS
+    })
+    scheduler.add_listener(record_skipped_job, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
+    try:
+        ensure_scheduler_events_table()
+    except Exception as e:
+        logger.warning(f"⚠️  Table scheduler_events indisponible: {e}")
     
     if test_mode:
         # Mode test - exécution toutes les 10 minutes
         logger.info("🧪 MODE TEST ACTIVÉ - Exécution toutes les 10 minutes")
-        scheduler.add_job(
-            update_job_data,
-            'interval',
-            minutes=10,
-            id='test_update',
-            name='Mise à jour test'
-        )
+        job_id, name = 'test_update', 'Mise à jour test'
+        trigger = IntervalTrigger(minutes=10)
     else:
-        # Mode production
-        # 1. Toutes les 3 heures
-        scheduler.add_job(
-            update_job_data,
-            'interval',
-            hours=3,
-            id='regular_update',
-            name='Mise à jour régulière'
-        )
-        
-        # 2. Tous les jours à minuit
-        scheduler.add_job(
-            update_job_data,
-            'cron',
-            hour=0,
-            minute=0,
-            id='daily_update',
-            name='Mise à jour quotidienne'
-        )
-        
-        # 3. Tous les jours à 6h, 12h, 18h
-        for hour in [6, 12, 18]:
-            scheduler.add_job(
-                update_job_data,
-                'cron',
-                hour=hour,
-                minute=0,
-                id=f'update_{hour}h',
-                name=f'Mise à jour {hour}h'
-            )
+        # Mode production : toutes les 3 heures, et tous les jours à minuit, 6h, 12h
+        # et 18h. Une seule tâche : jamais deux crawls planifiés en même temps,
+        # et les déclenchements rapprochés sont fusionnés (CRAWL_MIN_GAP_MINUTES)
+        job_id, name = 'regular_update', 'Mise à jour régulière'
+        trigger = OrTrigger([
+            IntervalTrigger(hours=3),
+            CronTrigger(hour='0,6,12,18', minute=0)
+        ])
     
-    # Exécuter immédiatement une première fois
+    # Première exécution immédiate, dans la même tâche (pas de crawl parallèle au démarrage)
     scheduler.add_job(
         update_job_data,
-        'date',
-        run_date=datetime.now(),
-        id='initial_update',
-        name='Mise à jour initiale'
+        trigger,
+        id=job_id,
+        name=name,
+        kwargs={'job_id': job_id},
+        next_run_time=datetime.now()
+    )
+    
+    # Enrichissement des offres, indépendant des scrapings de listes
+    scheduler.add_job(
+        enrich_offer_details,
+        'interval',
+        minutes=Config.ENRICH_INTERVAL_MINUTES,
+        id='offer_enrichment',
+        name='Enrichissement des offres',
+        kwargs={'job_id': 'offer_enrichment'}
     )
     
     scheduler.start()
@@ -0,0 +1,96 @@
+"""
+Expressions régulières de l'extraction Asako
+
+Les motifs d'AsakoScraper sont compilés une fois ici au lieu d'être
+retrouvés dans le cache de `re` à chaque appel (une douzaine par offre).
+
+Le découpage de la page en offres n'utilise plus de motifs `(.*?)` sur
+toute la page : on cherche l'ouverture d'une offre, puis la première
+fermeture qui la suit, et on reprend après. Le résultat est celui de
+re.findall, mais en un seul passage sur la page : une ouverture sans
+fermeture arrête la recherche au lieu de relancer un balayage jusqu'à la
+fin de la page pour chaque position suivante.
+"""
+
+import re
+
+# Blocs d'offres : (ouverture, fermeture), essayés dans l'ordre
+OFFER_BLOCK_PATTERNS = [
+    (re.compile(r'<div class="d-flex item">'),
+     re.compile(r'</div>\s*</div>\s*</div>\s*</div>')),
+    (re.compile(r'<div class="[^"]*item[^"]*">'),
+     re.compile(r'</div>\s*</div>\s*</div>')),
+    (re.compile(r'<div[^>]*class="[^"]*offer[^"]*"[^>]*>'),
+     re.compile(r'</div>\s*</div>')),
+]
+
+# Repli : un titre <h3><a>...</a></h3> suivi de sa date de publication
+SECTION_TITLE_RE = re.compile(r'<h3>\s*<a[^>]*>')
+SECTION_TITLE_END_RE = re.compile(r'</a>\s*</h3>')
+SECTION_DATE_START = '<span class="date-pub">'
+SECTION_DATE_END = '</span>'
+
+# Champs d'une offre
+TITLE_RE = re.compile(r'<h3[^>]*>\s*<a[^>]*>(.*?)</a>', re.DOTALL)
+TITLE_ATTR_RE = re.compile(r'title="([^"]+)"')
+LINK_RE = re.compile(r'href="(/annonces/[^"]+)"')
+LINK_FALLBACK_RE = re.compile(r'href="(/offre/[^"]+)"')
+COMPANY_SLUG_RE = re.compile(r'/profil-entreprise/([^"/]+)')
+COMPANY_SPAN_RE = re.compile(r'<span[^>]*class="[^"]*company[^"]*"[^>]*>(.*?)</span>', re.DOTALL)
+DATE_RE = re.compile(r'<span[^>]*class="[^"]*date-pub[^"]*"[^>]*>(.*?)</span>', re.DOTALL)
+CONTRACT_RE = re.compile(r'<span[^>]*class="[^"]*contrat-type[^"]*"[^>]*>(.*?)</span>', re.DOTALL)
+SECTOR_RE = re.compile(r'<a[^>]*href="/emploi/s-[^"]*"[^>]*>(.*?)</a>', re.DOTALL)
+METIER_RE = re.compile(r'<a[^>]*href="/emploi/m-[^"]*"[^>]*>(.*?)</a>', re.DOTALL)
+LOCATION_RE = re.compile(r'<a[^>]*href="/emploi/v-[^"]*"[^>]*>(.*?)</a>', re.DOTALL)
+DESCRIPTION_RE = re.compile(r'<p[^>]*class="[^"]*description[^"]*"[^>]*>(.*?)</p>', re.DOTALL)
+
+TAG_RE = re.compile(r'<[^>]+>')
+DIGITS_RE = re.compile(r'(\d+)')
+
+def strip_tags(html):
+    """Texte sans balises (inchangé s'il n'en contient pas)"""
+    if '<' not in html:
+        return html
+    return TAG_RE.sub('', html)
+
+def first_group(pattern, html):
+    """Premier groupe de la première correspondance, None sinon"""
+    match = pattern.search(html)
+    return match.group(1) if match else None
+
+def split_blocks(html, opening, closing):
+    """Contenu de chaque bloc ouverture...fermeture, comme re.findall(ouverture + '(.*?)' + fermeture)"""
+    blocks = []
+    pos = 0
+    while True:
+        start = opening.search(html, pos)
+        if not start:
+            break
+        end = closing.search(html, start.end())
+        if not end:
+            # Aucune fermeture plus loin : aucune offre complète ne peut suivre
+            break
+        blocks.append(html[start.end():end.start()])
+        pos = end.end()
+    return blocks
+
+def split_sections(html):
+    """Sections titre...date de publication, comme l'ancien motif de repli (correspondances entières)"""
+    sections = []
+    pos = 0
+    while True:
+        start = SECTION_TITLE_RE.search(html, pos)
+        if not start:
+            break
+        title_end = SECTION_TITLE_END_RE.search(html, start.end())
+        if not title_end:
+            break
+        date_start = html.find(SECTION_DATE_START, title_end.end())
+        if date_start < 0:
+            break
+        date_end = html.find(SECTION_DATE_END, date_start + len(SECTION_DATE_START))
+        if date_end < 0:
+            break
+        pos = date_end + len(SECTION_DATE_END)
+        sections.append(html[start.start():pos])
+    return sections
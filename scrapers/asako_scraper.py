@@ -4,18 +4,28 @@ Scraper optimisé pour asako.mg - Scraping direct vers MySQL
 Objectif: Récupérer au moins 50 offres réelles pour le hackathon
 """
 
-import urllib.request
-import re
 from datetime import datetime, timedelta
-import time
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Ajouter le chemin parent pour les imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config import Config
+from scrapers.http_client import HttpClient
+from scrapers.page_cache import PageCache, PAGE_UNCHANGED
+from scrapers import asako_parser as parser
+from scrapers.parse_pool import ParsePool
+from scrapers.run_metrics import RunMetrics
+from models.ia_risk import ASAKO_SCORER, risk_level, load_score_caches, save_score_caches
+
 try:
     from database.models import JobOffer, SessionLocal
+    from database.generation import bump_data_generation_safely
+    from database.bulk_writer import OfferBatchWriter
+    from database.known_links import load_known_links_safely
     print("✅ Modules MySQL chargés")
 except ImportError as e:
     print(f"❌ Erreur import MySQL: {e}")
@@ -24,55 +34,131 @@ except ImportError as e:
     SessionLocal = None
 
 class AsakoScraper:
-    def __init__(self, use_database=True):
+    # Attributs dont dépend parse_page, recopiés dans les processus d'analyse
+    PARSE_ATTRIBUTES = ('base_url',)
+    
+    def __init__(self, use_database=True, max_concurrency=None, requests_per_second=None, page_cache=None,
+                 parse_workers=None, shared_writer=None):
         self.base_url = "https://www.asako.mg"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 SafeAI-Hackathon/1.0'
         }
         self.use_database = use_database and JobOffer is not None
-        print(f"🤖 Scraper initialisé (MySQL: {self.use_database})")
+        # Écriture commune aux sources d'un même crawl (SharedOfferWriter)
+        self.shared_writer = shared_writer
+        
+        # Pages inchangées depuis le dernier scraping : ni téléchargées ni reparsées
+        if page_cache is None and Config.PAGE_CACHE_PATH:
+            page_cache = PageCache(Config.PAGE_CACHE_PATH, Config.PAGE_CACHE_MAX_AGE_HOURS)
+        self.page_cache = page_cache
+        
+        # Téléchargements parallèles sur des connexions persistantes, bornés par site
+        self.max_concurrency = max_concurrency or Config.SCRAPER_MAX_CONCURRENCY_PER_HOST
+        self.http = HttpClient(
+            headers=self.headers,
+            requests_per_second=requests_per_second,
+            max_concurrency=self.max_concurrency,
+            timeout=20,
+            page_cache=page_cache
+        )
+        self._executor = None
+        self._prefetched = {}
+        self._known_links = None
+        
+        # Analyse des pages dans des processus (SCRAPER_PARSE_WORKERS par défaut)
+        self.parse_workers = parse_workers
+        self._parse_pool = None
+        
+        # Temps passé dans calculate_ia_risk, et mesures des scrapings terminés (RunMetrics)
+        self.scoring_seconds = 0.0
+        self.runs = []
+        
+        # Scores déjà calculés lors des scrapings précédents
+        if Config.SCORING_CACHE_PATH:
+            loaded = load_score_caches(Config.SCORING_CACHE_PATH)
+            print(f"🧠 Cache de scores: {loaded} scores chargés")
+        
+        print(f"🤖 Scraper initialisé (MySQL: {self.use_database}, {self.max_concurrency} requêtes simultanées max)")
     
     def fetch_page(self, url):
-        """Récupérer une page HTML avec retry"""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                req = urllib.request.Request(url, headers=self.headers)
-                with urllib.request.urlopen(req, timeout=20) as response:
-                    if response.status == 200:
-                        html_content = response.read().decode('utf-8', errors='ignore')
-                        print(f"✅ Page chargée: {url}")
-                        return html_content
-                    else:
-                        print(f"⚠  Statut {response.status} pour {url}")
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    print(f"⏳ Tentative {attempt + 1}/{max_retries} échouée pour {url}: {e}")
-                    time.sleep(2)
-                else:
-                    print(f"❌ Erreur pour {url} après {max_retries} tentatives: {e}")
-        return None
+        """Récupérer une page HTML (PAGE_UNCHANGED si elle n'a pas changé, None en cas d'échec)"""
+        return self.http.fetch_page(url, errors='ignore')
+    
+    def category_urls(self, category, pages):
+        """URLs des pages d'une catégorie"""
+        return [
+            f"{self.base_url}/{category}" if page == 1 else f"{self.base_url}/{category}?page={page}"
+            for page in range(1, pages + 1)
+        ]
+    
+    def prefetch(self, urls):
+        """Lancer le téléchargement de pages en arrière-plan (débit borné par le throttle)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        
+        for url in urls:
+            if url not in self._prefetched:
+                self._prefetched[url] = self._executor.submit(self.fetch_page, url)
+    
+    def fetch_pages(self, urls, lookahead=None):
+        """Télécharger des pages en parallèle, résultats dans l'ordre des URLs
+        
+        `lookahead` limite le nombre de pages téléchargées d'avance (toutes par
+        défaut) pour ne pas télécharger des pages qui ne seront pas lues.
+        """
+        if lookahead is None:
+            self.prefetch(urls)
+        try:
+            for i, url in enumerate(urls):
+                if lookahead is not None:
+                    self.prefetch(urls[i:i + 1 + lookahead])
+                yield url, self._prefetched.pop(url).result()
+        finally:
+            # Pagination interrompue : annuler les pages pas encore lues
+            for url in urls:
+                future = self._prefetched.pop(url, None)
+                if future is not None:
+                    future.cancel()
+    
+    def known_links(self):
+        """Liens Asako déjà en base, chargés une fois (None sans base)"""
+        if self._known_links is None and self.use_database:
+            self._known_links = load_known_links_safely(source='asako')
+            if self._known_links is not None:
+                print(f"🔗 {len(self._known_links)} offres Asako déjà en base")
+        return self._known_links
+    
+    def parse_pool(self):
+        """Pool d'analyse des pages, démarré au premier scraping"""
+        if self._parse_pool is None:
+            self._parse_pool = ParsePool(self, self.parse_workers)
+        return self._parse_pool
+    
+    def close(self):
+        """Arrêter les threads de téléchargement, les processus d'analyse et fermer les connexions"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._prefetched.clear()
+        if self._parse_pool is not None:
+            self._parse_pool.close()
+            self._parse_pool = None
+        self.http.close()
     
     def extract_offers_html(self, html):
         """Extraire le HTML de chaque offre - version améliorée"""
         if not html:
             return []
         
-        # Pattern amélioré pour détecter les offres
-        patterns = [
-            r'<div class="d-flex item">(.*?)</div>\s*</div>\s*</div>\s*</div>',
-            r'<div class="[^"]*item[^"]*">(.*?)</div>\s*</div>\s*</div>',
-            r'<div[^>]*class="[^"]*offer[^"]*"[^>]*>(.*?)</div>\s*</div>'
-        ]
-        
-        for pattern in patterns:
-            offers_html = re.findall(pattern, html, re.DOTALL)
+        # Motifs compilés dans asako_parser.py, page découpée en un passage
+        for opening, closing in parser.OFFER_BLOCK_PATTERNS:
+            offers_html = parser.split_blocks(html, opening, closing)
             if offers_html:
                 print(f"📊 {len(offers_html)} offres détectées avec pattern")
                 return offers_html
         
         # Fallback: chercher par structure commune
-        offers_sections = re.findall(r'<h3>\s*<a[^>]*>.*?</a>\s*</h3>.*?<span class="date-pub">.*?</span>', html, re.DOTALL)
+        offers_sections = parser.split_sections(html)
         if offers_sections:
             print(f"📊 {len(offers_sections)} offres détectées (fallback)")
             return offers_sections
@@ -80,69 +166,72 @@ class AsakoScraper:
         print("⚠  Aucune offre détectée avec les patterns actuels")
         return []
     
+    def parse_page(self, html):
+        """Offres d'une page de liste : extraction + score IA, sans réseau ni base"""
+        offers_html = self.extract_offers_html(html)
+        return [offer for offer in map(self.parse_offer, offers_html) if offer]
+    
     def parse_offer(self, html):
         """Parser une offre individuelle - version robuste"""
         try:
             # Titre - version plus robuste
             title = "Non spécifié"
-            title_match = re.search(r'<h3[^>]*>\s*<a[^>]*>(.*?)</a>', html, re.DOTALL)
-            if title_match:
-                title = re.sub(r'<[^>]+>', '', title_match.group(1)).strip()
+            title_html = parser.first_group(parser.TITLE_RE, html)
+            if title_html is not None:
+                title = parser.strip_tags(title_html).strip()
                 if not title or len(title) < 2:
-                    title_match2 = re.search(r'title="([^"]+)"', html)
-                    if title_match2:
-                        title = title_match2.group(1).strip()
+                    title_attr = parser.first_group(parser.TITLE_ATTR_RE, html)
+                    if title_attr is not None:
+                        title = title_attr.strip()
             
             # Lien
             link = ""
-            link_match = re.search(r'href="(/annonces/[^"]+)"', html)
-            if link_match:
-                link = self.base_url + link_match.group(1)
-            else:
+            link_path = parser.first_group(parser.LINK_RE, html)
+            if link_path is None:
                 # Fallback pour lien
-                link_match = re.search(r'href="(/offre/[^"]+)"', html)
-                if link_match:
-                    link = self.base_url + link_match.group(1)
+                link_path = parser.first_group(parser.LINK_FALLBACK_RE, html)
+            if link_path is not None:
+                link = self.base_url + link_path
             
             # Entreprise
             company = "Non spécifié"
-            company_match = re.search(r'/profil-entreprise/([^"/]+)', html)
-            if company_match:
-                company = company_match.group(1).replace('-', ' ').title()
+            company_slug = parser.first_group(parser.COMPANY_SLUG_RE, html)
+            if company_slug is not None:
+                company = company_slug.replace('-', ' ').title()
             else:
-                company_match = re.search(r'<span[^>]*class="[^"]*company[^"]*"[^>]*>(.*?)</span>', html, re.DOTALL)
-                if company_match:
-                    company = re.sub(r'<[^>]+>', '', company_match.group(1)).strip()
+                company_html = parser.first_group(parser.COMPANY_SPAN_RE, html)
+                if company_html is not None:
+                    company = parser.strip_tags(company_html).strip()
             
             # Date
             date_str = "Aujourd'hui"
-            date_match = re.search(r'<span[^>]*class="[^"]*date-pub[^"]*"[^>]*>(.*?)</span>', html, re.DOTALL)
-            if date_match:
-                date_str = re.sub(r'<[^>]+>', '', date_match.group(1)).strip()
+            date_html = parser.first_group(parser.DATE_RE, html)
+            if date_html is not None:
+                date_str = parser.strip_tags(date_html).strip()
             
             # Type de contrat
             contrat = "Non spécifié"
-            contrat_match = re.search(r'<span[^>]*class="[^"]*contrat-type[^"]*"[^>]*>(.*?)</span>', html, re.DOTALL)
-            if contrat_match:
-                contrat = contrat_match.group(1).strip()
+            contrat_html = parser.first_group(parser.CONTRACT_RE, html)
+            if contrat_html is not None:
+                contrat = contrat_html.strip()
             
             # Secteur
             secteur = "Non spécifié"
-            secteur_match = re.search(r'<a[^>]*href="/emploi/s-[^"]*"[^>]*>(.*?)</a>', html, re.DOTALL)
-            if secteur_match:
-                secteur = secteur_match.group(1).strip()
+            secteur_html = parser.first_group(parser.SECTOR_RE, html)
+            if secteur_html is not None:
+                secteur = secteur_html.strip()
             
             # Métier
             metier = "Non spécifié"
-            metier_match = re.search(r'<a[^>]*href="/emploi/m-[^"]*"[^>]*>(.*?)</a>', html, re.DOTALL)
-            if metier_match:
-                metier = metier_match.group(1).strip()
+            metier_html = parser.first_group(parser.METIER_RE, html)
+            if metier_html is not None:
+                metier = metier_html.strip()
             
             # Localisation
             location = "Antananarivo"  # Par défaut
-            location_match = re.search(r'<a[^>]*href="/emploi/v-[^"]*"[^>]*>(.*?)</a>', html, re.DOTALL)
-            if location_match:
-                location = location_match.group(1).strip()
+            location_html = parser.first_group(parser.LOCATION_RE, html)
+            if location_html is not None:
+                location = location_html.strip()
             
             # Calculer le risque IA
             ia_risk_score = self.calculate_ia_risk(title, metier, secteur, contrat)
@@ -188,7 +277,7 @@ class AsakoScraper:
             return (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
         elif "il y a" in date_str:
             # Extraire le nombre de jours
-            days_match = re.search(r'(\d+)', date_str)
+            days_match = parser.DIGITS_RE.search(date_str)
             if days_match:
                 days_ago = int(days_match.group(1))
                 return (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
@@ -197,202 +286,163 @@ class AsakoScraper:
     
     def extract_description(self, html):
         """Extraire la description simplifiée"""
-        desc_match = re.search(r'<p[^>]*class="[^"]*description[^"]*"[^>]*>(.*?)</p>', html, re.DOTALL)
-        if desc_match:
-            description = re.sub(r'<[^>]+>', '', desc_match.group(1)).strip()
+        desc_html = parser.first_group(parser.DESCRIPTION_RE, html)
+        if desc_html is not None:
+            description = parser.strip_tags(desc_html).strip()
             return description[:200] + "..." if len(description) > 200 else description
         return "Description non disponible"
     
     def calculate_ia_risk(self, title, metier, secteur, contrat):
-        """Calculer un score de risque d'automatisation par l'IA"""
-        score = 5.0
-        
-        # Combiner tout le texte pour l'analyse
-        text = f"{title} {metier} {secteur} {contrat}".lower()
-        
-        # Score basé sur le métier (priorité haute)
-        metier_risks = {
-            'chauffeur': 9.0, 'conducteur': 9.0, 'driver': 9.0,
-            'livreur': 8.5, 'delivery': 8.5, 'coursier': 8.5,
-            'caissier': 8.0, 'cashier': 8.0,
-            'téléopérateur': 7.5, 'call center': 7.5, 'téléconseiller': 7.5,
-            'secrétaire': 7.0, 'secretary': 7.0, 'assistant': 6.5,
-            'opérateur': 7.0, 'operator': 7.0,
-            'mécanicien': 6.0, 'mechanic': 6.0,
-            'comptable': 5.0, 'accountant': 5.0,
-            'enseignant': 2.0, 'teacher': 2.0, 'professeur': 2.0,
-            'médecin': 1.5, 'doctor': 1.5,
-            'infirmier': 2.0, 'nurse': 2.0,
-            'développeur': 3.0, 'developer': 3.0,
-            'manager': 2.5, 'directeur': 2.0, 'chef': 2.5,
-            'coordinateur': 2.0, 'coordinator': 2.0,
-            'conseiller': 3.0, 'consultant': 3.0,
-        }
-        
-        for job, risk in metier_risks.items():
-            if job in text:
-                score = risk
-                break  # Prendre le premier métier trouvé
-        
-        # Ajustements par secteur
-        if any(word in text for word in ['transport', 'logistique', 'delivery']):
-            score += 1.0
-        if any(word in text for word in ['industrie', 'production', 'manufacturing']):
-            score += 1.5
-        if any(word in text for word in ['commerce', 'retail', 'supermarket']):
-            score += 0.5
-        if any(word in text for word in ['technologie', 'tech', 'it', 'informatique']):
-            score -= 1.0
-        if any(word in text for word in ['santé', 'health', 'medical']):
-            score -= 1.5
-        if any(word in text for word in ['éducation', 'education', 'formation']):
-            score -= 1.0
-        
-        # Ajustements par mots-clés
-        high_risk_words = ['répétitif', 'routine', 'standard', 'process', 'assembly']
-        for word in high_risk_words:
-            if word in text:
-                score += 0.5
-        
-        low_risk_words = ['créatif', 'creative', 'design', 'gestion', 'management', 'relation client']
-        for word in low_risk_words:
-            if word in text:
-                score -= 0.5
-        
-        # Garder dans les limites
-        return round(max(1.0, min(10.0, score)), 1)
+        """Calculer un score de risque d'automatisation par l'IA (tables compilées dans models/ia_risk.py)"""
+        started = time.perf_counter()
+        try:
+            return ASAKO_SCORER.score(title, metier, secteur, contrat)
+        finally:
+            self.scoring_seconds += time.perf_counter() - started
     
     def get_risk_level(self, score):
         """Convertir score en niveau de risque"""
-        if score >= 8.0:
-            return "Élevé"
-        elif score >= 5.0:
-            return "Moyen"
-        else:
-            return "Faible"
+        return risk_level(score)
     
     def get_reconversion_suggestions(self, metier, secteur, score):
         """Générer des suggestions de reconversion"""
-        suggestions = []
-        
-        if score >= 8.0:  # Risque élevé
-            suggestions = [
-                "Formation en compétences numériques (Excel, outils de gestion)",
-                "Reconversion vers la logistique ou la coordination",
-                "Développement de compétences en gestion de projet",
-                "Apprentissage des outils de relation client (CRM)"
-            ]
-        elif score >= 5.0:  # Risque moyen
-            suggestions = [
-                "Renforcement des compétences relationnelles",
-                "Apprentissage des outils digitaux de votre secteur",
-                "Spécialisation dans un créneau à forte valeur ajoutée"
-            ]
-        else:  # Risque faible
-            suggestions = [
-                "Continuer à se former dans votre domaine",
-                "Développer une expertise complémentaire",
-                "Renforcer vos compétences en leadership"
-            ]
-        
-        return suggestions
+        return ASAKO_SCORER.suggestions_for(score)
+    
+    def offer_to_row(self, offer_data):
+        """Offre analysée -> colonnes de job_offers"""
+        return {
+            'title': offer_data['title'],
+            'link': offer_data['link'],
+            'company': offer_data['company'],
+            'date_posted': offer_data['date'],
+            'contract_type': offer_data['contrat'],
+            'sector': offer_data['secteur'],
+            'job_title': offer_data['metier'],
+            'location': offer_data['location'],
+            'description': offer_data['description'],
+            'ia_risk_score': offer_data['ia_risk_score'],
+            'ia_risk_level': offer_data['ia_risk_level'],
+            'suggestions': ', '.join(offer_data['suggestions']),
+            'source': 'asako',
+            'is_active': True
+        }
+    
+    def new_writer(self):
+        """Écriture groupée, sur le writer commun du crawl s'il y en a un"""
+        if self.shared_writer is not None:
+            return self.shared_writer.writer()
+        return OfferBatchWriter()
     
     def save_to_database(self, offer_data):
-        """Sauvegarder une offre en base de données - version simplifiée"""
+        """Sauvegarder une seule offre (les scrapings passent par OfferBatchWriter)"""
         if not self.use_database:
             return False
         
-        try:
-            db = SessionLocal()
-            
-            # Vérifier si l'offre existe déjà (juste par lien)
-            existing = db.query(JobOffer.id).filter(
-                JobOffer.link == offer_data['link']
-            ).first()
-            
-            if not existing:
-                # Créer une nouvelle offre
-                job_offer = JobOffer(
-                    title=offer_data['title'],
-                    link=offer_data['link'],
-                    company=offer_data['company'],
-                    date_posted=offer_data['date'],
-                    contract_type=offer_data['contrat'],
-                    sector=offer_data['secteur'],
-                    job_title=offer_data['metier'],
-                    location=offer_data['location'],
-                    description=offer_data['description'],
-                    ia_risk_score=offer_data['ia_risk_score'],
-                    ia_risk_level=offer_data['ia_risk_level'],
-                    suggestions=', '.join(offer_data['suggestions']),
-                    scraped_at=datetime.now(),
-                    is_active=True
-                )
-                db.add(job_offer)
-                db.commit()
-                db.close()
-                return True
-            else:
-                db.close()
-                return False  # Déjà existante
-                
-        except Exception as e:
-            print(f"❌ Erreur base de données: {e}")
-            if 'db' in locals():
-                db.rollback()
-                db.close()
-            return False
+        writer = OfferBatchWriter()
+        writer.add(self.offer_to_row(offer_data))
+        return writer.flush()['inserted'] > 0
     
-    def scrape_category(self, category, pages=2):
-        """Scraper une catégorie - version simplifiée"""
+    def scrape_category(self, category, pages=2, incremental=False):
+        """Scraper une catégorie - version simplifiée
+        
+        En mode incrémental, `pages` est un maximum : la pagination s'arrête à
+        la première page qui ne contient que des offres déjà en base.
+        """
         print(f"\n{'='*60}")
         print(f"📥 SCRAPING: {category.upper()}")
         print(f"{'='*60}")
         
         all_offers = []
         saved_count = 0
+        updated_count = 0
+        unchanged_pages = 0
+        writer = self.new_writer() if self.use_database else None
         
-        for page in range(1, pages + 1):
-            if page == 1:
-                url = f"{self.base_url}/{category}"
-            else:
-                url = f"{self.base_url}/{category}?page={page}"
-            
-            print(f"\n📄 Page {page}/{pages}: {url}")
-            
-            html = self.fetch_page(url)
-            if not html:
-                print("   ⏭️  Page vide ou erreur, on continue...")
-                continue
-            
-            offers_html = self.extract_offers_html(html)
-            
-            if not offers_html:
-                print("   ⚠  Aucune offre détectée sur cette page")
-                continue
+        known = self.known_links() if incremental else None
+        # Mode incrémental : une page à la fois, pour ne télécharger que les pages lues
+        lookahead = 0 if known is not None else None
+        
+        # Durées par étape, octets et compteurs du run, enregistrés dans scrape_runs
+        with RunMetrics('category', 'asako', category, http=self.http, save=self.use_database,
+                        runs=self.runs) as metrics:
+            urls = self.category_urls(category, pages)
+            # Pages analysées dans le pool pendant que les suivantes se téléchargent
+            fetched = ((url, html, ()) for url, html in self.fetch_pages(urls, lookahead))
+            parsed_pages = self.parse_pool().parse_pages(fetched, window=lookahead)
+            for page, (url, html, parsed) in enumerate(parsed_pages, 1):
+                print(f"\n📄 Page {page}/{pages}: {url}")
+                
+                if html is PAGE_UNCHANGED:
+                    unchanged_pages += 1
+                    metrics.page(page, url, 'unchanged')
+                    print("   💤 Page inchangée depuis le dernier scraping, analyse ignorée")
+                    if known is not None:
+                        print("   🛑 Mode incrémental: arrêt de la pagination")
+                        break
+                    continue
+                
+                if not html:
+                    metrics.page(page, url, 'failed')
+                    print("   ⏭️  Page vide ou erreur, on continue...")
+                    continue
+                
+                offers = parsed()
+                
+                if not offers:
+                    metrics.page(page, url, 'empty', parsed)
+                    print("   ⚠  Aucune offre détectée sur cette page")
+                    continue
+                
+                page_links = []
+                for offer_data in offers:
+                    if offer_data['link']:
+                        all_offers.append(offer_data)
+                        page_links.append(offer_data['link'])
+                        
+                        if writer:
+                            writer.add(self.offer_to_row(offer_data))
+                
+                # Un seul upsert multi-lignes et un commit par page
+                counts = None
+                write_started = time.perf_counter()
+                if writer:
+                    counts = writer.flush()
+                    if counts['failed'] and self.page_cache:
+                        # Écriture ratée : reparser la page au prochain scraping
+                        self.page_cache.forget(url)
+                    saved_count += counts['inserted']
+                    updated_count += counts['updated']
+                    print(f"   ✅ {counts['inserted']} nouvelles offres sauvegardées sur cette page "
+                          f"({counts['updated']} mises à jour, {counts['unchanged']} inchangées)")
+                metrics.page(page, url, 'ok', parsed, len(offers), counts, time.perf_counter() - write_started)
+                
+                if known is not None and page_links:
+                    new_links = [link for link in page_links if link not in known]
+                    known.update(page_links)
+                    if not new_links:
+                        print(f"   🛑 Mode incrémental: aucune nouvelle offre, arrêt de la pagination")
+                        break
             
-            page_saved = 0
-            for i, offer_html in enumerate(offers_html, 1):
-                offer_data = self.parse_offer(offer_html)
-                if offer_data and offer_data['link']:
-                    all_offers.append(offer_data)
-                    
-                    if self.use_database:
-                        if self.save_to_database(offer_data):
-                            page_saved += 1
-                            saved_count += 1
+            # Invalider le cache de l'API si des offres ont été commitées
+            if saved_count > 0 or updated_count > 0:
+                bump_data_generation_safely()
             
-            print(f"   ✅ {page_saved} nouvelles offres sauvegardées sur cette page")
+            if Config.SCORING_CACHE_PATH:
+                save_score_caches(Config.SCORING_CACHE_PATH)
             
-            # Pause entre les pages pour être gentil
-            if page < pages:
-                time.sleep(1.5)
+            if self.page_cache:
+                self.page_cache.save()
+        
+        if unchanged_pages:
+            print(f"\n💤 {unchanged_pages}/{pages} pages inchangées pour {category}")
         
         # Afficher le résumé
         if all_offers:
             print(f"\n📊 RÉSULTAT {category.upper()}:")
             print(f"   • Offres analysées: {len(all_offers)}")
             print(f"   • Nouvelles offres sauvegardées: {saved_count}")
+            print(f"   • Offres mises à jour: {updated_count}")
+            print(f"   • {metrics.summary()}")
             
             # Statistiques de risque
             risk_counts = {"Élevé": 0, "Moyen": 0, "Faible": 0}
@@ -416,7 +466,7 @@ class AsakoScraper:
         
         return all_offers
     
-    def scrape_all_for_hackathon(self):
+    def scrape_all_for_hackathon(self, incremental=False):
         """Scraper toutes les catégories pour le hackathon"""
         print("\n" + "="*60)
         print("🚀 LANCEMENT DU SCRAPING POUR LE HACKATHON")
@@ -435,9 +485,15 @@ class AsakoScraper:
         total_offers = []
         total_saved = 0
         
+        # Télécharger toutes les pages en parallèle pendant l'analyse des premières
+        # (en mode incrémental, page par page : la plupart ne seront pas lues)
+        if not incremental:
+            for category, pages in categories_config.items():
+                self.prefetch(self.category_urls(category, pages))
+        
         for category, pages in categories_config.items():
             try:
-                offers = self.scrape_category(category, pages=pages)
+                offers = self.scrape_category(category, pages=pages, incremental=incremental)
                 if offers:
                     total_offers.extend(offers)
                     # Compter combien ont été sauvegardés
@@ -454,6 +510,7 @@ class AsakoScraper:
         print(f"{'='*60}")
         print(f"📊 Total offres analysées: {len(total_offers)}")
         print(f"💾 Offres dans MySQL: {total_saved}")
+        print(self.http.summary())
         
         if total_offers:
             # Statistiques globales
@@ -496,11 +553,21 @@ def main():
     
     # Mode automatique - toujours avec MySQL
     use_mysql = True
+    # --incremental : s'arrêter aux offres déjà en base
+    incremental = '--incremental' in sys.argv
     
     scraper = AsakoScraper(use_database=use_mysql)
     
     # Lancer le scraping complet
-    offers = scraper.scrape_all_for_hackathon()
+    try:
+        offers = scraper.scrape_all_for_hackathon(incremental=incremental)
+    finally:
+        scraper.close()
+    
+    # Reconstruire les rollups de statistiques
+    if scraper.use_database:
+        from database.rollups import refresh_rollups_safely
+        refresh_rollups_safely()
     
     # Messages finaux
     if offers:
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Banc d'essai hors ligne des parsers de scrapers
+
+Rejoue les pages HTML sauvegardées (portaljob_page_1.html, portaljob.html,
+code_source.html) et des pages synthétiques de N offres dans
+AsakoScraper.extract_offers_html/parse_offer et dans les
+PortalJobScraper.extract_job_details_from_html, sans accès réseau.
+
+Pour chaque cas : offres/s, temps par étape (médiane de plusieurs passes),
+pic mémoire (tracemalloc) et empreinte des offres produites. L'horloge des
+scrapers est figée pendant le rejeu : deux versions d'un parser doivent
+donner la même empreinte.
+
+    python scrapers/benchmark_parsers.py --save-baseline bench.json
+    python scrapers/benchmark_parsers.py --baseline bench.json --threshold 0.2
+
+Le code de sortie vaut 1 si un cas est plus lent que la référence au-delà
+du seuil ou si ses offres ont changé.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from models.ia_risk import SCORERS_BY_SOURCE
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from scrapers import asako_scraper, test3_ultime, portaljob_scraper
+
+SCRAPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = ['portaljob_page_1.html', 'portaljob.html', 'code_source.html']
+DEFAULT_SIZES = [20, 200]
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.2
+
+# Date des pages sauvegardées : "aujourd'hui" pendant le rejeu
+REPLAY_NOW = datetime(2025, 12, 7, 12, 0, 0)
+
+class _ReplayDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return REPLAY_NOW
+
+@contextlib.contextmanager
+def replay_clock():
+    """Figer datetime.now() dans les modules des scrapers"""
+    modules = [asako_scraper, test3_ultime, portaljob_scraper]
+    originals = [module.datetime for module in modules]
+    for module in modules:
+        module.datetime = _ReplayDatetime
+    try:
+        yield
+    finally:
+        for module, original in zip(modules, originals):
+            module.datetime = original
+
+# ---------------------------------------------------------------------------
+# Pages synthétiques
+# ---------------------------------------------------------------------------
+
+_TITLES = [
+    "Chauffeur poids lourd", "Comptable confirmé", "Développeur web Symfony",
+    "Téléconseiller call center", "Assistante de direction", "Chef de projet digital",
+    "Opérateur de saisie", "Infirmier diplômé", "Responsable logistique",
+    "Commercial terrain", "Enseignant de français", "Mécanicien automobile",
+]
+_SECTORS = [
+    "Transport / Logistique", "Informatique / web", "Gestion / Comptabilité / Finance",
+    "Conseiller client / Call center", "Medecine / Santé", "Commercial / Vente",
+]
+_CONTRACTS = ["CDI", "CDD", "Stage", "Freelance"]
+_CITIES = ["Antananarivo", "Toamasina", "Mahajanga", "Fianarantsoa"]
+_COMPANIES = ["Telma", "Groupe Socota", "Bionexx", "Orange Madagascar", "Star Brasseries"]
+_DATES = ["Aujourd'hui", "Hier", "Il y a 3 jours", "Il y a 12 jours"]
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+def synthetic_asako_page(count, seed=0):
+    """Page de liste Asako de `count` offres (structure attendue par extract_offers_html)"""
+    rng = random.Random(seed)
+    blocks = []
+    for i in range(count):
+        title = f"{rng.choice(_TITLES)} H/F {i}"
+        sector = rng.choice(_SECTORS)
+        metier = title.split(' ')[0]
+        city = rng.choice(_CITIES)
+        company = rng.choice(_COMPANIES)
+        blocks.append(
+            f'<div class="d-flex item">\n'
+            f'  <div class="logo"><a href="/profil-entreprise/{_slug(company)}">'
+            f'<img src="/logos/{_slug(company)}.png" alt="{company}"></a></div>\n'
+            f'  <div class="item-body">\n'
+            f'    <div class="item-content">\n'
+            f'      <h3><a href="/annonces/{100000 + i}-{_slug(title)}" title="{title}">{title}</a></h3>\n'
+            f'      <p class="description">{company} recrute un(e) {title.lower()} pour renforcer '
+            f'son équipe à {city}. Expérience souhaitée, rigueur et sens du service.</p>\n'
+            f'      <div class="item-meta">\n'
+            f'        <span class="date-pub">{rng.choice(_DATES)}</span>\n'
+            f'        <span class="contrat-type">{rng.choice(_CONTRACTS)}</span>\n'
+            f'        <a href="/emploi/s-{_slug(sector)}">{sector}</a>\n'
+            f'        <a href="/emploi/m-{_slug(metier)}">{metier}</a>\n'
+            f'        <a href="/emploi/v-{_slug(city)}">{city}</a>\n'
+            f'      </div>\n'
+            f'    </div>\n'
+            f'  </div>\n'
+            f'</div>\n'
+        )
+    return (
+        '<!DOCTYPE html><html><head><title>Offres d\'emploi - Asako</title>'
+        '<script>window.dataLayer = window.dataLayer || [];</script></head>'
+        '<body><header><nav><div class="menu"><a href="/">Accueil</a></div></nav></header>'
+        '<main><div class="container"><div class="list">\n'
+        + ''.join(blocks)
+        + '</div></div></main><footer><div class="footer">© Asako</div></footer></body></html>'
+    )
+
+def synthetic_portaljob_page(count, fixture='portaljob_page_1.html'):
+    """Page PortalJob de `count` offres, construite en répétant les articles d'une page sauvegardée"""
+    html = read_fixture(fixture)
+    articles = re.findall(r'<article class="item_annonce[^"]*".*?</article>', html, re.DOTALL)
+    start = html.index(articles[0])
+    end = html.rindex(articles[-1]) + len(articles[-1])
+
+    # Chaque répétition a ses propres titres et liens, comme des offres distinctes
+    body = []
+    for i in range(count):
+        article = articles[i % len(articles)]
+        round_ = i // len(articles)
+        if round_:
+            article = article.replace('</strong>', f' {round_}</strong>', 1)
+            article = re.sub(r'(href="[^"]*/emploi/view/[^"]*)"', rf'\1-r{round_}"', article)
+        body.append(article)
+    return html[:start] + '\n'.join(body) + html[end:]
+
+def read_fixture(name):
+    with open(os.path.join(SCRAPERS_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+# ---------------------------------------------------------------------------
+# Parsers mesurés
+# ---------------------------------------------------------------------------
+
+class StageTimer:
+    """Temps cumulé par étape"""
+
+    def __init__(self):
+        self.seconds = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+
+    def wrap(self, name, func):
+        """Chronométrer chaque appel de `func` (étape incluse dans une autre)"""
+        def timed(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return timed
+
+def run_asako(scraper, html, timer):
+    with timer.stage('extract'):
+        blocks = scraper.extract_offers_html(html)
+    with timer.stage('parse'):
+        offers = [offer for offer in map(scraper.parse_offer, blocks) if offer]
+    return offers
+
+def run_portaljob(scraper, html, timer):
+    with timer.stage('extract'):
+        return scraper.extract_job_details_from_html(html)
+
+def run_html_tree(html, timer):
+    """Construction seule de l'arbre BeautifulSoup (part de l'extraction PortalJob)"""
+    with timer.stage('html_tree'):
+        BeautifulSoup(html, 'html.parser')
+
+PARSERS = {
+    # nom: (fabrique du scraper, fonction de rejeu, étapes incluses dans une autre)
+    'asako': (lambda: asako_scraper.AsakoScraper(use_database=False), run_asako, ['scoring']),
+    'portaljob': (lambda: test3_ultime.PortalJobScraper(use_database=False), run_portaljob, ['scoring']),
+    'portaljob_soup': (lambda: test3_ultime.PortalJobScraper(use_database=False, fast_parsing=False),
+                       run_portaljob, ['scoring']),
+    'portaljob_standalone': (lambda: portaljob_scraper.PortalJobScraper(), run_portaljob, ['html_tree']),
+}
+
+def build_cases(sizes):
+    """(parser, nom de l'entrée, HTML) de tous les cas du banc"""
+    cases = []
+    for fixture in FIXTURES:
+        html = read_fixture(fixture)
+        cases.append(('portaljob', fixture, html))
+        cases.append(('portaljob_soup', fixture, html))
+        cases.append(('portaljob_standalone', fixture, html))
+    for size in sizes:
+        cases.append(('asako', f'synthetic-{size}', synthetic_asako_page(size)))
+        html = synthetic_portaljob_page(size)
+        cases.append(('portaljob', f'synthetic-{size}', html))
+        cases.append(('portaljob_soup', f'synthetic-{size}', html))
+    return cases
+
+def output_digest(offers):
+    """Empreinte des offres produites (horloge figée : stable d'une exécution à l'autre)"""
+    payload = json.dumps(offers, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+def _replay_once(parser_name, html, timer):
+    make_scraper, replay, included = PARSERS[parser_name]
+
+    # Cache de scores vidé : chaque passe score toutes ses offres
+    for scorer in SCORERS_BY_SOURCE.values():
+        scorer.cache.clear()
+
+    scraper = make_scraper()
+    if 'scoring' in included:
+        scraper.calculate_ia_risk = timer.wrap('scoring', scraper.calculate_ia_risk)
+    offers = replay(scraper, html, timer)
+    if 'html_tree' in included:
+        run_html_tree(html, timer)
+    return offers
+
+def benchmark_case(parser_name, input_name, html, repeat):
+    """Mesurer un cas : médiane des temps, pic mémoire, empreinte de sortie"""
+    included = PARSERS[parser_name][2]
+    runs = []
+    offers = []
+
+    with replay_clock(), contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            timer = StageTimer()
+            offers = _replay_once(parser_name, html, timer)
+            runs.append(timer.seconds)
+
+        # Passe supplémentaire non chronométrée pour la mémoire
+        tracemalloc.start()
+        try:
+            _replay_once(parser_name, html, StageTimer())
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    # Étapes du parser d'abord, puis celles qu'elles incluent
+    names = sorted(runs[0], key=lambda name: name in included)
+    stages = {name: statistics.median(run.get(name, 0.0) for run in runs) for name in names}
+    total = sum(seconds for name, seconds in stages.items() if name not in included)
+
+    return {
+        'parser': parser_name,
+        'input': input_name,
+        'bytes': len(html.encode('utf-8')),
+        'offers': len(offers),
+        'seconds': round(total, 6),
+        'offers_per_sec': round(len(offers) / total, 1) if total > 0 else 0.0,
+        'stages': {name: round(seconds, 6) for name, seconds in stages.items()},
+        'peak_kb': round(peak / 1024, 1),
+        'output_digest': output_digest(offers)
+    }
+
+def case_key(result):
+    return f"{result['parser']}:{result['input']}"
+
+# ---------------------------------------------------------------------------
+# Rapport et comparaison
+# ---------------------------------------------------------------------------
+
+def print_results(results):
+    print(f"\n{'CAS':<44} {'OFFRES':>6} {'MS':>9} {'OFFRES/S':>10} {'PIC KB':>9}  ÉTAPES (ms)")
+    print("-" * 110)
+    for result in results:
+        stages = ', '.join(f"{name} {seconds * 1000:.1f}" for name, seconds in result['stages'].items())
+        print(f"{case_key(result):<44} {result['offers']:>6} {result['seconds'] * 1000:>9.1f} "
+              f"{result['offers_per_sec']:>10.1f} {result['peak_kb']:>9.1f}  {stages}")
+
+def compare_with_baseline(results, baseline, threshold):
+    """Liste des régressions (lenteur au-delà du seuil ou sortie différente)"""
+    reference = {case_key(result): result for result in baseline.get('results', [])}
+    problems = []
+
+    print(f"\n📏 Comparaison avec la référence (seuil: -{threshold:.0%} offres/s)")
+    for result in results:
+        key = case_key(result)
+        base = reference.get(key)
+        if base is None:
+            print(f"   • {key}: pas de référence")
+            continue
+
+        if base['output_digest'] != result['output_digest']:
+            problems.append(f"{key}: offres différentes de la référence")
+            print(f"   ❌ {key}: sortie modifiée ({base['output_digest']} -> {result['output_digest']})")
+            continue
+
+        if not base['offers_per_sec']:
+            continue
+        ratio = result['offers_per_sec'] / base['offers_per_sec']
+        if ratio < 1 - threshold:
+            problems.append(f"{key}: {ratio:.2f}x la vitesse de référence")
+            print(f"   ❌ {key}: {ratio:.2f}x ({base['offers_per_sec']} -> {result['offers_per_sec']} offres/s)")
+        else:
+            print(f"   ✅ {key}: {ratio:.2f}x")
+    return problems
+
+def run_benchmark(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, only=None):
+    results = []
+    for parser_name, input_name, html in build_cases(sizes):
+        if only and parser_name not in only:
+            continue
+        results.append(benchmark_case(parser_name, input_name, html, repeat))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc d'essai hors ligne des parsers de scrapers")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="tailles des pages synthétiques (offres, séparées par des virgules)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f"passes par cas, médiane retenue (défaut: {DEFAULT_REPEAT})")
+    parser.add_argument('--parser', action='append', choices=sorted(PARSERS),
+                        help="limiter à ce parser (option répétable)")
+    parser.add_argument('--save-baseline', metavar='FICHIER',
+                        help="enregistrer les résultats comme référence")
+    parser.add_argument('--baseline', metavar='FICHIER',
+                        help="comparer avec une référence enregistrée")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"baisse d'offres/s tolérée (défaut: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--json', action='store_true', help="afficher les résultats en JSON")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    results = run_benchmark(sizes=sizes, repeat=max(1, args.repeat), only=args.parser)
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        print_results(results)
+
+    if args.save_baseline:
+        content = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'results': results
+        }
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(content, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Référence enregistrée: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        problems = compare_with_baseline(results, baseline, args.threshold)
+        if problems:
+            print(f"\n❌ {len(problems)} régression(s)")
+            sys.exit(1)
+        print("\n✅ Aucune régression")
+
+if __name__ == "__main__":
+    main()
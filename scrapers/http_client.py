@@ -0,0 +1,245 @@
+"""
+Client HTTP partagé par les scrapers
+
+Une session requests par scraper, dont les connexions restent ouvertes
+(keep-alive) et sont réutilisées d'une page à l'autre : la poignée de main
+TCP + TLS n'est faite qu'une fois par connexion, pas à chaque page comme
+avec urllib.request.urlopen.
+
+- Pool de connexions par hôte, dimensionné sur la concurrence maximale ;
+- débit et requêtes simultanées bornés par hôte (HostThrottle) ;
+- nouvelles tentatives sur erreur réseau, 429 et 5xx, avec un délai
+  exponentiel aléatoire (en respectant Retry-After) au lieu d'un
+  time.sleep(2) fixe ;
+- réponses gzip/deflate décodées, et brotli si le paquet `brotli` (ou
+  `brotlicffi`) est installé (urllib3 l'annonce alors dans Accept-Encoding) ;
+- durée, attente du throttle, tentatives et taille de chaque requête
+  (timings() / stats()).
+
+fetch_page() reprend la logique commune des fetch_page des scrapers :
+requête conditionnelle et PAGE_UNCHANGED avec le cache de pages.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from config import Config
+from scrapers.throttle import HostThrottle
+from scrapers.page_cache import PAGE_UNCHANGED
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 SafeAI-Hackathon/1.0',
+    'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
+}
+
+# Réponses qui valent une nouvelle tentative (surcharge ou erreur passagère du site)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def _retry_after_seconds(response):
+    """Délai demandé par l'en-tête Retry-After (secondes ou date HTTP), None sinon"""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class HttpClient:
+    """Session HTTP à connexions persistantes, throttle par hôte et nouvelles tentatives"""
+
+    def __init__(self, headers=None, requests_per_second=None, burst=None, max_concurrency=None,
+                 retries=None, backoff=None, timeout=None, page_cache=None, throttle=None):
+        self.max_concurrency = max_concurrency or Config.SCRAPER_MAX_CONCURRENCY_PER_HOST
+        self.throttle = throttle or HostThrottle(
+            requests_per_second=requests_per_second or Config.SCRAPER_REQUESTS_PER_SECOND,
+            burst=burst or Config.SCRAPER_BURST,
+            max_concurrency=self.max_concurrency
+        )
+        self.retries = max(1, retries or Config.HTTP_RETRIES)
+        self.backoff = Config.HTTP_BACKOFF_SECONDS if backoff is None else backoff
+        self.max_backoff = Config.HTTP_MAX_BACKOFF_SECONDS
+        self.timeout = timeout or Config.HTTP_TIMEOUT_SECONDS
+        self.page_cache = page_cache
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        if headers:
+            self.session.headers.update(headers)
+
+        # Autant de connexions gardées ouvertes par hôte que de requêtes simultanées
+        self._adapter = HTTPAdapter(pool_maxsize=self.max_concurrency, max_retries=0)
+        self.session.mount('http://', self._adapter)
+        self.session.mount('https://', self._adapter)
+
+        self._timings = deque(maxlen=Config.HTTP_TIMINGS_KEPT)
+        self._lock = threading.Lock()
+        self._counts = {'requests': 0, 'errors': 0, 'retries': 0, 'bytes': 0}
+        self._total_seconds = 0.0
+        self._throttle_seconds = 0.0
+
+    # -- Requêtes -------------------------------------------------------------
+
+    def backoff_delay(self, attempt, response=None):
+        """Délai avant la tentative `attempt + 1` : exponentiel, moitié fixe moitié aléatoire"""
+        retry_after = _retry_after_seconds(response)
+        if retry_after is not None:
+            return min(self.max_backoff, retry_after)
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def request(self, method, url, headers=None, timeout=None, **kwargs):
+        """Requête avec nouvelles tentatives ; lève requests.RequestException si toutes échouent
+
+        Après la dernière tentative une réponse 429/5xx est renvoyée telle
+        quelle (à l'appelant de regarder status_code).
+        """
+        started = time.perf_counter()
+        throttle_wait = 0.0
+        response = None
+        error = None
+
+        for attempt in range(self.retries):
+            if attempt:
+                delay = self.backoff_delay(attempt - 1, response)
+                reason = error or f"HTTP {response.status_code}"
+                print(f"⏳ Tentative {attempt}/{self.retries} échouée pour {url}: {reason} "
+                      f"(nouvel essai dans {delay:.1f}s)")
+                time.sleep(delay)
+
+            response = None
+            error = None
+            waiting = time.perf_counter()
+            try:
+                with self.throttle.request(url):
+                    throttle_wait += time.perf_counter() - waiting
+                    response = self.session.request(
+                        method, url, headers=headers, timeout=timeout or self.timeout, **kwargs
+                    )
+            except requests.RequestException as e:
+                error = e
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                break
+
+        self._record(url, response, attempt + 1, time.perf_counter() - started, throttle_wait)
+        if response is None:
+            raise error
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def fetch_page(self, url, encoding='utf-8', errors='replace'):
+        """HTML de la page, PAGE_UNCHANGED si elle n'a pas changé (cache de pages), None en cas d'échec"""
+        headers = self.page_cache.conditional_headers(url) if self.page_cache else None
+        try:
+            response = self.get(url, headers=headers)
+        except requests.RequestException as e:
+            print(f"❌ Erreur pour {url} après {self.retries} tentatives: {e}")
+            return None
+
+        if response.status_code == 304 and self.page_cache:
+            self.page_cache.not_modified(url)
+            print(f"💤 Page inchangée (304): {url}")
+            return PAGE_UNCHANGED
+        if response.status_code != 200:
+            print(f"⚠  Statut {response.status_code} pour {url}")
+            return None
+
+        if self.page_cache and self.page_cache.update(
+            url, response.content,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        ):
+            print(f"💤 Page inchangée: {url}")
+            return PAGE_UNCHANGED
+
+        print(f"✅ Page chargée: {url}")
+        return response.content.decode(encoding, errors=errors)
+
+    # -- Mesures --------------------------------------------------------------
+
+    def _record(self, url, response, attempts, seconds, throttle_wait):
+        size = len(response.content) if response is not None else 0
+        timing = {
+            'url': url,
+            'host': urlsplit(url).netloc,
+            'status': response.status_code if response is not None else None,
+            'attempts': attempts,
+            'seconds': seconds,               # Attentes et nouvelles tentatives comprises
+            'throttle_seconds': throttle_wait,
+            'response_seconds': response.elapsed.total_seconds() if response is not None else None,
+            'bytes': size
+        }
+        with self._lock:
+            self._timings.append(timing)
+            self._counts['requests'] += 1
+            self._counts['retries'] += attempts - 1
+            self._counts['bytes'] += size
+            if response is None or response.status_code >= 400:
+                self._counts['errors'] += 1
+            self._total_seconds += seconds
+            self._throttle_seconds += throttle_wait
+
+    def timings(self):
+        """Mesures des dernières requêtes (HTTP_TIMINGS_KEPT au plus), de la plus ancienne à la plus récente"""
+        with self._lock:
+            return list(self._timings)
+
+    def timing_for(self, url):
+        """Mesure de la dernière requête vers `url` (None si elle n'est plus gardée)"""
+        with self._lock:
+            for timing in reversed(self._timings):
+                if timing['url'] == url:
+                    return dict(timing)
+        return None
+
+    def connections_opened(self):
+        """Connexions TCP ouvertes depuis la création du client (hors connexions réutilisées)"""
+        pools = self._adapter.poolmanager.pools
+        opened = 0
+        for key in pools.keys():
+            pool = pools.get(key)  # Pool évincé entre-temps : ignoré
+            if pool is not None:
+                opened += pool.num_connections
+        return opened
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+            durations = sorted(timing['seconds'] for timing in self._timings)
+            total_seconds = self._total_seconds
+            throttle_seconds = self._throttle_seconds
+
+        requests_count = counts['requests']
+        counts.update(
+            connections=self.connections_opened(),
+            avg_seconds=round(total_seconds / requests_count, 4) if requests_count else 0.0,
+            p95_seconds=round(durations[int(0.95 * (len(durations) - 1))], 4) if durations else 0.0,
+            throttle_seconds=round(throttle_seconds, 3)
+        )
+        return counts
+
+    def summary(self):
+        """Résumé d'une ligne pour la fin d'un scraping"""
+        stats = self.stats()
+        return (f"🌐 HTTP: {stats['requests']} requêtes sur {stats['connections']} connexions, "
+                f"{stats['avg_seconds'] * 1000:.0f} ms en moyenne (p95 {stats['p95_seconds'] * 1000:.0f} ms), "
+                f"{stats['retries']} nouvelles tentatives, {stats['errors']} erreurs")
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,130 @@
+"""
+Cache disque des pages scrapées (requêtes HTTP conditionnelles)
+
+Pour chaque URL on garde l'ETag, le Last-Modified et l'empreinte du corps
+de la dernière réponse. Au scraping suivant la requête part avec
+If-None-Match / If-Modified-Since : une réponse 304, ou un corps identique
+quand le site ignore ces en-têtes, signale une page inchangée que le
+scraper n'a pas besoin de reparser.
+
+Une entrée plus vieille que `max_age_hours` est ignorée : la page est
+alors retéléchargée et reparsée entièrement au moins une fois par période.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from models.scoring_cache import write_cache_file
+
+# Valeur renvoyée par les fetch_page à la place du HTML d'une page inchangée
+PAGE_UNCHANGED = object()
+
+class PageCache:
+    """Validateurs HTTP et empreinte du corps par URL, sauvegardés en JSON"""
+
+    def __init__(self, path, max_age_hours=24):
+        self.path = path
+        self.max_age = max_age_hours * 3600
+        self._entries = self._load(path)
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        self.unchanged = 0
+        self.changed = 0
+
+    @staticmethod
+    def _load(path):
+        if not path or not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Cache de pages illisible ({path}): {e}")
+            return {}
+
+    @staticmethod
+    def body_hash(body):
+        """Empreinte du corps de la réponse (octets ou texte)"""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    def _fresh_entry(self, url):
+        entry = self._entries.get(url)
+        if entry and time.time() - entry.get('stored_at', 0) < self.max_age:
+            return entry
+        return None
+
+    def conditional_headers(self, url):
+        """En-têtes If-None-Match / If-Modified-Since à envoyer pour `url`"""
+        with self._lock:
+            entry = self._fresh_entry(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def not_modified(self, url):
+        """Enregistrer une réponse 304"""
+        with self._lock:
+            self.unchanged += 1
+
+    def update(self, url, body, etag=None, last_modified=None):
+        """Enregistrer une réponse 200 ; True si le corps est identique au précédent"""
+        digest = self.body_hash(body)
+        with self._lock:
+            entry = self._fresh_entry(url)
+            if entry and entry['body_hash'] == digest:
+                # Garder la date d'origine : l'entrée expirera quand même
+                entry['etag'] = etag or entry.get('etag')
+                entry['last_modified'] = last_modified or entry.get('last_modified')
+                self.unchanged += 1
+                self._dirty = True
+                return True
+
+            self._entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'body_hash': digest,
+                'stored_at': time.time()
+            }
+            self.changed += 1
+            self._dirty = True
+            return False
+
+    def forget(self, url):
+        """Oublier une page (à reparser au prochain scraping)"""
+        with self._lock:
+            if self._entries.pop(url, None) is not None:
+                self._dirty = True
+
+    def save(self):
+        """Écriture atomique du cache s'il a changé"""
+        with self._lock:
+            if not self._dirty:
+                return True
+            content = dict(self._entries)
+            self._dirty = False
+
+        try:
+            write_cache_file(self.path, content)
+            return True
+        except OSError as e:
+            print(f"⚠️  Impossible de sauvegarder le cache de pages ({self.path}): {e}")
+            return False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "unchanged": self.unchanged,
+                "changed": self.changed
+            }
@@ -0,0 +1,182 @@
+"""
+Analyse des pages scrapées dans un pool de processus
+
+L'extraction des offres et le score de risque IA sont du calcul pur :
+sur un gros scraping (PortalJob 20+ pages, plusieurs catégories Asako)
+ils occupent un seul cœur. Ici les pages téléchargées sont envoyées à des
+processus d'analyse pendant que les suivantes se téléchargent ; chaque
+processus renvoie les offres de la page, et le scraper reste le seul à
+écrire en base (OfferBatchWriter, un upsert par page).
+
+Avec SCRAPER_PARSE_WORKERS=0 (défaut) les pages sont analysées dans le
+processus principal, comme avant. C'est aussi le repli si le pool ne
+démarre pas ou s'arrête en cours de scraping.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import Config
+from models.ia_risk import track_score_cache_updates, take_score_cache_updates, merge_score_cache_updates
+
+# Scraper du processus d'analyse (un par processus)
+_worker_scraper = None
+
+def _init_worker(scraper_class, attributes):
+    global _worker_scraper
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Ni base ni cache de pages : le processus ne fait qu'analyser du HTML
+        _worker_scraper = scraper_class(use_database=False, page_cache=False)
+    # Réglages de l'analyse du scraper parent (PARSE_ATTRIBUTES)
+    for name, value in attributes.items():
+        setattr(_worker_scraper, name, value)
+    track_score_cache_updates()
+
+def _timed_parse(scraper, html, args):
+    """(offres, durée de l'analyse, dont durée du score IA) de scraper.parse_page
+
+    La durée du score est celle que le scraper cumule dans `scoring_seconds`
+    (calculate_ia_risk), 0 s'il ne la mesure pas.
+    """
+    scoring_before = getattr(scraper, 'scoring_seconds', 0.0)
+    started = time.perf_counter()
+    offers = scraper.parse_page(html, *args)
+    parse_seconds = time.perf_counter() - started
+    return offers, parse_seconds, getattr(scraper, 'scoring_seconds', 0.0) - scoring_before
+
+def _parse_in_worker(html, args):
+    """Offres de la page, messages affichés pendant l'analyse, scores calculés et durées"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        offers, parse_seconds, scoring_seconds = _timed_parse(_worker_scraper, html, args)
+    return offers, output.getvalue(), take_score_cache_updates(), (parse_seconds, scoring_seconds)
+
+def _mp_context():
+    # forkserver : processus créés depuis un serveur sans threads, même quand
+    # les téléchargements (ou le scheduler) tournent dans d'autres threads
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return None
+
+class PageOffers:
+    """Offres d'une page, analysées à l'appel (voir ParsePool.parse_pages)
+
+    Après l'appel, `parse_seconds` et `scoring_seconds` donnent la durée de
+    l'analyse de la page et celle du score IA, mesurées dans le processus
+    qui l'a analysée (sans l'attente du résultat).
+    """
+
+    def __init__(self, pool, html, args, future):
+        self.pool = pool
+        self.html = html
+        self.args = args
+        self.future = future
+        self.parse_seconds = 0.0
+        self.scoring_seconds = 0.0
+
+    def __call__(self):
+        return self.pool._offers(self)
+
+class ParsePool:
+    """Analyse des pages d'un scraper dans des processus, ou en ligne
+
+    Le scraper fournit parse_page(html, *args) et PARSE_ATTRIBUTES, les
+    attributs dont dépend l'analyse, recopiés dans le scraper de chaque
+    processus.
+    """
+
+    def __init__(self, scraper, workers=None):
+        self.scraper = scraper
+        self.workers = Config.SCRAPER_PARSE_WORKERS if workers is None else workers
+        self._executor = None
+
+        if self.workers > 0:
+            try:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=_mp_context(),
+                    initializer=_init_worker,
+                    initargs=(type(scraper), {
+                        name: getattr(scraper, name) for name in scraper.PARSE_ATTRIBUTES
+                    })
+                )
+                print(f"⚙️  Analyse des pages: {self.workers} processus")
+            except (OSError, ValueError, NotImplementedError) as e:
+                print(f"⚠  Pool d'analyse indisponible ({e}), analyse dans le processus principal")
+                self.workers = 0
+
+    @property
+    def parallel(self):
+        return self._executor is not None
+
+    def parse_pages(self, pages, window=None):
+        """(contexte, html, arguments de parse_page) -> (contexte, html, offres), dans l'ordre
+
+        `offres` est toujours un PageOffers, même pour une page vide, en
+        erreur ou inchangée ; c'est son appel qui retourne la liste des
+        offres, ou None si `html` n'est pas une page à analyser. Jusqu'à `window` pages (2 par processus par défaut) sont
+        analysées d'avance ; 0 pour analyser chaque page avant de lire la
+        suivante (mode incrémental).
+        """
+        if window is None:
+            window = 2 * self.workers if self.parallel else 0
+
+        pending = deque()
+        for context, html, args in pages:
+            pending.append((context, html, args, self._submit(html, args)))
+            while len(pending) > window:
+                yield self._ready(*pending.popleft())
+        while pending:
+            yield self._ready(*pending.popleft())
+
+    def _submit(self, html, args):
+        if not self.parallel or not isinstance(html, str) or not html:
+            return None
+        try:
+            return self._executor.submit(_parse_in_worker, html, args)
+        except (BrokenProcessPool, RuntimeError) as e:
+            self._fall_back(e)
+            return None
+
+    def _ready(self, context, html, args, future):
+        return context, html, PageOffers(self, html, args, future)
+
+    def _offers(self, page):
+        html, args, future = page.html, page.args, page.future
+        if not isinstance(html, str) or not html:
+            return None
+
+        if future is not None:
+            try:
+                offers, output, score_updates, timings = future.result()
+                print(output, end='')
+                merge_score_cache_updates(score_updates)
+                page.parse_seconds, page.scoring_seconds = timings
+                return offers
+            except BrokenProcessPool as e:
+                self._fall_back(e)
+            except Exception as e:
+                print(f"❌ Erreur d'analyse de la page: {e}")
+                return []
+
+        try:
+            offers, page.parse_seconds, page.scoring_seconds = _timed_parse(self.scraper, html, args)
+            return offers
+        except Exception as e:
+            print(f"❌ Erreur d'analyse de la page: {e}")
+            return []
+
+    def _fall_back(self, error):
+        """Pool arrêté (processus tué...) : la suite est analysée dans le processus principal"""
+        if self._executor is not None:
+            print(f"⚠  Pool d'analyse arrêté ({error}), analyse dans le processus principal")
+            self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Enrichissement des offres PortalJob depuis leur page de détail
+
+La liste des offres ne donne qu'un extrait : description complète,
+compétences et salaire ne sont que sur la page de chaque offre. Plutôt
+que de les télécharger pendant le scraping des listes (une requête
+synchrone par offre, comme get_detailed_job_info), cette étape tourne à
+part, à son propre rythme :
+
+- la file d'attente est lue en base (database/offer_details.py) : offres
+  sans détails, ou en échec moins de ENRICH_MAX_ATTEMPTS fois ;
+- les pages sont téléchargées en parallèle par le client HTTP partagé
+  (connexions persistantes, débit et concurrence bornés par site) ;
+- les résultats sont écrits par lots (un upsert et un commit par lot).
+
+Interrompu, l'enrichissement reprend au lancement suivant ; les offres
+déjà enrichies ne sont jamais retéléchargées.
+
+Usage: python scrapers/portaljob_enricher.py [--limit N] [--concurrency N]
+"""
+
+import argparse
+import json
+import sys
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+import requests
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from scrapers.http_client import HttpClient
+from scrapers.portaljob_parser import parse_detail_page
+from database.offer_details import ensure_details_table, pending_detail_offers, write_offer_details
+
+# Réponses définitives : la page a disparu, inutile de réessayer
+GONE_STATUSES = (404, 410)
+
+class PortalJobEnricher:
+    """Télécharger les pages de détail des offres PortalJob en attente et écrire leurs détails"""
+
+    SOURCE = 'portaljob'
+
+    def __init__(self, concurrency=None, requests_per_second=None, batch_size=None, max_attempts=None):
+        self.concurrency = concurrency or Config.ENRICH_CONCURRENCY
+        self.batch_size = batch_size or Config.ENRICH_BATCH_SIZE
+        self.max_attempts = max_attempts or Config.ENRICH_MAX_ATTEMPTS
+        self.http = HttpClient(
+            requests_per_second=requests_per_second or Config.ENRICH_REQUESTS_PER_SECOND,
+            max_concurrency=self.concurrency
+        )
+
+        self.counts = {'ok': 0, 'failed': 0, 'missing': 0}
+
+    def fetch_detail(self, link):
+        """(statut, corps de la page ou message d'erreur) ; statut 'ok', 'failed' ou 'missing'"""
+        try:
+            response = self.http.get(link)
+        except requests.RequestException as e:
+            return 'failed', str(e)
+
+        if response.status_code in GONE_STATUSES:
+            return 'missing', f"HTTP {response.status_code}"
+        if response.status_code != 200:
+            return 'failed', f"HTTP {response.status_code}"
+        return 'ok', response.content
+
+    def enrich_offer(self, offer):
+        """Ligne de job_offer_details d'une offre (id, lien, tentatives précédentes)"""
+        offer_id, link, attempts = offer
+        row = {
+            'offer_id': offer_id,
+            'full_description': None,
+            'skills': None,
+            'salary': None,
+            'location': None,
+            'date_published': None,
+            'attempts': (attempts or 0) + 1,
+            'last_error': None,
+            'enriched_at': datetime.now()
+        }
+
+        status, body = self.fetch_detail(link)
+        if status == 'ok':
+            try:
+                details = parse_detail_page(body)
+                row.update(
+                    full_description=details.get('description_complete'),
+                    skills=json.dumps(details['competences'], ensure_ascii=False) if details.get('competences') else None,
+                    salary=details.get('salaire', '')[:200] or None,
+                    location=details.get('localisation', '')[:200] or None,
+                    date_published=details.get('date_publication_detailed', '')[:100] or None
+                )
+            except Exception as e:
+                status, body = 'failed', f"Analyse impossible: {e}"
+
+        row['status'] = status
+        if status != 'ok':
+            row['last_error'] = body[:500]
+            print(f"⚠  Détails indisponibles ({body}): {link}")
+        return row
+
+    def write(self, rows):
+        """Écrire un lot de résultats, False si l'écriture a échoué"""
+        if not rows:
+            return True
+        try:
+            write_offer_details(rows)
+        except Exception as e:
+            print(f"❌ Erreur écriture des détails ({len(rows)} offres): {e}")
+            return False
+
+        for row in rows:
+            self.counts[row['status']] += 1
+        print(f"💾 {len(rows)} offres écrites ({self.counts['ok']} enrichies au total)")
+        return True
+
+    def run(self, limit=None):
+        """Enrichir jusqu'à `limit` offres (ENRICH_MAX_PER_RUN par défaut, 0 = toute la file)"""
+        limit = Config.ENRICH_MAX_PER_RUN if limit is None else limit
+        ensure_details_table()
+        print(f"🔍 Enrichissement PortalJob: {limit or 'toutes les'} offres max, {self.concurrency} téléchargements simultanés")
+
+        queue = deque()
+        after_id = 0
+        exhausted = False
+        submitted = 0
+        running = set()
+        results = []
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while True:
+                # Garder `concurrency` téléchargements en cours, la file est relue par lots
+                while len(running) < self.concurrency and (not limit or submitted < limit):
+                    if not queue and not exhausted:
+                        offers = pending_detail_offers(self.SOURCE, after_id, self.batch_size, self.max_attempts)
+                        if offers:
+                            after_id = offers[-1][0]
+                            queue.extend(offers)
+                        else:
+                            exhausted = True
+                    if not queue:
+                        break
+                    running.add(executor.submit(self.enrich_offer, queue.popleft()))
+                    submitted += 1
+
+                if not running:
+                    break
+
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                results.extend(future.result() for future in done)
+                if len(results) >= self.batch_size:
+                    if not self.write(results):
+                        # Base inaccessible : ces offres restent dans la file
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        return self.stats()
+                    results = []
+
+            self.write(results)
+
+        print(self.http.summary())
+        return self.stats()
+
+    def close(self):
+        self.http.close()
+
+    def stats(self):
+        return dict(self.counts)
+
+def enrich_pending_offers(limit=None, concurrency=None):
+    """Point d'entrée du scheduler : une passe d'enrichissement, retourne les compteurs"""
+    enricher = PortalJobEnricher(concurrency=concurrency)
+    try:
+        return enricher.run(limit)
+    finally:
+        enricher.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Enrichir les offres PortalJob depuis leur page de détail")
+    parser.add_argument('--limit', type=int, default=None,
+                        help="Nombre maximum d'offres (défaut: ENRICH_MAX_PER_RUN, 0 = toute la file)")
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help="Téléchargements simultanés (défaut: ENRICH_CONCURRENCY)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔍 ENRICHISSEMENT DES OFFRES PORTALJOB")
+    print("=" * 60)
+
+    # Pas deux enrichissements en parallèle (mêmes offres téléchargées deux fois)
+    from scheduler.run_lock import run_lock, ENRICHMENT_LOCK
+    with run_lock(ENRICHMENT_LOCK) as acquired:
+        if not acquired:
+            print("⏭️  Un enrichissement tourne déjà dans un autre processus, abandon")
+            sys.exit(1)
+        stats = enrich_pending_offers(args.limit, args.concurrency)
+    print(f"\n✅ Terminé: {stats['ok']} enrichies, {stats['failed']} en échec, {stats['missing']} introuvables")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+Extraction rapide des articles d'offres PortalJob
+
+extract_job_details_from_html construisait l'arbre BeautifulSoup de toute
+la page puis appelait find() plusieurs fois par article. Ici la page est
+lue en un seul passage par html.parser (le tokeniseur qu'utilise
+BeautifulSoup), sans construire d'arbre : pour chaque
+<article class="item_annonce"> on ne garde que le premier élément de
+chaque sorte utile (h3, h4, h5, a.description, ...) et ses textes.
+
+Les règles de texte de BeautifulSoup sont reproduites à l'identique
+(chaînes composées d'espaces ramenées à " " ou "\\n", commentaires et
+scripts exclus, entités, balises vides, fermetures orphelines) pour que
+les offres produites soient les mêmes. soup_articles() garde la version
+BeautifulSoup comme référence et comme solution de repli.
+
+parse_detail_page() lit la page de détail d'une offre (enrichissement,
+voir scrapers/portaljob_enricher.py).
+"""
+
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup, Tag
+from bs4.builder import HTMLTreeBuilder
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+# Début et fin des <article> : la page est découpée avant le parsing HTML
+ARTICLE_START_RE = re.compile(r'<article\b', re.IGNORECASE)
+ARTICLE_END_RE = re.compile(r'</article\s*>', re.IGNORECASE)
+
+# Éléments recherchés dans chaque article : clé -> (balise, classe, clé de l'élément parent)
+# Pour chaque clé, seul le premier élément dans l'ordre du document compte
+# (comme job.find(...)), et seulement à l'intérieur du premier parent trouvé.
+ARTICLE_FIELDS = {
+    'h3': ('h3', None, None),
+    'h3_a': ('a', None, 'h3'),
+    'h4': ('h4', None, None),
+    'h5': ('h5', None, None),
+    'description': ('a', 'description', None),
+    'date_annonce': ('aside', 'date_annonce', None),
+    'date': ('div', 'date', 'date_annonce'),
+    'day': ('b', None, 'date'),
+    'month': ('span', 'mois', 'date'),
+    'year': ('span', 'annee', 'date'),
+    'date_lim': ('i', 'date_lim', None),
+    'urgent_flag': ('div', 'urgent_flag', None),
+}
+
+_FIELDS_BY_TAG = {}
+for _key, (_tag, _class, _parent) in ARTICLE_FIELDS.items():
+    _FIELDS_BY_TAG.setdefault(_tag, []).append((_key, _class, _parent))
+
+# Règles du constructeur d'arbre html.parser de BeautifulSoup
+_EMPTY_ELEMENT_TAGS = HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS
+_PRESERVE_WHITESPACE_TAGS = HTMLTreeBuilder.DEFAULT_PRESERVE_WHITESPACE_TAGS
+_STRING_CONTAINER_TAGS = set(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+_ASCII_SPACES = BeautifulSoup.ASCII_SPACES
+
+def slice_articles(html):
+    """HTML des seuls <article> de la page, en un passage linéaire ('' s'il n'y en a pas)
+
+    Le reste de la page (en-tête, menus, scripts, pied de page) représente
+    l'essentiel du HTML : il n'est ni tokenisé ni transformé en arbre.
+    """
+    blocks = []
+    pos = 0
+    while True:
+        start = ARTICLE_START_RE.search(html, pos)
+        if not start:
+            break
+        end = ARTICLE_END_RE.search(html, start.end())
+        if not end:
+            # Article non fermé : le parser HTML le fermera en fin de document
+            blocks.append(html[start.start():])
+            break
+        blocks.append(html[start.start():end.end()])
+        pos = end.end()
+    return '\n'.join(blocks)
+
+class ArticleElement:
+    """Élément retenu : attributs et textes, avec l'interface de bs4.Tag utilisée par le scraper"""
+
+    __slots__ = ('attrs', 'strings', 'open')
+
+    def __init__(self, attrs):
+        self.attrs = attrs
+        self.strings = []
+        self.open = True
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    def get_text(self, separator='', strip=False):
+        if strip:
+            return separator.join(s for s in (string.strip() for string in self.strings) if s)
+        return separator.join(self.strings)
+
+    @property
+    def text(self):
+        return ''.join(self.strings)
+
+class _ArticleContext:
+    """Article d'offre en cours de lecture (comparé par identité, pas par contenu)"""
+
+    __slots__ = ('classes', 'elements')
+
+    def __init__(self, classes):
+        self.classes = classes
+        self.elements = {}
+
+class _ArticleScanner(HTMLParser):
+    """Parcours unique de la page : éléments utiles de chaque article, sans arbre"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.articles = []
+        # Pile des balises ouvertes : [nom, élément retenu ou None, contexte d'article ou None]
+        self._stack = []
+        self._open_counts = Counter()
+        self._open_articles = []
+        self._open_elements = []
+        self._preserve_whitespace = []
+        self._string_containers = []
+        self._already_closed_empty = []
+        self._data = []
+
+    # -- Texte ----------------------------------------------------------------
+
+    def _end_data(self, kind='text'):
+        """Équivalent de BeautifulSoup.endData : une chaîne par segment de texte
+
+        `kind` : 'text' (texte, sauf dans <script>, <style>...), 'cdata'
+        (toujours repris par .text) ou 'other' (commentaire, déclaration...).
+        """
+        if not self._data:
+            return
+        data = ''.join(self._data)
+        self._data = []
+        if not self._preserve_whitespace and not data.strip(_ASCII_SPACES):
+            data = '\n' if '\n' in data else ' '
+        if kind == 'cdata' or (kind == 'text' and not self._string_containers):
+            for element in self._open_elements:
+                element.strings.append(data)
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_charref(self, name):
+        if name.startswith(('x', 'X')):
+            codepoint = int(name.lstrip('xX'), 16)
+        else:
+            codepoint = int(name)
+        self._data.append(UnicodeDammit.numeric_character_reference(codepoint)[0])
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self._data.append(character if character is not None else f"&{name}")
+
+    def _other_string(self, data, kind='other'):
+        self._end_data()
+        self._data.append(data)
+        self._end_data(kind)
+
+    def handle_comment(self, data):
+        self._other_string(data)
+
+    def handle_decl(self, decl):
+        self._other_string(decl)
+
+    def handle_pi(self, data):
+        self._other_string(data)
+
+    def unknown_decl(self, data):
+        # Les sections CDATA font partie du texte, contrairement aux commentaires
+        if data.upper().startswith('CDATA['):
+            self._other_string(data[len('CDATA['):], 'cdata')
+        else:
+            self._other_string(data)
+
+    # -- Balises --------------------------------------------------------------
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag)
+
+    def handle_starttag(self, tag, attrs, handle_empty_element=True):
+        self._end_data()
+
+        attr_dict = {}
+        for key, value in attrs:
+            attr_dict[key] = '' if value is None else value
+        # Attribut class en liste, comme dans bs4
+        classes = attr_dict.get('class', '').split()
+        if 'class' in attr_dict:
+            attr_dict['class'] = classes
+
+        element = None
+        for context in self._open_articles:
+            for key, class_name, parent in _FIELDS_BY_TAG.get(tag, ()):
+                if key in context.elements:
+                    continue
+                if class_name is not None and class_name not in classes:
+                    continue
+                if parent is not None:
+                    parent_element = context.elements.get(parent)
+                    if parent_element is None or not parent_element.open:
+                        continue
+                if element is None:
+                    element = ArticleElement(attr_dict)
+                context.elements[key] = element
+
+        context = None
+        if tag == 'article' and 'item_annonce' in classes:
+            context = _ArticleContext(classes)
+            self.articles.append(context)
+            self._open_articles.append(context)
+
+        entry = [tag, element, context]
+        self._stack.append(entry)
+        self._open_counts[tag] += 1
+        if element is not None:
+            self._open_elements.append(element)
+        if tag in _PRESERVE_WHITESPACE_TAGS:
+            self._preserve_whitespace.append(entry)
+        if tag in _STRING_CONTAINER_TAGS:
+            self._string_containers.append(entry)
+
+        if tag in _EMPTY_ELEMENT_TAGS and handle_empty_element:
+            # Balise vide (<br>, <img>...) : fermée aussitôt, sa fermeture explicite sera ignorée
+            self.handle_endtag(tag, check_already_closed=False)
+            self._already_closed_empty.append(tag)
+
+    def handle_endtag(self, tag, check_already_closed=True):
+        if check_already_closed and tag in self._already_closed_empty:
+            self._already_closed_empty.remove(tag)
+            return
+        self._end_data()
+        self._pop_to(tag)
+
+    def _pop_to(self, tag):
+        """Fermer les balises jusqu'à la plus récente `tag` ouverte (rien si aucune)"""
+        while self._stack and self._open_counts[tag]:
+            entry = self._stack.pop()
+            self._pop(entry)
+            if entry[0] == tag:
+                break
+
+    def _pop(self, entry):
+        name, element, context = entry
+        self._open_counts[name] -= 1
+        if element is not None:
+            element.open = False
+            self._open_elements.remove(element)
+        if context is not None:
+            self._open_articles.remove(context)
+        if self._preserve_whitespace and self._preserve_whitespace[-1] is entry:
+            self._preserve_whitespace.pop()
+        if self._string_containers and self._string_containers[-1] is entry:
+            self._string_containers.pop()
+
+    def close(self):
+        super().close()
+        self._end_data()
+        while self._stack:
+            self._pop(self._stack.pop())
+
+def scan_articles(html):
+    """[(classes de l'article, {clé: ArticleElement})] des articles d'offres, dans l'ordre de la page"""
+    scanner = _ArticleScanner()
+    scanner.feed(slice_articles(html) or html)
+    scanner.close()
+    return [(context.classes, context.elements) for context in scanner.articles]
+
+def _has_class(tag, name):
+    return name in (tag.get('class') or ())
+
+def soup_elements(job):
+    """Mêmes éléments que scan_articles, à partir d'un article BeautifulSoup"""
+    elements = {}
+    for node in job.descendants:
+        if not isinstance(node, Tag):
+            continue
+        for key, class_name, parent in _FIELDS_BY_TAG.get(node.name, ()):
+            if parent is None and key not in elements and (class_name is None or _has_class(node, class_name)):
+                elements[key] = node
+
+    # Recherches dans le premier parent trouvé (job.find('h3').find('a'), ...)
+    for key, (tag, class_name, parent) in ARTICLE_FIELDS.items():
+        parent_element = elements.get(parent) if parent else None
+        if parent_element is not None:
+            found = parent_element.find(tag, class_=class_name) if class_name else parent_element.find(tag)
+            if found is not None:
+                elements[key] = found
+    return elements
+
+def soup_articles(html):
+    """Version BeautifulSoup de scan_articles (référence, et repli en cas d'erreur)"""
+    soup = BeautifulSoup(slice_articles(html) or html, 'html.parser')
+    return [
+        (job.get('class') or [], soup_elements(job))
+        for job in soup.find_all('article', class_='item_annonce')
+    ]
+
+# Page de détail d'une offre : sélecteurs essayés dans l'ordre
+DETAIL_COMPANY_SELECTORS = ['div.company-info h2', 'div.entreprise-name', 'h2.entreprise', 'div.fiche_annonce h2']
+DETAIL_LOCATION_SELECTORS = ['span.location', 'div.localisation', 'p.adresse']
+DETAIL_DESCRIPTION_SELECTORS = ['div.job-description', 'div.description-annonce', 'div.contenu-annonce', 'article.contenu']
+
+def _select_first(soup, selectors):
+    for selector in selectors:
+        element = soup.select_one(selector)
+        if element:
+            return element
+    return None
+
+def parse_detail_page(html):
+    """Détails d'une offre depuis sa page : mêmes clés que get_detailed_job_info"""
+    soup = BeautifulSoup(html, 'html.parser')
+    details = {}
+
+    title = soup.find('h1')
+    if title:
+        details['titre_complet'] = title.text.strip()
+
+    company = _select_first(soup, DETAIL_COMPANY_SELECTORS)
+    if company:
+        details['entreprise_complete'] = company.text.strip()
+
+    location = _select_first(soup, DETAIL_LOCATION_SELECTORS)
+    if location:
+        details['localisation'] = location.text.strip()
+
+    description = _select_first(soup, DETAIL_DESCRIPTION_SELECTORS)
+    if description:
+        details['description_complete'] = description.get_text(strip=True, separator='\n')
+
+    skills = soup.find_all(['li', 'span'], class_=['competence', 'skill', 'qualification'])
+    if skills:
+        details['competences'] = [skill.text.strip() for skill in skills]
+
+    date_pub = soup.find('span', class_='date-publication') or soup.find('time')
+    if date_pub:
+        details['date_publication_detailed'] = date_pub.text.strip()
+
+    salary = soup.find('span', class_='salaire') or soup.find('strong', string='Salaire')
+    if salary:
+        details['salaire'] = salary.text.strip()
+
+    return details
@@ -1,20 +1,29 @@
-import requests
 from bs4 import BeautifulSoup
 import csv
 from datetime import datetime
-import time
 import json
+import sys
+import os
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.http_client import HttpClient
+from scrapers.page_cache import PAGE_UNCHANGED
+from scrapers.portaljob_parser import parse_detail_page
 
 class PortalJobScraper:
-    def __init__(self):
+    def __init__(self, page_cache=None):
         self.base_url = "https://www.portaljob-madagascar.com"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        # Cache optionnel (scrapers.page_cache.PageCache) : pages inchangées ignorées
+        self.page_cache = page_cache
+        # Connexions persistantes, débit borné et nouvelles tentatives (remplace les pauses)
+        self.http = HttpClient(headers=self.headers, timeout=10, page_cache=page_cache)
 
     def extract_job_details_from_html(self, html_content):
         """Extrait les détails des offres d'emploi depuis le HTML"""
@@ -157,19 +166,19 @@ class PortalJobScraper:
         """Scrape une page d'offres d'emploi"""
         try:
             print(f"Scraping de la page : {page_url}")
-            response = self.session.get(page_url, timeout=10)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
+            html = self.http.fetch_page(page_url)
+            if html is PAGE_UNCHANGED:
+                print("💤 Page inchangée depuis le dernier scraping")
+                return []
+            if html is None:
+                return []
             
             # Extraire les offres
-            jobs = self.extract_job_details_from_html(response.text)
+            jobs = self.extract_job_details_from_html(html)
             
             print(f"✅ {len(jobs)} offres d'emploi trouvées")
             return jobs
             
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur de connexion: {e}")
-            return []
         except Exception as e:
             print(f"Erreur: {e}")
             return []
@@ -187,96 +196,24 @@ class PortalJobScraper:
             print(f"\n📄 Traitement de la page {page}...")
             jobs = self.scrape_page(url)
             all_jobs.extend(jobs)
-            
-            # Pause entre les requêtes pour respecter le serveur
-            if page < num_pages:
-                time.sleep(1)
+        
+        if self.page_cache:
+            self.page_cache.save()
         
         return all_jobs
 
     def get_detailed_job_info(self, job_url):
-        """Récupère les détails complets d'une offre spécifique"""
+        """Récupère les détails complets d'une offre spécifique
+        
+        Pour enrichir beaucoup d'offres, voir scrapers/portaljob_enricher.py
+        (pages téléchargées en parallèle, résultats écrits en base par lots).
+        """
         try:
             print(f"\n🔍 Extraction des détails depuis: {job_url}")
-            response = self.session.get(job_url, timeout=10)
+            response = self.http.get(job_url)
             response.raise_for_status()
-            response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            job_details = {}
-            
-            # Titre complet
-            title = soup.find('h1')
-            if title:
-                job_details['titre_complet'] = title.text.strip()
-            
-            # Entreprise (chercher dans différents endroits)
-            company_selectors = [
-                'div.company-info h2',
-                'div.entreprise-name',
-                'h2.entreprise',
-                'div.fiche_annonce h2'
-            ]
-            
-            company = None
-            for selector in company_selectors:
-                company = soup.select_one(selector)
-                if company:
-                    break
-            
-            if company:
-                job_details['entreprise_complete'] = company.text.strip()
-            
-            # Localisation
-            location_selectors = [
-                'span.location',
-                'div.localisation',
-                'p.adresse'
-            ]
-            
-            location = None
-            for selector in location_selectors:
-                location = soup.select_one(selector)
-                if location:
-                    break
-            
-            if location:
-                job_details['localisation'] = location.text.strip()
-            
-            # Description complète
-            desc_selectors = [
-                'div.job-description',
-                'div.description-annonce',
-                'div.contenu-annonce',
-                'article.contenu'
-            ]
-            
-            description = None
-            for selector in desc_selectors:
-                description = soup.select_one(selector)
-                if description:
-                    break
-            
-            if description:
-                job_details['description_complete'] = description.get_text(strip=True, separator='\n')
-            
-            # Compétences requises
-            skills = soup.find_all(['li', 'span'], class_=['competence', 'skill', 'qualification'])
-            if skills:
-                job_details['competences'] = [skill.text.strip() for skill in skills]
-            
-            # Date de publication
-            date_pub = soup.find('span', class_='date-publication') or soup.find('time')
-            if date_pub:
-                job_details['date_publication_detailed'] = date_pub.text.strip()
-            
-            # Salaire (si disponible)
-            salary = soup.find('span', class_='salaire') or soup.find('strong', text='Salaire')
-            if salary:
-                job_details['salaire'] = salary.text.strip()
             
-            return job_details
+            return parse_detail_page(response.content)
             
         except Exception as e:
             print(f"Erreur lors de l'extraction des détails: {e}")
@@ -0,0 +1,204 @@
+"""
+Mesures d'un scraping : où passe le temps d'un run
+
+Un RunMetrics accompagne un scraping (une catégorie Asako, la liste
+PortalJob) ou un crawl complet du scheduler :
+
+- par page : durée et taille du téléchargement (mesures du HttpClient),
+  durée de l'analyse et du score IA (ParsePool), durée de l'écriture,
+  offres analysées et compteurs de l'OfferBatchWriter ;
+- par run : les mêmes durées cumulées par étape, la durée réelle, les
+  octets et requêtes, les erreurs.
+
+Les durées par étape sont cumulées : téléchargements et analyses se
+chevauchent (threads, pool de processus), leur somme peut dépasser la
+durée réelle du run.
+
+À la fin du run, un enregistrement structuré est écrit dans les logs
+(logger `safe_ai.scrape_runs`, message JSON et attribut `scrape_run`) et
+dans la table scrape_runs (database/scrape_runs.py) si SCRAPE_RUNS_ENABLED.
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from config import Config
+
+logger = logging.getLogger('safe_ai.scrape_runs')
+
+# Étapes qui ont leur colonne dans scrape_runs (les autres vont dans `details`)
+STAGES = ('fetch', 'parse', 'scoring', 'write')
+
+COUNTERS = (
+    'requests', 'bytes_downloaded', 'pages', 'pages_unchanged', 'pages_failed',
+    'offers_parsed', 'inserted', 'updated', 'skipped', 'write_failures', 'errors'
+)
+
+class RunMetrics:
+    """Collecte des mesures d'un run ; contexte qui termine et enregistre le run en sortie
+
+    `http` est le HttpClient du scraper (mesures de téléchargement par URL) ;
+    `save` écrit le run dans scrape_runs (False sans base de données) ;
+    l'enregistrement final est ajouté à la liste `runs` si elle est donnée,
+    même si le run a échoué.
+    """
+
+    def __init__(self, kind, source=None, label=None, http=None, save=True, runs=None):
+        self.kind = kind
+        self.source = source
+        self.label = label
+        self.http = http
+        self.save = save and Config.SCRAPE_RUNS_ENABLED
+        self.runs = runs
+
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        self.pages = []
+        self.details = {}
+        self.last_error = None
+        self.record = None
+        self.run_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc is not None:
+            self.error(exc)
+        self.finish(failed=exc is not None)
+        return False
+
+    # -- Collecte -------------------------------------------------------------
+
+    def add_stage(self, name, seconds):
+        self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        """Contexte : ajouter sa durée à l'étape `name`"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - started)
+
+    def error(self, error):
+        self.counts['errors'] += 1
+        self.last_error = str(error)
+
+    def page(self, number, url, status, parsed=None, offers=0, writes=None, write_seconds=0.0):
+        """Mesures d'une page ; `status` vaut 'ok', 'empty', 'unchanged' ou 'failed'
+
+        `parsed` est le PageOffers de la page (durées d'analyse), `writes` les
+        compteurs de OfferBatchWriter.flush().
+        """
+        timing = self.http.timing_for(url) if self.http else None
+        entry = {
+            'page': number,
+            'url': url,
+            'status': status,
+            'http_status': timing['status'] if timing else None,
+            'fetch_seconds': round(timing['seconds'], 4) if timing else 0.0,
+            'bytes': timing['bytes'] if timing else 0,
+            'parse_seconds': round(parsed.parse_seconds, 4) if parsed else 0.0,
+            'scoring_seconds': round(parsed.scoring_seconds, 4) if parsed else 0.0,
+            'write_seconds': round(write_seconds, 4),
+            'offers': offers
+        }
+
+        self.counts['pages'] += 1
+        if status == 'unchanged':
+            self.counts['pages_unchanged'] += 1
+        elif status == 'failed':
+            self.counts['pages_failed'] += 1
+            self.error(f"Page {number} indisponible: {url}")
+        if timing:
+            self.counts['requests'] += timing['attempts']
+            self.counts['bytes_downloaded'] += timing['bytes']
+            self.add_stage('fetch', timing['seconds'])
+        if parsed:
+            self.add_stage('parse', parsed.parse_seconds)
+            self.add_stage('scoring', parsed.scoring_seconds)
+        self.add_stage('write', write_seconds)
+        self.counts['offers_parsed'] += offers
+
+        if writes:
+            skipped = writes['unchanged'] + writes['duplicates']
+            entry.update(inserted=writes['inserted'], updated=writes['updated'], skipped=skipped)
+            self.counts['inserted'] += writes['inserted']
+            self.counts['updated'] += writes['updated']
+            self.counts['skipped'] += skipped
+            if writes['failed']:
+                self.counts['write_failures'] += writes['failed']
+                self.error(f"Écriture ratée pour {writes['failed']} offres de la page {number}")
+
+        self.pages.append(entry)
+        return entry
+
+    def merge(self, record):
+        """Ajouter les mesures d'un run terminé (runs des sources d'un crawl)"""
+        for name in STAGES:
+            self.add_stage(name, record[f'{name}_seconds'])
+        for name in COUNTERS:
+            self.counts[name] += record[name]
+        if record['last_error']:
+            self.last_error = record['last_error']
+
+    # -- Fin du run -----------------------------------------------------------
+
+    def finish(self, failed=False):
+        """Terminer le run : enregistrement structuré dans les logs et dans scrape_runs"""
+        if self.record is not None:
+            return self.record
+
+        if failed:
+            status = 'failed'
+        elif self.counts['errors']:
+            status = 'partial'
+        else:
+            status = 'ok'
+
+        details = dict(self.details)
+        if self.pages:
+            details['pages'] = self.pages
+        extra_stages = {name: round(seconds, 4) for name, seconds in self.stage_seconds.items() if name not in STAGES}
+        if extra_stages:
+            details['stages'] = extra_stages
+
+        self.record = {
+            'kind': self.kind,
+            'source': self.source,
+            'label': self.label,
+            'status': status,
+            'started_at': self.started_at,
+            'finished_at': datetime.now(),
+            'seconds': round(time.perf_counter() - self._started, 4),
+            **{f'{name}_seconds': round(self.stage_seconds[name], 4) for name in STAGES},
+            **self.counts,
+            'last_error': self.last_error,
+            'details': details or None
+        }
+
+        logger.info(
+            f"scrape_run {json.dumps(self.record, ensure_ascii=False, default=str)}",
+            extra={'scrape_run': self.record}
+        )
+        if self.save:
+            from database.scrape_runs import record_scrape_run_safely
+            self.run_id = record_scrape_run_safely(self.record, logger)
+        self.record['id'] = self.run_id
+        if self.runs is not None:
+            self.runs.append(self.record)
+        return self.record
+
+    def summary(self):
+        """Résumé d'une ligne : durée réelle et temps par étape"""
+        record = self.record or {}
+        seconds = record.get('seconds', time.perf_counter() - self._started)
+        return (f"⏱  {seconds:.1f}s: téléchargement {self.stage_seconds['fetch']:.1f}s, "
+                f"analyse {self.stage_seconds['parse']:.2f}s (dont score IA {self.stage_seconds['scoring']:.2f}s), "
+                f"écriture {self.stage_seconds['write']:.2f}s, {self.counts['bytes_downloaded'] / 1024:.0f} Ko")
@@ -4,20 +4,29 @@ PortalJob Madagascar Scraper - Intégration directe avec MySQL
 Objectif: Scraper les offres d'emploi de PortalJob et les insérer dans la base de données
 """
 
-import requests
-from bs4 import BeautifulSoup
 import re
 from datetime import datetime, timedelta
-import time
 import sys
 import os
 import json
+import time
 
 # Ajouter le chemin parent pour les imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config import Config
+from scrapers.page_cache import PageCache, PAGE_UNCHANGED
+from scrapers.http_client import HttpClient
+from scrapers.portaljob_parser import scan_articles, soup_articles
+from scrapers.parse_pool import ParsePool
+from scrapers.run_metrics import RunMetrics
+from models.ia_risk import PORTALJOB_SCORER, risk_level, load_score_caches, save_score_caches
+
 try:
     from database.models import JobOffer, SessionLocal
+    from database.generation import bump_data_generation_safely
+    from database.bulk_writer import OfferBatchWriter
+    from database.known_links import load_known_links_safely
     print("✅ Modules MySQL chargés pour PortalJob")
 except ImportError as e:
     print(f"❌ Erreur import MySQL: {e}")
@@ -25,90 +34,180 @@ except ImportError as e:
     JobOffer = None
     SessionLocal = None
 
+# Références d'offre dans les titres, par ordre de priorité
+REFERENCE_PATTERNS = [
+    re.compile(r'ref[:\s]*([A-Z0-9\-_/]+)', re.IGNORECASE),
+    re.compile(r'réf[:\s]*([A-Z0-9\-_/]+)', re.IGNORECASE),
+    re.compile(r'reference[:\s]*([A-Z0-9\-_/]+)', re.IGNORECASE),
+    re.compile(r'-([A-Z0-9\-_/]+)$', re.IGNORECASE)
+]
+
 class PortalJobScraper:
-    def __init__(self, use_database=True):
+    # Attributs dont dépend parse_page, recopiés dans les processus d'analyse
+    PARSE_ATTRIBUTES = ('base_url', 'fast_parsing')
+    
+    # Secteur d'activité : premier mot-clé présent dans le titre ou l'extrait
+    SECTOR_KEYWORDS = {
+        'informatique': 'Informatique / web',
+        'commercial': 'Commercial / Vente',
+        'rh': 'Management / RH',
+        'marketing': 'Marketing / Communication',
+        'comptabilité': 'Gestion / Comptabilité / Finance',
+        'ingénieur': 'Ingénierie / industrie / BTP',
+        'santé': 'Medecine / Santé',
+        'enseignement': 'Enseignement',
+        'droit': 'Droit / Juriste',
+        'tourisme': 'Tourisme / Voyage',
+        'logistique': 'Logistique / Achats',
+        'agriculture': 'Agronomie / Agriculture',
+        'bâtiment': 'Ingénierie / industrie / BTP',
+        'btp': 'Ingénierie / industrie / BTP',
+        'banque': 'Gestion / Comptabilité / Finance',
+        'finance': 'Gestion / Comptabilité / Finance',
+        'call center': 'Conseiller client / Call center',
+        'téléconseiller': 'Conseiller client / Call center',
+        'service client': 'Conseiller client / Call center',
+        'stage': 'Stage',
+        'stagiaire': 'Stage',
+        'freelance': 'Free-lance',
+        'cdi': 'CDI',
+        'cdd': 'CDD'
+    }
+    
+    def __init__(self, use_database=True, page_cache=None, fast_parsing=None, parse_workers=None,
+                 shared_writer=None):
         self.base_url = "https://www.portaljob-madagascar.com"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 SafeAI-Hackathon/1.0',
             'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
         self.use_database = use_database and JobOffer is not None
         print(f"🤖 PortalJob Scraper initialisé (MySQL: {self.use_database})")
+        # Écriture commune aux sources d'un même crawl (SharedOfferWriter)
+        self.shared_writer = shared_writer
+        
+        # Pages inchangées depuis le dernier scraping : pas reparsées
+        if page_cache is None and Config.PAGE_CACHE_PATH:
+            page_cache = PageCache(Config.PAGE_CACHE_PATH, Config.PAGE_CACHE_MAX_AGE_HOURS)
+        self.page_cache = page_cache
+        
+        # Connexions persistantes ; le throttle par site remplace les pauses entre pages
+        self.http = HttpClient(headers=self.headers, page_cache=page_cache)
+        self._known_links = None
+        
+        # Extraction des offres sans construire l'arbre BeautifulSoup de la page
+        self.fast_parsing = Config.PORTALJOB_FAST_PARSING if fast_parsing is None else fast_parsing
+        
+        # Analyse des pages dans des processus (SCRAPER_PARSE_WORKERS par défaut)
+        self.parse_workers = parse_workers
+        self._parse_pool = None
+        
+        # Temps passé dans calculate_ia_risk, et mesures des scrapings terminés (RunMetrics)
+        self.scoring_seconds = 0.0
+        self.runs = []
+        
+        # Scores déjà calculés lors des scrapings précédents
+        if Config.SCORING_CACHE_PATH:
+            loaded = load_score_caches(Config.SCORING_CACHE_PATH)
+            print(f"🧠 Cache de scores: {loaded} scores chargés")
     
     def fetch_page(self, url):
-        """Récupérer une page HTML avec retry"""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                print(f"📡 Récupération: {url}")
-                response = self.session.get(url, timeout=15)
-                if response.status_code == 200:
-                    response.encoding = 'utf-8'
-                    print(f"✅ Page chargée avec succès")
-                    return response.text
-                else:
-                    print(f"⚠  Statut {response.status_code} pour {url}")
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    print(f"⏳ Tentative {attempt + 1}/{max_retries} échouée: {e}")
-                    time.sleep(2)
-                else:
-                    print(f"❌ Erreur après {max_retries} tentatives: {e}")
-        return None
+        """Récupérer une page HTML (PAGE_UNCHANGED si elle n'a pas changé, None en cas d'échec)"""
+        print(f"📡 Récupération: {url}")
+        return self.http.fetch_page(url)
     
-    def scrape_page(self, page_num=1):
-        """Scraper une page spécifique de PortalJob"""
+    def known_links(self):
+        """Liens PortalJob déjà en base, chargés une fois (None sans base)"""
+        if self._known_links is None and self.use_database:
+            self._known_links = load_known_links_safely(source='portaljob')
+            if self._known_links is not None:
+                print(f"🔗 {len(self._known_links)} offres PortalJob déjà en base")
+        return self._known_links
+    
+    def page_url(self, page_num):
+        """URL d'une page de la liste des offres"""
         if page_num == 1:
-            url = f"{self.base_url}/emploi/liste"
-        else:
-            url = f"{self.base_url}/emploi/liste/page/{page_num}"
-        
-        html = self.fetch_page(url)
+            return f"{self.base_url}/emploi/liste"
+        return f"{self.base_url}/emploi/liste/page/{page_num}"
+    
+    def fetch_listing_pages(self, num_pages):
+        """Pages 1..num_pages téléchargées une à une (débit borné par le client HTTP) : (numéro, html, arguments de parse_page)"""
+        for page in range(1, num_pages + 1):
+            print(f"\n📄 Page {page}/{num_pages}")
+            yield page, self.fetch_page(self.page_url(page)), (page,)
+    
+    def parse_pool(self):
+        """Pool d'analyse des pages, démarré au premier scraping"""
+        if self._parse_pool is None:
+            self._parse_pool = ParsePool(self, self.parse_workers)
+        return self._parse_pool
+    
+    def close(self):
+        """Arrêter les processus d'analyse et fermer les connexions"""
+        if self._parse_pool is not None:
+            self._parse_pool.close()
+            self._parse_pool = None
+        self.http.close()
+    
+    def scrape_page(self, page_num=1):
+        """Scraper une page spécifique de PortalJob (PAGE_UNCHANGED si elle n'a pas changé)"""
+        html = self.fetch_page(self.page_url(page_num))
+        if html is PAGE_UNCHANGED:
+            return PAGE_UNCHANGED
         if not html:
             return []
         
+        return self.parse_page(html, page_num)
+    
+    def parse_page(self, html, page_num=1):
+        """Offres d'une page de liste : extraction + score IA, sans réseau ni base"""
         return self.extract_job_details_from_html(html, page_num)
     
     def extract_job_details_from_html(self, html_content, page_num=1):
         """Extrait les détails des offres d'emploi depuis le HTML"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Trouver tous les articles d'offres d'emploi
-        job_articles = soup.find_all('article', class_='item_annonce')
+        # Éléments utiles de chaque article d'offre, en un passage sur la page
+        job_articles = None
+        if self.fast_parsing:
+            try:
+                job_articles = scan_articles(html_content)
+            except Exception as e:
+                print(f"⚠  Parsing rapide impossible ({e}), retour à BeautifulSoup")
+        if job_articles is None:
+            job_articles = soup_articles(html_content)
         
         job_listings = []
         
         print(f"📊 {len(job_articles)} offres détectées sur la page {page_num}")
         
-        for i, job in enumerate(job_articles, 1):
+        for i, (job_classes, elements) in enumerate(job_articles, 1):
             try:
                 job_data = {}
                 
                 # Titre de l'offre
-                title_elem = job.find('h3').find('a')
+                if 'h3' not in elements:
+                    raise ValueError("titre (h3) introuvable")
+                title_elem = elements.get('h3_a')
                 if title_elem:
                     job_data['title'] = title_elem.text.strip()
                     job_data['link'] = title_elem.get('href', '')
                 
                 # Nom de l'entreprise
-                company_elem = job.find('h4')
+                company_elem = elements.get('h4')
                 if company_elem:
                     job_data['company'] = company_elem.text.strip()
                 else:
                     job_data['company'] = 'Non spécifié'
                 
                 # Type de contrat
-                contract_elem = job.find('h5')
+                contract_elem = elements.get('h5')
                 if contract_elem:
                     job_data['contract_type'] = contract_elem.text.strip()
                 else:
                     job_data['contract_type'] = 'Non spécifié'
                 
                 # Description (extrait)
-                desc_elem = job.find('a', class_='description')
+                desc_elem = elements.get('description')
                 if desc_elem:
                     desc_text = desc_elem.get_text(strip=True, separator=' ')
                     if 'Date limite :' in desc_text:
@@ -118,14 +217,16 @@ class PortalJobScraper:
                     job_data['description'] = ''
                 
                 # Date de publication
-                date_elem = job.find('aside', class_='date_annonce').find('div', class_='date')
+                if 'date_annonce' not in elements:
+                    raise ValueError("bloc de date introuvable")
+                date_elem = elements.get('date')
                 if date_elem:
-                    if job.has_attr('class') and 'prem' in job['class']:
+                    if 'prem' in job_classes:
                         job_data['date_posted'] = self.clean_date("Aujourd'hui")
                     else:
-                        day = date_elem.find('b')
-                        month = date_elem.find('span', class_='mois')
-                        year = date_elem.find('span', class_='annee')
+                        day = elements.get('day')
+                        month = elements.get('month')
+                        year = elements.get('year')
                         if day and month and year:
                             date_str = f"{day.text.strip()} {month.text.strip()} {year.text.strip()}"
                             job_data['date_posted'] = self.clean_date(date_str)
@@ -135,7 +236,7 @@ class PortalJobScraper:
                     job_data['date_posted'] = self.clean_date(None)
                 
                 # Date limite
-                date_lim_elem = job.find('i', class_='date_lim')
+                date_lim_elem = elements.get('date_lim')
                 if date_lim_elem:
                     date_lim_text = date_lim_elem.text.strip().replace('Date limite : ', '')
                     job_data['deadline'] = self.parse_deadline(date_lim_text)
@@ -143,11 +244,11 @@ class PortalJobScraper:
                     job_data['deadline'] = None
                 
                 # Offre urgente
-                urgent_elem = job.find('div', class_='urgent_flag')
+                urgent_elem = elements.get('urgent_flag')
                 job_data['is_urgent'] = True if urgent_elem else False
                 
                 # Secteur d'activité
-                job_data['sector'] = self.extract_sector_from_context(job)
+                job_data['sector'] = self.sector_from_elements(elements.get('h3'), desc_elem)
                 
                 # Référence
                 job_data['reference'] = self.extract_reference(job_data.get('title', ''))
@@ -193,40 +294,20 @@ class PortalJobScraper:
     
     def extract_sector_from_context(self, job_element):
         """Extrait le secteur d'activité à partir du contexte"""
-        sector_keywords = {
-            'informatique': 'Informatique / web',
-            'commercial': 'Commercial / Vente',
-            'rh': 'Management / RH',
-            'marketing': 'Marketing / Communication',
-            'comptabilité': 'Gestion / Comptabilité / Finance',
-            'ingénieur': 'Ingénierie / industrie / BTP',
-            'santé': 'Medecine / Santé',
-            'enseignement': 'Enseignement',
-            'droit': 'Droit / Juriste',
-            'tourisme': 'Tourisme / Voyage',
-            'logistique': 'Logistique / Achats',
-            'agriculture': 'Agronomie / Agriculture',
-            'bâtiment': 'Ingénierie / industrie / BTP',
-            'btp': 'Ingénierie / industrie / BTP',
-            'banque': 'Gestion / Comptabilité / Finance',
-            'finance': 'Gestion / Comptabilité / Finance',
-            'call center': 'Conseiller client / Call center',
-            'téléconseiller': 'Conseiller client / Call center',
-            'service client': 'Conseiller client / Call center',
-            'stage': 'Stage',
-            'stagiaire': 'Stage',
-            'freelance': 'Free-lance',
-            'cdi': 'CDI',
-            'cdd': 'CDD'
-        }
-        
+        return self.sector_from_elements(
+            job_element.find('h3'),
+            job_element.find('a', class_='description')
+        )
+    
+    def sector_from_elements(self, title_elem, desc_elem):
+        """Secteur d'après le titre (h3) et l'extrait (a.description) déjà trouvés"""
         try:
-            title = job_element.find('h3').text.lower() if job_element.find('h3') else ''
-            desc = job_element.find('a', class_='description').text.lower() if job_element.find('a', class_='description') else ''
+            title = title_elem.text.lower() if title_elem else ''
+            desc = desc_elem.text.lower() if desc_elem else ''
             
             text_to_check = title + ' ' + desc
             
-            for keyword, sector in sector_keywords.items():
+            for keyword, sector in self.SECTOR_KEYWORDS.items():
                 if keyword in text_to_check:
                     return sector
             
@@ -236,15 +317,8 @@ class PortalJobScraper:
     
     def extract_reference(self, title):
         """Extrait la référence de l'offre depuis le titre"""
-        patterns = [
-            r'ref[:\s]*([A-Z0-9\-_/]+)',
-            r'réf[:\s]*([A-Z0-9\-_/]+)',
-            r'reference[:\s]*([A-Z0-9\-_/]+)',
-            r'-([A-Z0-9\-_/]+)$'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, title, re.IGNORECASE)
+        for pattern in REFERENCE_PATTERNS:
+            match = pattern.search(title)
             if match:
                 return match.group(1).strip()
         
@@ -310,165 +384,65 @@ class PortalJobScraper:
         return None
     
     def calculate_ia_risk(self, title, metier, secteur, contrat):
-        """Calculer un score de risque d'automatisation par l'IA"""
-        score = 5.0
-        
-        # Combiner tout le texte pour l'analyse
-        text = f"{title} {metier} {secteur} {contrat}".lower()
-        
-        # Score basé sur le métier (priorité haute)
-        metier_risks = {
-            'chauffeur': 9.0, 'conducteur': 9.0, 'driver': 9.0,
-            'livreur': 8.5, 'delivery': 8.5, 'coursier': 8.5,
-            'caissier': 8.0, 'cashier': 8.0,
-            'téléopérateur': 7.5, 'call center': 7.5, 'téléconseiller': 7.5,
-            'secrétaire': 7.0, 'secretary': 7.0, 'assistant': 6.5,
-            'opérateur': 7.0, 'operator': 7.0, 'annotateur': 8.0,
-            'mécanicien': 6.0, 'mechanic': 6.0,
-            'comptable': 5.0, 'accountant': 5.0, 'analyste': 4.0,
-            'enseignant': 2.0, 'teacher': 2.0, 'professeur': 2.0,
-            'médecin': 1.5, 'doctor': 1.5,
-            'infirmier': 2.0, 'nurse': 2.0,
-            'développeur': 3.0, 'developer': 3.0, 'programmeur': 3.0,
-            'manager': 2.5, 'directeur': 2.0, 'chef': 2.5,
-            'coordinateur': 2.0, 'coordinator': 2.0,
-            'conseiller': 3.0, 'consultant': 3.0, 'responsable': 2.5,
-            'ingénieur': 3.5, 'engineer': 3.5,
-            'technico-commercial': 4.0, 'commercial': 4.0,
-            'chargé': 3.0, 'chargee': 3.0,
-            'stagiaire': 6.0, 'stage': 6.0,
-            'freelance': 3.5, 'free-lance': 3.5,
-        }
-        
-        for job, risk in metier_risks.items():
-            if job in text:
-                score = risk
-                break  # Prendre le premier métier trouvé
-        
-        # Ajustements par secteur
-        if any(word in text for word in ['transport', 'logistique', 'delivery']):
-            score += 1.0
-        if any(word in text for word in ['industrie', 'production', 'manufacturing', 'usine']):
-            score += 1.5
-        if any(word in text for word in ['commerce', 'retail', 'supermarket', 'vente']):
-            score += 0.5
-        if any(word in text for word in ['technologie', 'tech', 'it', 'informatique', 'symfony', 'web']):
-            score -= 1.0
-        if any(word in text for word in ['santé', 'health', 'medical', 'médical']):
-            score -= 1.5
-        if any(word in text for word in ['éducation', 'education', 'formation', 'enseignement']):
-            score -= 1.0
-        if any(word in text for word in ['finance', 'banque', 'comptabilité', 'financier']):
-            score += 0.5
-        if any(word in text for word in ['marketing', 'communication', 'publicité']):
-            score += 0.5
-        
-        # Ajustements par mots-clés
-        high_risk_words = ['répétitif', 'routine', 'standard', 'process', 'assembly', 'saisie', 'data entry']
-        for word in high_risk_words:
-            if word in text:
-                score += 0.5
-        
-        low_risk_words = ['créatif', 'creative', 'design', 'gestion', 'management', 'relation client', 'leadership', 'stratégie']
-        for word in low_risk_words:
-            if word in text:
-                score -= 0.5
-        
-        # Garder dans les limites
-        return round(max(1.0, min(10.0, score)), 1)
+        """Calculer un score de risque d'automatisation par l'IA (tables compilées dans models/ia_risk.py)"""
+        started = time.perf_counter()
+        try:
+            return PORTALJOB_SCORER.score(title, metier, secteur, contrat)
+        finally:
+            self.scoring_seconds += time.perf_counter() - started
     
     def get_risk_level(self, score):
         """Convertir score en niveau de risque"""
-        if score >= 8.0:
-            return "Élevé"
-        elif score >= 5.0:
-            return "Moyen"
-        else:
-            return "Faible"
+        return risk_level(score)
     
     def get_reconversion_suggestions(self, metier, secteur, score):
         """Générer des suggestions de reconversion"""
-        suggestions = []
-        
-        if score >= 8.0:  # Risque élevé
-            suggestions = [
-                "Formation en compétences numériques avancées",
-                "Reconversion vers la supervision ou coordination d'équipe",
-                "Développement de compétences en gestion de projet agile",
-                "Apprentissage des outils d'automatisation et d'IA"
-            ]
-        elif score >= 5.0:  # Risque moyen
-            suggestions = [
-                "Renforcement des compétences en analyse de données",
-                "Apprentissage des outils digitaux spécifiques au secteur",
-                "Spécialisation dans un créneau à forte valeur ajoutée",
-                "Développement de compétences interpersonnelles avancées"
-            ]
-        else:  # Risque faible
-            suggestions = [
-                "Continuer à se former dans son domaine d'expertise",
-                "Développer une spécialisation complémentaire",
-                "Renforcer les compétences en leadership et innovation",
-                "Apprentissage des dernières technologies du secteur"
-            ]
-        
-        return suggestions
+        return PORTALJOB_SCORER.suggestions_for(score)
+    
+    def offer_to_row(self, offer_data):
+        """Offre analysée -> colonnes de job_offers"""
+        return {
+            'title': offer_data['title'],
+            'link': offer_data['link'],
+            'company': offer_data['company'],
+            'date_posted': offer_data['date_posted'],
+            'contract_type': offer_data['contract_type'],
+            'sector': offer_data['sector'],
+            'job_title': offer_data['job_title'],
+            'location': offer_data['location'],
+            'description': offer_data['description'],
+            'deadline': offer_data['deadline'],
+            'is_urgent': offer_data['is_urgent'],
+            'reference': offer_data['reference'],
+            'ia_risk_score': offer_data['ia_risk_score'],
+            'ia_risk_level': offer_data['ia_risk_level'],
+            'suggestions': offer_data['suggestions'],
+            'source': "portaljob",  # Marquer la source
+            'is_active': True
+        }
+    
+    def new_writer(self):
+        """Écriture groupée ; même titre + entreprise sous un autre lien = doublon"""
+        if self.shared_writer is not None:
+            return self.shared_writer.writer(match_title_company=True)
+        return OfferBatchWriter(match_title_company=True)
     
     def save_to_database(self, offer_data):
-        """Sauvegarder une offre en base de données"""
+        """Sauvegarder une seule offre (les scrapings passent par OfferBatchWriter)"""
         if not self.use_database:
             print(f"  ⚠  MySQL désactivé, offre non sauvegardée: {offer_data.get('title', '')[:50]}...")
             return False
         
-        try:
-            db = SessionLocal()
-            
-            # Vérifier si l'offre existe déjà (par lien ou titre+entreprise)
-            existing = db.query(JobOffer.id).filter(
-                (JobOffer.link == offer_data['link']) |
-                ((JobOffer.title == offer_data['title']) & 
-                 (JobOffer.company == offer_data['company']))
-            ).first()
-            
-            if not existing:
-                # Créer une nouvelle offre
-                job_offer = JobOffer(
-                    title=offer_data['title'],
-                    link=offer_data['link'],
-                    company=offer_data['company'],
-                    date_posted=offer_data['date_posted'],
-                    contract_type=offer_data['contract_type'],
-                    sector=offer_data['sector'],
-                    job_title=offer_data['job_title'],
-                    location=offer_data['location'],
-                    description=offer_data['description'],
-                    deadline=offer_data['deadline'],
-                    is_urgent=offer_data['is_urgent'],
-                    reference=offer_data['reference'],
-                    ia_risk_score=offer_data['ia_risk_score'],
-                    ia_risk_level=offer_data['ia_risk_level'],
-                    suggestions=offer_data['suggestions'],
-                    scraped_at=datetime.now(),
-                    is_active=True,
-                    source="portaljob"  # Marquer la source
-                )
-                db.add(job_offer)
-                db.commit()
-                db.close()
-                return True
-            else:
-                db.close()
-                return False  # Déjà existante
-                
-        except Exception as e:
-            print(f"❌ Erreur base de données: {e}")
-            if 'db' in locals():
-                db.rollback()
-                db.close()
-            return False
+        writer = self.new_writer()
+        writer.add(self.offer_to_row(offer_data))
+        return writer.flush()['inserted'] > 0
     
-    def scrape_multiple_pages(self, num_pages=20):
-        """Scraper plusieurs pages d'offres"""
+    def scrape_multiple_pages(self, num_pages=20, incremental=False):
+        """Scraper plusieurs pages d'offres
+        
+        En mode incrémental, `num_pages` est un maximum : la pagination s'arrête
+        à la première page qui ne contient que des offres déjà en base.
+        """
         print(f"\n{'='*60}")
         print(f"📥 SCRAPING PORTALJOB MADAGASCAR")
         print(f"Objectif: {num_pages} pages (~{num_pages * 20} offres)")
@@ -476,55 +450,106 @@ class PortalJobScraper:
         
         all_offers = []
         saved_count = 0
+        updated_count = 0
         skipped_count = 0
+        unchanged_pages = 0
+        pages_visited = 0
+        writer = self.new_writer() if self.use_database else None
+        known = self.known_links() if incremental else None
         
-        for page in range(1, num_pages + 1):
-            try:
-                print(f"\n📄 Page {page}/{num_pages}")
-                
-                offers = self.scrape_page(page)
-                
-                if not offers:
-                    print(f"   ⚠  Aucune offre sur cette page, on continue...")
-                    continue
-                
-                page_saved = 0
-                page_skipped = 0
-                
-                for offer in offers:
-                    if offer.get('link'):
-                        all_offers.append(offer)
+        # Mode incrémental : chaque page analysée avant de télécharger la suivante
+        window = 0 if known is not None else None
+        
+        # Durées par étape, octets et compteurs du run, enregistrés dans scrape_runs
+        with RunMetrics('listing', 'portaljob', http=self.http, save=self.use_database,
+                        runs=self.runs) as metrics:
+            parsed_pages = self.parse_pool().parse_pages(self.fetch_listing_pages(num_pages), window)
+            for page, html, parsed in parsed_pages:
+                url = self.page_url(page)
+                try:
+                    pages_visited += 1
+                    
+                    if html is PAGE_UNCHANGED:
+                        unchanged_pages += 1
+                        metrics.page(page, url, 'unchanged')
+                        print(f"   💤 Page inchangée depuis le dernier scraping, analyse ignorée")
+                        if known is not None:
+                            print(f"   🛑 Mode incrémental: arrêt de la pagination")
+                            break
+                        continue
+                    
+                    offers = parsed()
+                    if not offers:
+                        metrics.page(page, url, 'empty' if html else 'failed', parsed)
+                        print(f"   ⚠  Aucune offre sur cette page, on continue...")
+                        continue
+                    
+                    for offer in offers:
+                        if offer.get('link'):
+                            all_offers.append(offer)
+                            
+                            if writer:
+                                writer.add(self.offer_to_row(offer))
+                    
+                    # Un seul upsert multi-lignes et un commit par page
+                    counts = None
+                    write_started = time.perf_counter()
+                    if writer:
+                        counts = writer.flush()
+                        if counts['failed'] and self.page_cache:
+                            # Écriture ratée : reparser la page au prochain scraping
+                            self.page_cache.forget(url)
+                        page_skipped = counts['unchanged'] + counts['duplicates']
+                        saved_count += counts['inserted']
+                        updated_count += counts['updated']
+                        skipped_count += page_skipped
                         
-                        if self.use_database:
-                            if self.save_to_database(offer):
-                                page_saved += 1
-                                saved_count += 1
-                            else:
-                                page_skipped += 1
-                                skipped_count += 1
-                
-                print(f"   ✅ {page_saved} nouvelles offres sauvegardées")
-                if page_skipped > 0:
-                    print(f"   ⏭️  {page_skipped} offres déjà existantes")
-                
-                # Pause entre les pages pour respecter le serveur
-                if page < num_pages:
-                    sleep_time = 1.5 if page % 5 == 0 else 0.8  # Pause plus longue toutes les 5 pages
-                    time.sleep(sleep_time)
+                        print(f"   ✅ {counts['inserted']} nouvelles offres sauvegardées")
+                        if counts['updated'] > 0:
+                            print(f"   🔄 {counts['updated']} offres mises à jour")
+                        if page_skipped > 0:
+                            print(f"   ⏭️  {page_skipped} offres déjà existantes")
+                    metrics.page(page, url, 'ok', parsed, len(offers), counts, time.perf_counter() - write_started)
                     
-            except Exception as e:
-                print(f"❌ Erreur page {page}: {e}")
-                continue
+                    if known is not None:
+                        page_links = [offer['link'] for offer in offers if offer.get('link')]
+                        new_links = [link for link in page_links if link not in known]
+                        known.update(page_links)
+                        # Les doublons titre + entreprise ne sont jamais enregistrés :
+                        # une page sans insertion ne contient rien de nouveau non plus
+                        nothing_inserted = writer and counts['inserted'] == 0 and counts['failed'] == 0
+                        if not new_links or nothing_inserted:
+                            print(f"   🛑 Mode incrémental: aucune nouvelle offre, arrêt de la pagination")
+                            break
+                        
+                except Exception as e:
+                    metrics.error(f"Page {page}: {e}")
+                    print(f"❌ Erreur page {page}: {e}")
+                    continue
+            
+            # Invalider le cache de l'API si des offres ont été commitées
+            if saved_count > 0 or updated_count > 0:
+                bump_data_generation_safely()
+            
+            if Config.SCORING_CACHE_PATH:
+                save_score_caches(Config.SCORING_CACHE_PATH)
+            
+            if self.page_cache:
+                self.page_cache.save()
         
         # Afficher le résumé
         if all_offers:
             print(f"\n{'='*60}")
             print(f"📊 RÉSULTATS PORTALJOB SCRAPING")
             print(f"{'='*60}")
-            print(f"   • Pages analysées: {num_pages}")
+            print(f"   • Pages analysées: {pages_visited}/{num_pages}")
+            print(f"   • Pages inchangées: {unchanged_pages}")
             print(f"   • Offres analysées: {len(all_offers)}")
             print(f"   • Nouvelles offres en MySQL: {saved_count}")
+            print(f"   • Offres mises à jour: {updated_count}")
             print(f"   • Offres déjà existantes: {skipped_count}")
+            print(f"   • {self.http.summary()}")
+            print(f"   • {metrics.summary()}")
             
             # Statistiques de risque
             risk_counts = {"Élevé": 0, "Moyen": 0, "Faible": 0}
@@ -560,7 +585,11 @@ class PortalJobScraper:
         return {
             'total_offers': len(all_offers),
             'saved_to_db': saved_count,
+            'updated_in_db': updated_count,
             'already_exist': skipped_count,
+            'unchanged_pages': unchanged_pages,
+            'pages_visited': pages_visited,
+            'run': metrics.record,
             'offers': all_offers
         }
     
@@ -622,7 +651,16 @@ def main():
     print(f"\n🎯 LANCEMENT DU SCRAPING DE {num_pages} PAGES...")
     
     # Lancer le scraping
-    results = scraper.scrape_multiple_pages(num_pages)
+    # --incremental : s'arrêter aux offres déjà en base
+    try:
+        results = scraper.scrape_multiple_pages(num_pages, incremental='--incremental' in sys.argv)
+    finally:
+        scraper.close()
+    
+    # Reconstruire les rollups de statistiques
+    if scraper.use_database:
+        from database.rollups import refresh_rollups_safely
+        refresh_rollups_safely()
     
     # Résumé final
     print(f"\n{'='*60}")
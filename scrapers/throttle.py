@@ -0,0 +1,76 @@
+"""
+Politesse des scrapers : limiteur de débit et concurrence par hôte
+
+Remplace les time.sleep() fixes entre les pages : chaque hôte a un seau
+à jetons (débit moyen + rafale autorisée) et un nombre maximum de
+requêtes simultanées. Les pages peuvent ainsi être téléchargées en
+parallèle sans jamais dépasser le débit configuré pour un site.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+class TokenBucket:
+    """Seau à jetons thread-safe : `rate` jetons/seconde, au plus `capacity` en réserve"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def acquire(self):
+        """Bloquer jusqu'à obtenir un jeton, retourne le temps attendu"""
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+class HostThrottle:
+    """Un seau à jetons et un sémaphore de concurrence par hôte"""
+
+    def __init__(self, requests_per_second=1.0, burst=1, max_concurrency=2):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_concurrency = max(1, max_concurrency)
+
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _limits_for(self, host):
+        with self._lock:
+            limits = self._hosts.get(host)
+            if limits is None:
+                limits = (
+                    TokenBucket(self.requests_per_second, self.burst),
+                    threading.BoundedSemaphore(self.max_concurrency)
+                )
+                self._hosts[host] = limits
+            return limits
+
+    @contextmanager
+    def request(self, url):
+        """Contexte autour d'une requête HTTP vers `url`"""
+        bucket, semaphore = self._limits_for(urlsplit(url).netloc)
+        with semaphore:
+            bucket.acquire()
+            yield
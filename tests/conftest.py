@@ -0,0 +1,23 @@
+"""
+Fixtures communes : base SQLite temporaire à la place de MySQL
+"""
+
+import os
+import sys
+import pytest
+from sqlalchemy import create_engine
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import models
+
+@pytest.fixture
+def sqlite_engine(tmp_path, monkeypatch):
+    """Engine de l'application remplacé par une base SQLite vide (toutes les tables créées)"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    models.Base.metadata.create_all(engine)
+    monkeypatch.setattr(models, '_engine', engine)
+    monkeypatch.setattr(models, '_engine_pid', os.getpid())
+    yield engine
+    engine.dispose()
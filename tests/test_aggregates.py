@@ -0,0 +1,52 @@
+"""
+Tops par dimension (compute_top_values) sur SQLite, depuis job_offers
+et depuis les tables de rollup
+"""
+
+import os
+import sys
+import pytest
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.aggregates import compute_top_values
+from database.models import JobOffer, SessionLocal
+from database.rollups import refresh_rollups
+
+# (secteur, offres, dont risque élevé) : le classement à haut risque diffère du classement par volume
+SECTORS = [('Commerce', 9, 0), ('Finance', 7, 1), ('Transport', 6, 6), ('Santé', 5, 0), ('Industrie', 4, 3), ('Tech', 4, 2)]
+
+@pytest.fixture(params=['job_offers', 'rollups'])
+def db(request, sqlite_engine):
+    db = SessionLocal()
+    number = 0
+    for sector, count, high_risk in SECTORS:
+        for i in range(count):
+            number += 1
+            db.add(JobOffer(
+                title=f"Offre {number}", link=f"/offre/{number}", sector=sector,
+                company='ACME' if number % 3 else '', location='Antananarivo', job_title=sector.lower(),
+                source='asako', ia_risk_score=8.5 if i < high_risk else 3.0,
+                ia_risk_level='Élevé' if i < high_risk else 'Faible', is_active=True
+            ))
+    db.commit()
+    if request.param == 'rollups':
+        refresh_rollups(db)
+    yield db
+    db.close()
+
+def test_top_values_limited_and_sorted(db):
+    tops = compute_top_values(db, top_n=3)
+
+    assert tops['sector'] == [('Commerce', 9), ('Finance', 7), ('Transport', 6)]
+    # Ex aequo départagés par valeur
+    assert compute_top_values(db, top_n=6)['sector'][-2:] == [('Industrie', 4), ('Tech', 4)]
+    assert tops['company'] == [('ACME', 24)]
+    assert tops['source'] == [('asako', 35)]
+
+def test_high_risk_sectors_ranked_independently(db):
+    tops = compute_top_values(db, top_n=3)
+
+    # Industrie et Tech sont hors du top 3 par volume
+    assert tops['high_risk_sector'] == [('Transport', 6), ('Industrie', 3), ('Tech', 2)]
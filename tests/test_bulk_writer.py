@@ -0,0 +1,104 @@
+"""
+OfferBatchWriter sur une base SQLite : classement des lots, doublons,
+date de première découverte et échec d'écriture
+"""
+
+import os
+import sys
+from datetime import datetime
+from sqlalchemy import select
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.bulk_writer import OfferBatchWriter
+from database.models import JobOffer, SessionLocal
+
+def offer(link, title='Comptable', company='ACME', **columns):
+    return {'link': link, 'title': title, 'company': company, 'ia_risk_score': 0.5, **columns}
+
+def stored(link):
+    db = SessionLocal()
+    try:
+        return db.execute(select(JobOffer).where(JobOffer.link == link)).scalar_one_or_none()
+    finally:
+        db.close()
+
+def write(rows, **options):
+    writer = OfferBatchWriter(**options)
+    for row in rows:
+        writer.add(row)
+    return writer.flush()
+
+def test_new_changed_and_unchanged_offers(sqlite_engine):
+    assert write([offer('/1'), offer('/2'), offer('/3')])['inserted'] == 3
+
+    counts = write([offer('/1'), offer('/2', title='Comptable senior'), offer('/4')])
+
+    assert counts == {'inserted': 1, 'updated': 1, 'unchanged': 1, 'duplicates': 0, 'failed': 0}
+    assert stored('/2').title == 'Comptable senior'
+
+def test_float_scores_compared_with_tolerance(sqlite_engine):
+    write([offer('/1', ia_risk_score=0.7), offer('/2', ia_risk_score=0.7)])
+
+    # Arrondi du FLOAT MySQL : pas une modification ; un vrai changement de score en est une
+    counts = write([offer('/1', ia_risk_score=0.7 + 1e-9), offer('/2', ia_risk_score=0.75)])
+
+    assert counts['unchanged'] == 1
+    assert counts['updated'] == 1
+    assert stored('/2').ia_risk_score == 0.75
+
+def test_same_title_and_company_in_one_batch_kept_once(sqlite_engine):
+    write([offer('/1', title='Chauffeur', company='Trans')], match_title_company=True)
+
+    counts = write([
+        offer('/2', title='Chauffeur', company='Trans'),  # déjà en base sous un autre lien
+        offer('/3', title='Caissier', company='Shop'),
+        offer('/4', title='Caissier', company='Shop'),    # répété dans le lot
+        offer('/5', title='Caissier', company='Autre')
+    ], match_title_company=True)
+
+    assert counts['inserted'] == 2
+    assert counts['duplicates'] == 2
+    assert stored('/3') is not None
+    assert stored('/2') is None and stored('/4') is None
+
+def test_duplicates_kept_without_title_company_matching(sqlite_engine):
+    counts = write([offer('/1'), offer('/2')])
+
+    assert counts['inserted'] == 2
+    assert counts['duplicates'] == 0
+
+def test_scraped_at_keeps_first_seen_date(sqlite_engine):
+    first_seen = datetime(2026, 1, 5, 8, 0)
+    write([offer('/1', scraped_at=first_seen)])
+
+    counts = write([offer('/1', title='Comptable senior', scraped_at=datetime(2026, 2, 1))])
+
+    assert counts['updated'] == 1
+    assert stored('/1').scraped_at == first_seen
+
+def test_date_posted_only_filled_when_missing(sqlite_engine):
+    write([offer('/1', date_posted='2026-01-05'), offer('/2', date_posted=None)])
+
+    # Offres sans date datées "aujourd'hui" par les scrapers
+    counts = write([offer('/1', date_posted='2026-10-17'), offer('/2', date_posted='2026-10-17')])
+
+    assert counts['unchanged'] == 1
+    assert counts['updated'] == 1
+    assert stored('/1').date_posted == '2026-01-05'
+    assert stored('/2').date_posted == '2026-10-17'
+
+def test_failed_batch_rolled_back_and_counted(sqlite_engine):
+    writer = OfferBatchWriter()
+    writer.add(offer('/1'))
+    writer.add(offer('/2', title=None))  # titre obligatoire : le lot entier échoue
+
+    counts = writer.flush()
+
+    assert counts == {'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicates': 0, 'failed': 2}
+    assert writer.stats()['failed'] == 2
+    assert stored('/1') is None
+
+    # La session suivante repart d'un état propre
+    assert write([offer('/1')])['inserted'] == 1
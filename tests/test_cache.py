@@ -0,0 +1,165 @@
+"""
+Cache de réponses de l'API : TTL, LRU, clé de cache et invalidation
+par la génération des données
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+import pytest
+from flask import Flask, Response, request
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from api import cache as cache_module
+from api.cache import ResponseCache, cached_response
+
+class Clock:
+    """Horloge monotone pilotée par le test"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, 'time', SimpleNamespace(monotonic=clock))
+    return clock
+
+@pytest.fixture
+def generation():
+    return {'value': 1, 'reads': 0}
+
+@pytest.fixture
+def response_cache(monkeypatch, generation):
+    """Cache neuf branché sur une génération contrôlée par le test"""
+    def read_generation():
+        generation['reads'] += 1
+        return generation['value']
+
+    cache = ResponseCache(max_entries=2, ttl_seconds=60, generation_poll_seconds=5)
+    monkeypatch.setattr(cache, '_read_generation', read_generation)
+    monkeypatch.setattr(cache_module, 'response_cache', cache)
+    monkeypatch.setattr(config.Config, 'RESPONSE_CACHE_ENABLED', True)
+    return cache
+
+@pytest.fixture
+def client(response_cache):
+    app = Flask(__name__)
+    calls = []
+
+    @app.route('/offers/<job>')
+    @cached_response
+    def offers(job):
+        calls.append(job)
+        return {'job': job, 'args': sorted(request.args.items(multi=True)), 'call': len(calls)}
+
+    @app.route('/broken')
+    @cached_response
+    def broken():
+        calls.append('broken')
+        return {'error': 'base indisponible'}, 503
+
+    @app.route('/missing')
+    @cached_response
+    def missing():
+        calls.append('missing')
+        return {'error': 'introuvable'}, 404
+
+    @app.route('/stream')
+    @cached_response
+    def stream():
+        calls.append('stream')
+        return Response((line for line in ['a\n', 'b\n']), mimetype='application/x-ndjson')
+
+    test_client = app.test_client()
+    test_client.calls = calls
+    return test_client
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl_seconds=60)
+    cache.set('key', 'value')
+
+    clock.now += 59
+    assert cache.get('key') == 'value'
+
+    clock.now += 2
+    assert cache.get('key') is None
+    assert cache.stats()['expirations'] == 1
+    assert cache.stats()['entries'] == 0
+
+def test_least_recently_used_entry_evicted(clock):
+    cache = ResponseCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+def test_key_ignores_query_argument_order(client):
+    first = client.get('/offers/chauffeur?source=asako&page=2&source=portaljob')
+    second = client.get('/offers/chauffeur?page=2&source=asako&source=portaljob')
+
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == first.get_json()
+    assert client.calls == ['chauffeur']
+
+def test_key_includes_view_args_and_every_value(client):
+    client.get('/offers/chauffeur?source=asako')
+
+    assert client.get('/offers/comptable?source=asako').headers['X-Cache'] == 'MISS'
+    assert client.get('/offers/chauffeur?source=asako&source=portaljob').headers['X-Cache'] == 'MISS'
+    assert client.get('/offers/chauffeur?source=portaljob').headers['X-Cache'] == 'MISS'
+    assert client.calls == ['chauffeur', 'comptable', 'chauffeur', 'chauffeur']
+
+def test_server_errors_not_cached(client):
+    assert client.get('/broken').status_code == 503
+    assert client.get('/broken').headers['X-Cache'] == 'MISS'
+    assert client.calls == ['broken', 'broken']
+
+def test_client_errors_cached(client):
+    client.get('/missing')
+
+    response = client.get('/missing')
+
+    assert response.status_code == 404
+    assert response.headers['X-Cache'] == 'HIT'
+
+def test_streamed_responses_not_cached(client, response_cache):
+    assert client.get('/stream').data == b'a\nb\n'
+    assert client.get('/stream').headers['X-Cache'] == 'MISS'
+    assert client.calls == ['stream', 'stream']
+    assert response_cache.stats()['entries'] == 0
+
+def test_generation_change_clears_cache(client, response_cache, generation, clock):
+    client.get('/offers/chauffeur')
+    assert client.get('/offers/chauffeur').headers['X-Cache'] == 'HIT'
+
+    # Nouveau scraping : visible au prochain contrôle de la génération
+    generation['value'] = 2
+    assert client.get('/offers/chauffeur').headers['X-Cache'] == 'HIT'
+
+    clock.now += 5
+    assert client.get('/offers/chauffeur').headers['X-Cache'] == 'MISS'
+    assert response_cache.stats()['invalidations'] == 1
+    assert response_cache.stats()['data_generation'] == 2
+
+def test_generation_polled_once_per_interval(response_cache, generation, clock):
+    for _ in range(10):
+        response_cache.check_generation()
+    assert generation['reads'] == 1
+
+    clock.now += 5
+    response_cache.check_generation()
+    assert generation['reads'] == 2
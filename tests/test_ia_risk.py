@@ -0,0 +1,119 @@
+"""
+KeywordMatcher et IARiskScorer : même résultat que les boucles
+`keyword in text` d'origine des scrapers
+"""
+
+import os
+import random
+import sys
+import pytest
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.keyword_matcher import KeywordMatcher, lowest_keyword_bit
+from models.ia_risk import ASAKO_SCORER, PORTALJOB_SCORER, IARiskScorer
+
+def reference_score(scorer, title, metier, secteur, contrat):
+    """Score calculé comme dans les scrapers d'origine (une sous-chaîne à la fois)"""
+    text = f"{title} {metier} {secteur} {contrat}".lower()
+    score = 5.0
+
+    for job, risk in scorer.metier_risks.items():
+        if job in text:
+            score = risk
+            break
+
+    for words, delta in scorer.sector_adjustments:
+        if any(word in text for word in words):
+            score += delta
+
+    for words, delta in scorer.keyword_adjustments:
+        for word in words:
+            if word in text:
+                score += delta
+
+    return round(max(1.0, min(10.0, score)), 1)
+
+def random_offers(scorer, count, seed):
+    """Offres fabriquées à partir des mots-clés du scorer, collés ou non à du texte"""
+    rng = random.Random(seed)
+    keywords = scorer.matcher.keywords
+    filler = ['poste', 'h/f', 'Antananarivo', 'urgent', 'équipe', 'CDI', 'senior', 'de', 'et']
+    separators = [' ', '', '-', '/', ', ']
+
+    offers = []
+    for _ in range(count):
+        fields = []
+        for _ in range(4):
+            words = rng.sample(keywords, rng.randint(0, 3)) + rng.sample(filler, rng.randint(0, 3))
+            rng.shuffle(words)
+            fields.append(rng.choice(separators).join(word.upper() if rng.random() < 0.2 else word for word in words))
+        offers.append(fields)
+    return offers
+
+def test_overlapping_keywords_all_found():
+    matcher = KeywordMatcher(['stag', 'stagiaire', 'commercial', 'technico-commercial', 'it', 'tech'])
+
+    found = matcher.find_all('technico-commercial stagiaire')
+
+    assert found == {'stag', 'stagiaire', 'commercial', 'technico-commercial', 'tech'}
+    assert matcher.find_all('titre') == {'it'}
+    assert matcher.find_all('rien') == set()
+
+def test_repeated_keywords_keep_first_bit():
+    matcher = KeywordMatcher(['chef', 'chauffeur', 'chef'])
+
+    assert matcher.keywords == ['chef', 'chauffeur']
+    assert matcher.mask(['chef', 'chauffeur']) == 0b11
+
+@pytest.mark.parametrize('text, expected', [
+    ('chauffeur et chef', 'chauffeur'),
+    ('chef chauffeur', 'chauffeur'),
+    ('chef de projet', 'chef'),
+    ('assistant manager', 'assistant'),
+])
+def test_first_declared_keyword_wins(text, expected):
+    matcher = KeywordMatcher(['chauffeur', 'assistant', 'manager', 'chef'])
+
+    assert lowest_keyword_bit(matcher.scan(text)) == matcher.bits[expected]
+
+def test_metier_follows_table_order():
+    # 'assistant' est déclaré avant 'manager', quel que soit l'ordre dans le texte
+    assert ASAKO_SCORER.score('Manager assistant', '', '', '') == 6.5
+    assert ASAKO_SCORER.score('Chef chauffeur', '', '', '') == 9.0
+
+@pytest.mark.parametrize('scorer', [ASAKO_SCORER, PORTALJOB_SCORER], ids=['asako', 'portaljob'])
+def test_score_matches_substring_reference(scorer):
+    samples = [
+        ('Téléconseiller call center', 'téléopérateur', 'Commerce', 'CDD'),
+        ('Développeur web Symfony', 'Informatique', 'IT', 'CDI'),
+        ('Technico-commercial stagiaire', '', 'vente', 'Stage'),
+        ('Chef de projet', 'Management', 'Santé', ''),
+        ('Agent de saisie', 'data entry', 'process standard routine', ''),
+        ('', '', '', ''),
+    ] + random_offers(scorer, 500, seed=scorer.name)
+
+    for title, metier, secteur, contrat in samples:
+        assert scorer.score(title, metier, secteur, contrat) == reference_score(scorer, title, metier, secteur, contrat), \
+            (title, metier, secteur, contrat)
+
+def test_score_memoized_per_keyword_mask(monkeypatch):
+    scorer = IARiskScorer(
+        name='test',
+        metier_risks={'chauffeur': 9.0, 'comptable': 5.0},
+        sector_adjustments=[(['transport'], 1.0)],
+        keyword_adjustments=[(['routine'], 0.5)],
+        suggestions={}
+    )
+    calls = []
+    compute = scorer._score_from_keywords
+    monkeypatch.setattr(scorer, '_score_from_keywords', lambda found: calls.append(found) or compute(found))
+
+    # Textes différents, mêmes mots-clés : un seul calcul
+    assert scorer.score('Chauffeur', 'transport', '', '') == 10.0
+    assert scorer.score('Chauffeur poids lourd', 'Transport urbain', '', 'CDI') == 10.0
+    assert scorer.score('Comptable', '', '', '') == 5.0
+
+    assert len(calls) == 2
+    assert len(scorer._score_by_mask) == 2
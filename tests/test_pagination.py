@@ -0,0 +1,108 @@
+"""
+Pagination par curseur : encodage du curseur, curseur invalide et
+parcours complet sur SQLite avec des scraped_at égaux ou NULL
+"""
+
+import os
+import sys
+from datetime import datetime
+import pytest
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from api.pagination import InvalidCursor, after_cursor, decode_cursor, encode_cursor, keyset_order
+from database.models import JobOffer, SessionLocal
+
+# (id, scraped_at) : des ex aequo et des offres sans date de scraping
+OFFERS = [
+    (1, datetime(2026, 3, 1, 9, 0)),
+    (2, datetime(2026, 3, 2, 9, 0)),
+    (3, datetime(2026, 3, 2, 9, 0)),
+    (4, None),
+    (5, datetime(2026, 3, 1, 9, 0)),
+    (6, None),
+    (7, datetime(2026, 3, 2, 9, 0)),
+    (8, datetime(2026, 2, 28, 18, 30)),
+    (9, None),
+]
+
+# Plus récentes d'abord, id décroissant pour départager, NULL en dernier
+EXPECTED_ORDER = [7, 3, 2, 5, 1, 8, 9, 6, 4]
+
+@pytest.fixture
+def offers_db(sqlite_engine):
+    db = SessionLocal()
+    for offer_id, scraped_at in OFFERS:
+        offer = JobOffer(id=offer_id, title=f"Offre {offer_id}", link=f"/offre/{offer_id}", is_active=True)
+        db.add(offer)
+        db.flush()
+        # Forcer NULL (la colonne a une valeur par défaut)
+        offer.scraped_at = scraped_at
+    db.commit()
+    yield db
+    db.close()
+
+@pytest.fixture
+def client(offers_db, monkeypatch):
+    monkeypatch.setattr(config.Config, 'RESPONSE_CACHE_ENABLED', False)
+    from api.server import create_app
+    return create_app().test_client()
+
+def walk(db, limit):
+    """Toutes les pages via after_cursor, comme l'endpoint /offers"""
+    ids = []
+    cursor = None
+    while True:
+        query = db.query(JobOffer)
+        if cursor:
+            query = after_cursor(query, cursor)
+        page = keyset_order(query).limit(limit).all()
+        ids.extend(offer.id for offer in page)
+        if len(page) < limit:
+            return ids
+        cursor = encode_cursor(page[-1])
+
+@pytest.mark.parametrize('scraped_at', [datetime(2026, 3, 2, 9, 15, 30, 123456), None])
+def test_cursor_round_trip(scraped_at):
+    cursor = encode_cursor(JobOffer(id=42, scraped_at=scraped_at))
+
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (scraped_at, 42)
+
+@pytest.mark.parametrize('cursor', ['pas-un-curseur', 'e30', encode_cursor(JobOffer(id=1, scraped_at=None))[:-3], ''])
+def test_invalid_cursor_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+def test_keyset_order_puts_nulls_last(offers_db):
+    assert [offer.id for offer in keyset_order(offers_db.query(JobOffer)).all()] == EXPECTED_ORDER
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 4])
+def test_cursor_pages_cover_every_offer_once(offers_db, limit):
+    assert walk(offers_db, limit) == EXPECTED_ORDER
+
+def test_cursor_on_null_scraped_at_serves_remaining_nulls(offers_db):
+    cursor = encode_cursor(JobOffer(id=9, scraped_at=None))
+
+    page = keyset_order(after_cursor(offers_db.query(JobOffer), cursor)).all()
+
+    assert [offer.id for offer in page] == [6, 4]
+
+def test_offers_endpoint_follows_cursor(client):
+    ids = []
+    response = client.get('/api/offers?cursor=&limit=4').get_json()
+    while True:
+        ids.extend(offer['id'] for offer in response['offers'])
+        if not response['has_more']:
+            break
+        response = client.get(f"/api/offers?cursor={response['next_cursor']}&limit=4").get_json()
+
+    assert ids == EXPECTED_ORDER
+
+def test_offers_endpoint_rejects_invalid_cursor(client):
+    response = client.get('/api/offers?cursor=pas-un-curseur')
+
+    assert response.status_code == 400
+    assert 'Curseur invalide' in response.get_json()['error']
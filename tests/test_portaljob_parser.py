@@ -0,0 +1,77 @@
+"""
+scan_articles doit produire les mêmes éléments que soup_articles (BeautifulSoup)
+
+Le scanner rapide reproduit à la main les règles de texte de
+BeautifulSoup : ces tests comparent les deux versions sur les pages
+PortalJob enregistrées et sur des fragments HTML mal formés.
+"""
+
+import os
+import sys
+import pytest
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.portaljob_parser import scan_articles, soup_articles
+
+SCRAPERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scrapers')
+
+PAGES = ['portaljob_page_1.html', 'portaljob.html', 'code_source.html']
+
+# Début d'un article d'offre, complété par chaque fragment
+ARTICLE = '<article class="item_annonce">'
+
+SNIPPETS = {
+    'lien non fermé': ARTICLE + '<h3><a href="/emploi/1">Comptable <b>senior</h3><h4>ACME</h4></article>',
+    'articles imbriqués': ARTICLE + '<h3><a href="/1">Externe</a></h3>'
+                          '<article class="item_annonce urgent"><h3><a href="/2">Interne</a></h3>'
+                          '<h4>Interne SA</h4></article><h4>Externe SA</h4></article>',
+    'article non fermé': ARTICLE + '<h3><a href="/1">Sans fin</a></h3><h5>CDI',
+    'br et espaces': ARTICLE + '<h3>\n  <a href="/1">Chef<br>de projet<br/>IT</a>\n</h3>'
+                     '<a class="description">  Ligne 1<br>\n\n   Ligne 2  </a></article>',
+    'commentaires': ARTICLE + '<h3><a href="/1">Agent <!-- caché --> de saisie</a></h3>'
+                    '<h4><!-- vide --></h4></article>',
+    'entités': ARTICLE + '<h3><a href="/1?a=1&amp;b=2">R&eacute;f&#233;rent &#x27;RH&#x27; &amp; paie &inconnu;</a></h3>'
+               '<h4>L&apos;entreprise&nbsp;SA</h4></article>',
+    'script et style': ARTICLE + '<h3><a href="/1">Titre<script>var x = "<b>";</script></a></h3>'
+                       '<h4><style>h4 {}</style>Société</h4></article>',
+    'cdata': ARTICLE + '<h3><a href="/1"><![CDATA[Texte brut]]> suite</a></h3></article>',
+    'fermetures orphelines': ARTICLE + '</span><h3><a href="/1">Titre</a></div></h3></b><h4>X</h4></article></article>',
+    'date complète': ARTICLE + '<h3><a href="/1">Titre</a></h3><aside class="date_annonce">'
+                     '<div class="date"><b>12</b><span class="mois">janv.</span><span class="annee">2025</span></div>'
+                     '</aside><i class="date_lim">Date limite : 30/01/2025</i><div class="urgent_flag">Urgent</div></article>',
+    'attributs': ARTICLE + '<h3><a href="/1" class="  lien   titre " data-x>Titre</a></h3></article>',
+}
+
+def _element(element):
+    """Ce que le scraper lit d'un élément : attributs et textes"""
+    return (
+        dict(element.attrs),
+        element.text,
+        element.get_text(strip=True),
+        element.get_text(' ', strip=True)
+    )
+
+def _normalize(articles):
+    return [
+        (list(classes), {key: _element(element) for key, element in elements.items()})
+        for classes, elements in articles
+    ]
+
+def _read_page(name):
+    with open(os.path.join(SCRAPERS_DIR, name), encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+@pytest.mark.parametrize('name', PAGES)
+def test_saved_pages(name):
+    html = _read_page(name)
+    assert _normalize(scan_articles(html)) == _normalize(soup_articles(html))
+
+def test_saved_listing_has_offers():
+    # Sans articles, la comparaison des pages ne vérifierait rien
+    assert len(scan_articles(_read_page('portaljob_page_1.html'))) > 0
+
+@pytest.mark.parametrize('html', SNIPPETS.values(), ids=list(SNIPPETS))
+def test_malformed_snippets(html):
+    assert _normalize(scan_articles(html)) == _normalize(soup_articles(html))
@@ -0,0 +1,80 @@
+"""
+Index de recherche : accents, préfixes, ET entre les termes d'une
+requête et OU entre les requêtes de search_any
+"""
+
+import os
+import sys
+import pytest
+
+# Ajouter le chemin parent pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.search_index import OfferSearchIndex, fold_accents, tokenize
+
+# (id, title, job_title, sector, company, location, description)
+ROWS = [
+    (1, 'Secrétaire de direction', 'Secrétaire', 'Administration', 'ACME', 'Antananarivo', 'Gestion agenda'),
+    (2, 'Développeur web', 'Développeur', 'Informatique', 'WebCo', 'Antananarivo', 'PHP Symfony'),
+    (3, 'Comptable senior', 'Comptable', 'Finance', 'ACME', 'Toamasina', 'Comptabilité générale'),
+    (4, 'Développeuse mobile', 'Développeur', 'Informatique', 'AppCo', 'Toamasina', 'Flutter'),
+    (5, 'Chauffeur poids lourd', 'Chauffeur', 'Transport', 'TransMada', 'Mahajanga', None),
+]
+
+@pytest.fixture(scope='module')
+def index():
+    return OfferSearchIndex.build(ROWS)
+
+def ids(results):
+    return sorted(offer_id for offer_id, _ in results)
+
+def test_accents_folded():
+    assert fold_accents('Élevé à Émyrne') == 'eleve a emyrne'
+    assert tokenize('Secrétaire / Comptabilité, H/F') == ['secretaire', 'comptabilite', 'h', 'f']
+    assert tokenize(None) == []
+
+def test_query_matches_with_or_without_accents(index):
+    assert ids(index.search('secretaire')) == [1]
+    assert ids(index.search('SECRÉTAIRE')) == [1]
+    assert ids(index.search('développeur')) == ids(index.search('developpeur')) == [2, 4]
+
+def test_prefix_matching_from_three_characters(index):
+    assert ids(index.search('dev')) == [2, 4]
+    assert ids(index.search('compta')) == [3]
+    # Moins de 3 caractères : mot exact seulement
+    assert index.search('se') == []
+    assert ids(index.search('de')) == [1]
+    assert ids(index.search('web')) == [2]
+
+def test_prefix_matching_disabled(index):
+    assert index.search('dev', prefix=False) == []
+    assert ids(index.search('comptable', prefix=False)) == [3]
+
+def test_every_term_required(index):
+    assert ids(index.search('développeur toamasina')) == [4]
+    assert ids(index.search('acme')) == [1, 3]
+    assert ids(index.search('acme comptable')) == [3]
+    assert index.search('comptable antananarivo') == []
+    assert index.search('chauffeur inconnu') == []
+
+def test_search_any_is_union_of_queries(index):
+    results = index.search_any(['comptable antananarivo', 'chauffeur', 'secretaire'])
+
+    assert ids(results) == [1, 5]
+    assert ids(index.search_any(['acme', 'transmada'])) == [1, 3, 5]
+
+def test_search_any_keeps_best_score(index):
+    best = dict(index.search_any(['developpeur', 'flutter']))
+
+    assert best[4] == max(dict(index.search('developpeur'))[4], dict(index.search('flutter'))[4])
+
+def test_results_ranked_and_limited(index):
+    results = index.search('dev')
+
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+    assert len(index.search('dev', limit=1)) == 1
+    assert len(index.search_any(['acme', 'transmada'], limit=2)) == 2
+
+def test_empty_index_and_query():
+    assert OfferSearchIndex.build([]).search('comptable') == []
+    assert OfferSearchIndex.build(ROWS).search('  !! ') == []